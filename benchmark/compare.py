@@ -0,0 +1,82 @@
+"""
+Compares two `benchmark.run` result files stage by stage.
+
+Usage:
+    python -m benchmark.compare before.json after.json
+"""
+
+import argparse
+import json
+import sys
+
+
+def flatten(stages: dict, prefix: str = "") -> dict[str, float]:
+    """Flattens nested stage timings, e.g. {"rules": {"Quality Bonus": ...}} to "rules.Quality Bonus"."""
+    flat = {}
+    for name, value in stages.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{name}."))
+        else:
+            flat[f"{prefix}{name}"] = value
+    return flat
+
+
+def key(result: dict) -> tuple:
+    return (
+        result["attempts"],
+        result["routes"],
+        result["success_rate"],
+        result["rate_card_id"],
+    )
+
+
+def compare(before: dict, after: dict) -> list[dict]:
+    """
+    Pairs up results for the same workload and rate card.
+
+    Returns:
+        list[dict]: Workload, stage, both timings and the speed-up (before / after) per stage.
+    """
+    before_results = {key(result): result for result in before["results"]}
+    rows = []
+    for result in after["results"]:
+        previous = before_results.get(key(result))
+        if previous is None:
+            continue
+        before_stages = flatten(previous["stages"])
+        for stage, seconds in flatten(result["stages"]).items():
+            if stage not in before_stages:
+                continue
+            rows.append(
+                {
+                    "workload": key(result),
+                    "stage": stage,
+                    "before": before_stages[stage],
+                    "after": seconds,
+                    "speedup": before_stages[stage] / seconds if seconds else None,
+                }
+            )
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args(argv)
+    with open(args.before, encoding="utf-8") as before, open(
+        args.after, encoding="utf-8"
+    ) as after:
+        rows = compare(json.load(before), json.load(after))
+    for row in rows:
+        attempts, routes, success_rate, rate_card_id = row["workload"]
+        speedup = f"{row['speedup']:.2f}x" if row["speedup"] else "-"
+        print(
+            f"{attempts:>9} {routes:>5} {success_rate:<5} {rate_card_id:<14} {row['stage']:<40}"
+            f" {row['before'] * 1e3:10.3f}ms {row['after'] * 1e3:10.3f}ms {speedup:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Compares the earnings DataFrame with dictionary-encoded route ids against one holding route id strings.
+
+For each workload, both frames are built from the same validated activity logs and grouped by route with
+`route_totals`. The suite reports their memory (`DataFrame.memory_usage(deep=True)`), the time to build
+them and the time of the per-route grouping, keeping the fastest of several runs.
+
+Usage:
+    python -m benchmark.frame
+    python -m benchmark.frame --attempts 100000 1000000 --routes 5000 -o frame.json
+"""
+
+import argparse
+import json
+import sys
+import numpy
+from pandas import DataFrame
+from src.business_logic.aggregate import activity_frame, route_totals
+from src.resource.payload import load_activity_logs
+from benchmark.run import repeats_for, timed
+from benchmark.workload import generate_week
+
+DEFAULT_ATTEMPTS = [10_000, 100_000, 1_000_000]
+DEFAULT_ROUTES = [100, 5_000]
+
+
+def string_frame(route_ids: list[str], columns):
+    """The earnings frame with one Python string object per attempt as `route_id`."""
+    return DataFrame(
+        {
+            "route_id": route_ids,
+            "timestamp": numpy.frombuffer(columns.timestamps, dtype=numpy.int64),
+            "success": numpy.frombuffer(columns.successes, dtype=numpy.int8).astype(
+                bool
+            ),
+        }
+    )
+
+
+def benchmark_frames(seed: int, attempts: int, routes: int, repeats: int) -> dict:
+    """
+    Measures both frames for one workload.
+
+    Returns:
+        dict: Memory in bytes and fastest build and grouping times in seconds, per frame.
+    """
+    columns = load_activity_logs(generate_week(seed, attempts, routes, 0.97))
+    # Decoded up front, as logs were held before route ids were dictionary-encoded at ingest.
+    route_ids = columns.route_ids
+    repeats = repeats_for(attempts, repeats)
+    result = {"attempts": attempts, "routes": min(routes, attempts)}
+    totals = {}
+    for name, build in (
+        ("strings", lambda: string_frame(route_ids, columns)),
+        ("encoded", lambda: activity_frame(columns)),
+    ):
+        build_seconds, activity_df = timed(build, repeats)
+        group_seconds, totals[name] = timed(
+            lambda: route_totals(activity_df, ["route_id"]), repeats
+        )
+        result[name] = {
+            "memory_bytes": int(activity_df.memory_usage(deep=True).sum()),
+            "build_seconds": build_seconds,
+            "route_totals_seconds": group_seconds,
+        }
+    # Both frames must produce the same per-route totals.
+    assert list(totals["strings"].index) == list(totals["encoded"].index)
+    assert (totals["strings"].values == totals["encoded"].values).all()
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--attempts", type=int, nargs="+", default=DEFAULT_ATTEMPTS)
+    parser.add_argument("--routes", type=int, nargs="+", default=DEFAULT_ROUTES)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", "-o", help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for attempts in args.attempts:
+        for routes in sorted({min(routes, attempts) for routes in args.routes}):
+            result = benchmark_frames(args.seed, attempts, routes, args.repeats)
+            strings, encoded = result["strings"], result["encoded"]
+            sys.stderr.write(
+                f"attempts={attempts} routes={routes}: "
+                f"memory {strings['memory_bytes'] / encoded['memory_bytes']:.1f}x smaller, "
+                f"build {strings['build_seconds'] / encoded['build_seconds']:.1f}x, "
+                f"route_totals {strings['route_totals_seconds'] / encoded['route_totals_seconds']:.1f}x faster\n"
+            )
+            results.append(result)
+
+    text = json.dumps({"seed": args.seed, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,387 @@
+"""
+Load-tests the earning endpoint under concurrent requests.
+
+Every scenario posts seeded courier weeks of one size (or, with several sizes, a final mix of all of them)
+to a rotating mix of rate cards for a fixed duration, either from a fixed number of concurrent clients or
+at a fixed request rate. For each scenario it reports throughput, p50/p95/p99 latency and the error rate.
+
+At a fixed rate, latency is measured from the moment a request was due, so a server that falls behind
+shows its queueing delay instead of silently receiving fewer requests.
+
+`--serve` starts the server itself, on a free local port, so runs are comparable across serving modes.
+The started server inherits the environment, e.g. `STATEMENT_CACHE_SIZE=0` to measure uncached requests.
+
+Usage:
+    python -m benchmark.loadtest --serve dev --concurrency 8 -o dev.json
+    python -m benchmark.loadtest --serve gunicorn --concurrency 8 --baseline dev.json -o gunicorn.json
+    python -m benchmark.loadtest --url http://localhost:8000 --rate 200 --duration 30
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+from src.enums import TierRateCardId
+from benchmark.run import git_commit
+from benchmark.workload import generate_body
+
+DEFAULT_ATTEMPTS = [100, 1_000, 10_000]
+# Distinct payloads per size; repeats of a payload may be answered from the statement cache.
+DEFAULT_BODIES = 8
+SERVE_COMMANDS = {
+    "dev": [sys.executable, "-m", "src.app"],
+    "gunicorn": [sys.executable, "-m", "gunicorn", "src.app:server"],
+}
+
+
+def build_scenarios(
+    attempts: list[int],
+    routes: int,
+    success_rate: float,
+    rate_card_ids: list[str],
+    bodies: int,
+    seed: int,
+) -> list[dict]:
+    """
+    Generates the requests of every scenario: one per payload size, and a mix of all sizes if there are several.
+
+    Returns:
+        list[dict]: Scenarios with a name, their attempts and their requests as (path, body) pairs.
+    """
+    scenarios = []
+    for size in attempts:
+        payloads = [
+            generate_body(seed + index, size, routes, success_rate)
+            for index in range(bodies)
+        ]
+        scenarios.append(
+            {
+                "name": f"attempts={size}",
+                "attempts": [size],
+                "requests": [
+                    (f"/earning/{rate_card_id}", payload)
+                    for payload in payloads
+                    for rate_card_id in rate_card_ids
+                ],
+            }
+        )
+    if len(scenarios) > 1:
+        scenarios.append(
+            {
+                "name": "mixed",
+                "attempts": list(attempts),
+                "requests": [
+                    request
+                    for requests in zip(
+                        *(scenario["requests"] for scenario in scenarios)
+                    )
+                    for request in requests
+                ],
+            }
+        )
+    return scenarios
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarise(samples: list[tuple[float, str]], duration: float) -> dict:
+    """
+    Summarises one scenario.
+
+    Parameters:
+        samples (list[tuple[float, str]]): Latency in seconds and status code, or "error", per request.
+        duration (float): Seconds the scenario ran.
+
+    Returns:
+        dict: Request count, throughput, latency percentiles, error rate and count per status.
+    """
+    latencies = sorted(latency for latency, _ in samples)
+    statuses = {}
+    for _, status in samples:
+        statuses[status] = statuses.get(status, 0) + 1
+    errors = sum(
+        count for status, count in statuses.items() if not status.startswith("2")
+    )
+    return {
+        "requests": len(samples),
+        "duration_seconds": duration,
+        "throughput": len(samples) / duration if duration else 0.0,
+        "latency_seconds": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else None,
+            "mean": sum(latencies) / len(latencies) if latencies else None,
+        },
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+class Client:
+    """One keep-alive connection, reopened after errors."""
+
+    def __init__(self, url: str, timeout: float) -> None:
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.timeout = timeout
+        self.connection = None
+
+    def post(self, path: str, body: bytes) -> str:
+        """Sends one request and reads the whole response. Returns the status code, or "error"."""
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout
+            )
+        try:
+            self.connection.request(
+                "POST", path, body=body, headers={"Content-Type": "application/json"}
+            )
+            response = self.connection.getresponse()
+            response.read()
+            return str(response.status)
+        except (OSError, http.client.HTTPException):
+            self.close()
+            return "error"
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def run_scenario(
+    url: str,
+    requests: list[tuple[str, bytes]],
+    duration: float,
+    concurrency: int,
+    rate: float | None = None,
+    timeout: float = 60.0,
+) -> dict:
+    """
+    Sends requests for `duration` seconds and summarises them.
+
+    Parameters:
+        url (str): Base URL of the server.
+        requests (list[tuple[str, bytes]]): Requests to send, cycled in order.
+        duration (float): Seconds to send requests for.
+        concurrency (int): Number of clients, i.e. the maximum number of requests in flight.
+        rate (float | None): Requests per second; None sends the next request as soon as a client is free.
+        timeout (float): Socket timeout per request.
+
+    Returns:
+        dict: See `summarise`.
+    """
+    counter = itertools.count()
+    samples = []
+    started = time.perf_counter()
+    deadline = started + duration
+
+    def send() -> None:
+        client = Client(url, timeout)
+        local_samples = []
+        try:
+            while True:
+                index = next(counter)
+                if rate is None:
+                    due = time.perf_counter()
+                    if due >= deadline:
+                        break
+                else:
+                    due = started + index / rate
+                    if due >= deadline:
+                        break
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                path, body = requests[index % len(requests)]
+                status = client.post(path, body)
+                local_samples.append((time.perf_counter() - due, status))
+        finally:
+            client.close()
+            samples.extend(local_samples)
+
+    threads = [threading.Thread(target=send) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarise(samples, time.perf_counter() - started)
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(mode: str, port: int) -> subprocess.Popen:
+    """Starts the server in `mode` on a local port, with the environment of this process."""
+    return subprocess.Popen(
+        SERVE_COMMANDS[mode],
+        env={**os.environ, "HOST": "127.0.0.1", "PORT": str(port)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(url: str, timeout: float = 60.0) -> None:
+    """
+    Polls the health check until the server answers.
+
+    Raises:
+        TimeoutError: If the server does not answer within `timeout` seconds.
+    """
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=1)
+        try:
+            connection.request("GET", "/health_check")
+            if connection.getresponse().status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+        finally:
+            connection.close()
+    raise TimeoutError(f"Server at {url} did not become ready in {timeout}s")
+
+
+def format_table(results: list[dict], baseline: dict | None = None) -> str:
+    """Formats results as a table, with throughput and p99 relative to a baseline run if given."""
+    baseline_results = {
+        result["name"]: result for result in (baseline or {}).get("results", [])
+    }
+    lines = [
+        f"{'scenario':<18} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}"
+        + ("   vs baseline" if baseline else "")
+    ]
+    for result in results:
+        latency = result["latency_seconds"]
+        milliseconds = [
+            f"{latency[name] * 1000:9.2f}" if latency[name] is not None else f"{'-':>9}"
+            for name in ("p50", "p95", "p99")
+        ]
+        line = (
+            f"{result['name']:<18} {result['throughput']:9.1f} {' '.join(milliseconds)} "
+            f"{result['error_rate']:8.2%}"
+        )
+        previous = baseline_results.get(result["name"])
+        if previous and previous["throughput"] and previous["latency_seconds"]["p99"]:
+            line += (
+                f"   throughput x{result['throughput'] / previous['throughput']:.2f}, "
+                f"p99 x{latency['p99'] / previous['latency_seconds']['p99']:.2f}"
+            )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server")
+    target.add_argument(
+        "--serve", choices=sorted(SERVE_COMMANDS), help="Start the server locally"
+    )
+    parser.add_argument("--attempts", type=int, nargs="+", default=DEFAULT_ATTEMPTS)
+    parser.add_argument("--routes", type=int, default=50)
+    parser.add_argument("--success-rate", type=float, default=0.97)
+    parser.add_argument(
+        "--rate-cards",
+        nargs="+",
+        default=[str(rate_card_id) for rate_card_id in TierRateCardId],
+        choices=[str(rate_card_id) for rate_card_id in TierRateCardId],
+    )
+    parser.add_argument("--bodies", type=int, default=DEFAULT_BODIES)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--rate", type=float, help="Requests per second instead of a closed loop"
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--warm-up",
+        type=float,
+        default=2.0,
+        help="Seconds of discarded requests before each scenario",
+    )
+    parser.add_argument("--baseline", help="Earlier result file to compare against")
+    parser.add_argument("--output", "-o", help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    scenarios = build_scenarios(
+        args.attempts,
+        args.routes,
+        args.success_rate,
+        args.rate_cards,
+        args.bodies,
+        args.seed,
+    )
+    server = None
+    url = args.url
+    if args.serve:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = start_server(args.serve, port)
+    try:
+        wait_until_ready(url)
+        results = []
+        for scenario in scenarios:
+            sys.stderr.write(f"{scenario['name']}\n")
+            if args.warm_up:
+                run_scenario(url, scenario["requests"], args.warm_up, args.concurrency)
+            summary = run_scenario(
+                url, scenario["requests"], args.duration, args.concurrency, args.rate
+            )
+            results.append(
+                {"name": scenario["name"], "attempts": scenario["attempts"], **summary}
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    sys.stderr.write(format_table(results, baseline) + "\n")
+
+    document = {
+        "commit": git_commit(),
+        "server": args.serve or args.url,
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "duration_seconds": args.duration,
+        "routes": args.routes,
+        "success_rate": args.success_rate,
+        "rate_card_ids": args.rate_cards,
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Benchmarks every stage of statement generation on synthetic courier weeks.
+
+For each workload in the sweep (attempts x routes x success rate) and each rate card, the suite times:
+JSON parsing, activity log validation, loading the same log from columnar JSON and MessagePack, DataFrame
+construction, aggregation with each engine, every rule of the rate card's compiled plan, statement
+assembly and serialization. Each stage is repeated and the fastest run is kept. Results are written as JSON, ready for `benchmark.compare`.
+
+Usage:
+    python -m benchmark.run --output results.json
+    python -m benchmark.run --attempts 10 1000 100000 --routes 1 100 --success-rates 0.97 -o quick.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from src import config
+from src.business_logic.aggregate import ActivityAggregate, activity_frame
+from src.business_logic.rate_cards import current_rate_cards
+from src.resource.payload import load_activity_logs, load_msgpack
+from src.utils.serialization import dumps
+from benchmark.workload import generate_body, to_columnar
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+DEFAULT_ATTEMPTS = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+DEFAULT_ROUTES = [1, 10, 100, 1_000, 5_000]
+DEFAULT_SUCCESS_RATES = [0.5, 0.97, 1.0]
+
+
+def timed(function, repeats: int):
+    """
+    Runs `function` `repeats` times.
+
+    Returns:
+        tuple[float, object]: The fastest run in seconds and the result of the last run.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def repeats_for(attempts: int, budget: int) -> int:
+    """Fewer repeats for larger workloads, so every workload costs roughly the same."""
+    return max(1, min(budget, 1_000_000 // max(attempts, 1)))
+
+
+def benchmark_workload(
+    seed: int, attempts: int, routes: int, success_rate: float, repeats: int
+) -> list[dict]:
+    """
+    Times every stage for one workload under every rate card.
+
+    Returns:
+        list[dict]: One result per rate card.
+    """
+    body = generate_body(seed, attempts, routes, success_rate)
+    repeats = repeats_for(attempts, repeats)
+    shared = {}
+    shared["json_parse"], records = timed(lambda: json.loads(body), repeats)
+    shared["schema_load"], columns = timed(lambda: load_activity_logs(records), repeats)
+    body_bytes = {"rows": len(body)}
+    columnar_body = json.dumps(to_columnar(records)).encode()
+    body_bytes["columnar"] = len(columnar_body)
+    shared["columnar_load"], _ = timed(
+        lambda: load_activity_logs(json.loads(columnar_body)), repeats
+    )
+    if msgpack is not None:
+        msgpack_body = msgpack.packb(to_columnar(records, binary=True))
+        body_bytes["msgpack"] = len(msgpack_body)
+        shared["msgpack_load"], _ = timed(
+            lambda: load_activity_logs(load_msgpack(msgpack_body)), repeats
+        )
+    shared["dataframe"], activity_df = timed(lambda: activity_frame(columns), repeats)
+    shared["aggregate_pandas"], aggregate = timed(
+        lambda: ActivityAggregate.from_dataframe(activity_df), repeats
+    )
+    shared["aggregate_python"], _ = timed(
+        lambda: ActivityAggregate.from_columns(columns), repeats
+    )
+    # hours_worked is a cached property; time the uncached computation.
+    shared["hours_worked"], _ = timed(
+        lambda: sum(ActivityAggregate.route_hours.func(aggregate)), repeats
+    )
+
+    results = []
+    for rate_card_id, plan in current_rate_cards().plans.items():
+        stages = dict(shared)
+        stages["rules"] = {
+            step.name: timed(lambda: step.quantity(aggregate), repeats)[0]
+            for step in plan.steps
+        }
+        stages["evaluate"], statement = timed(lambda: plan.evaluate(aggregate), repeats)
+        stages["serialize"], _ = timed(lambda: dumps(statement), repeats)
+        results.append(
+            {
+                "attempts": attempts,
+                "routes": min(routes, attempts),
+                "success_rate": success_rate,
+                "rate_card_id": str(rate_card_id),
+                "body_bytes": len(body),
+                "body_bytes_by_format": body_bytes,
+                "repeats": repeats,
+                "stages": stages,
+                "final_earnings": statement.final_earnings,
+            }
+        )
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--attempts", type=int, nargs="+", default=DEFAULT_ATTEMPTS)
+    parser.add_argument("--routes", type=int, nargs="+", default=DEFAULT_ROUTES)
+    parser.add_argument(
+        "--success-rates", type=float, nargs="+", default=DEFAULT_SUCCESS_RATES
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=5,
+        help="Repeats per stage (fewer for large logs)",
+    )
+    parser.add_argument("--output", "-o", help="Write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for attempts in args.attempts:
+        for routes in sorted({min(routes, attempts) for routes in args.routes}):
+            for success_rate in args.success_rates:
+                sys.stderr.write(
+                    f"attempts={attempts} routes={routes} success_rate={success_rate}\n"
+                )
+                results.extend(
+                    benchmark_workload(
+                        args.seed, attempts, routes, success_rate, args.repeats
+                    )
+                )
+
+    document = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "ACTIVITY_LOG_VALIDATOR": config.ACTIVITY_LOG_VALIDATOR,
+            "JSON_BACKEND": config.JSON_BACKEND,
+            "rate_card_version": current_rate_cards().version,
+        },
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(document, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Measures cold start: how long importing the app takes and how long the first responses take.
+
+Every sample runs in a fresh interpreter. The first small request is served by the pure Python engine;
+the first large request needs pandas, which is imported lazily unless the app was warmed up. The statement
+cache is disabled so the second large request, which sends the same body, is computed again.
+
+Usage:
+    python -m benchmark.startup --samples 5
+    python -m benchmark.startup --warm-up --output startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SAMPLE = """
+import json, sys, time
+started = time.perf_counter()
+from src.app import server
+imported = time.perf_counter()
+warm_up_seconds = None
+if {warm_up!r}:
+    from src.warmup import warm_up
+    warm_up(server)
+    warm_up_seconds = time.perf_counter() - imported
+from src import config
+from src.warmup import WARM_UP_ACTIVITY_LOGS
+client = server.test_client()
+timings = {{"import_seconds": imported - started, "warm_up_seconds": warm_up_seconds}}
+small = WARM_UP_ACTIVITY_LOGS
+large = WARM_UP_ACTIVITY_LOGS * (config.PYTHON_ENGINE_MAX_ATTEMPTS // len(WARM_UP_ACTIVITY_LOGS) + 1)
+for name, body in (("first_small_response_seconds", small), ("first_large_response_seconds", large),
+                   ("second_large_response_seconds", large)):
+    start = time.perf_counter()
+    response = client.post("/earning/gold_tier", json=body)
+    assert response.status_code == 200, response.data
+    timings[name] = time.perf_counter() - start
+timings["loaded"] = sorted(m for m in ("pandas", "numpy", "marshmallow") if m in sys.modules)
+print(json.dumps(timings))
+"""
+
+
+def measure(warm_up: bool) -> dict:
+    """Runs one sample in a fresh interpreter and returns its timings."""
+    output = subprocess.run(
+        [sys.executable, "-c", SAMPLE.format(warm_up=warm_up)],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "STATEMENT_CACHE_SIZE": "0"},
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def summarise(samples: list[dict]) -> dict:
+    """Returns the median of every timing across samples."""
+    summary = {}
+    for name, value in samples[0].items():
+        if isinstance(value, float):
+            summary[name] = statistics.median(sample[name] for sample in samples)
+        else:
+            summary[name] = value
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument(
+        "--warm-up", action="store_true", help="Run src.warmup.warm_up after importing"
+    )
+    parser.add_argument(
+        "--output", "-o", help="Also write the JSON result to this file"
+    )
+    args = parser.parse_args(argv)
+
+    samples = [measure(args.warm_up) for _ in range(args.samples)]
+    result = {
+        "python": sys.version.split()[0],
+        "samples": args.samples,
+        "warm_up": args.warm_up,
+        "median": summarise(samples),
+    }
+    text = json.dumps(result, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Seeded generator of realistic courier weeks.
+
+A week is a set of routes, each driven as one shift on one of seven days. Attempts are spread over the
+routes with a skewed distribution, so a few long routes carry most of the attempts, and are placed in
+time order inside each shift. Records use the same shape and ISO-8601 timestamps as API requests, in a
+mix of UTC offsets. `to_columnar` re-encodes a week in the columnar layout.
+"""
+
+import base64
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from src.utils.timestamps import parse_timestamp
+
+WEEK_START = datetime(2023, 12, 18, tzinfo=timezone.utc)
+OFFSETS = [timezone.utc, timezone(timedelta(hours=2)), timezone(timedelta(hours=-5))]
+
+
+def generate_week(
+    seed: int, attempts: int, routes: int, success_rate: float
+) -> list[dict]:
+    """
+    Generates one courier's activity logs for a week.
+
+    Parameters:
+        seed (int): Random seed; the same arguments always produce the same logs.
+        attempts (int): Number of delivery attempts.
+        routes (int): Number of distinct routes, at most `attempts`.
+        success_rate (float): Probability that an attempt is successful.
+
+    Returns:
+        list[dict]: Activity logs in request order, i.e. sorted by route shift and time.
+    """
+    rng = random.Random(seed)
+    routes = max(1, min(routes, attempts))
+    weights = [rng.paretovariate(1.5) for _ in range(routes)]
+    # Every route gets at least one attempt; the rest follow the skewed weights.
+    per_route = [1] * routes
+    for route in rng.choices(range(routes), weights=weights, k=attempts - routes):
+        per_route[route] += 1
+
+    logs = []
+    for route, route_attempts in enumerate(per_route):
+        route_id = f"RT{seed:04d}{route:05d}"
+        shift_start = WEEK_START + timedelta(
+            days=rng.randrange(7), hours=rng.uniform(6, 12)
+        )
+        shift_seconds = rng.uniform(0.5, 9) * 3600
+        offset = rng.choice(OFFSETS)
+        for seconds in sorted(
+            rng.uniform(0, shift_seconds) for _ in range(route_attempts)
+        ):
+            logs.append(
+                {
+                    "route_id": route_id,
+                    "attempt_date_time": (shift_start + timedelta(seconds=seconds))
+                    .astimezone(offset)
+                    .isoformat(),
+                    "success": rng.random() < success_rate,
+                }
+            )
+    return logs
+
+
+def generate_body(seed: int, attempts: int, routes: int, success_rate: float) -> bytes:
+    """Returns `generate_week` encoded as a JSON request body."""
+    return json.dumps(generate_week(seed, attempts, routes, success_rate)).encode()
+
+
+def to_columnar(logs: list[dict], binary: bool = False) -> dict:
+    """
+    Encodes activity logs in the columnar layout accepted by the earning endpoints.
+
+    Parameters:
+        logs (list[dict]): Activity logs as returned by `generate_week`.
+        binary (bool): Keep the success bitmap as bytes, for MessagePack, instead of base64.
+    """
+    route_codes = {}
+    bitmap = bytearray((len(logs) + 7) // 8)
+    for index, log in enumerate(logs):
+        if log["success"]:
+            bitmap[index >> 3] |= 1 << (index & 7)
+    return {
+        "route_ids": list(dict.fromkeys(log["route_id"] for log in logs)),
+        "route_codes": [
+            route_codes.setdefault(log["route_id"], len(route_codes)) for log in logs
+        ],
+        "timestamps": [parse_timestamp(log["attempt_date_time"]) for log in logs],
+        "success": bytes(bitmap) if binary else base64.b64encode(bitmap).decode(),
+    }
@@ -0,0 +1,81 @@
+"""
+Production gunicorn settings, read automatically by `gunicorn src.app:server`.
+
+The app is preloaded and warmed up in the master so pandas, the rate cards and the first-request code
+paths are loaded once and shared copy-on-write by every forked worker.
+"""
+
+import gc
+import tempfile
+from src import config as app_config
+
+# Workers publish their metrics to a shared directory so /metrics covers all of them.
+if not app_config.METRICS_DIR:
+    app_config.METRICS_DIR = tempfile.mkdtemp(prefix="earning-metrics-")
+
+
+def admission_threads() -> int:
+    """
+    Threads a worker needs for admission control to take effect: one for every request its lanes may run
+    or hold in their queues, plus one for the endpoints admission control leaves alone, such as /metrics.
+    With fewer threads the excess waits in gunicorn's socket backlog and never sees a 429.
+    """
+    threads = 1
+    for concurrency in (
+        app_config.LIGHT_LANE_CONCURRENCY,
+        app_config.HEAVY_LANE_CONCURRENCY,
+    ):
+        if concurrency:
+            threads += concurrency + app_config.ADMISSION_QUEUE_SIZE
+    return threads
+
+
+bind = f"{app_config.HOST}:{app_config.PORT}"
+workers = app_config.WEB_WORKERS
+threads = max(app_config.WEB_THREADS, admission_threads())
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = app_config.WEB_TIMEOUT_SECONDS
+preload_app = True
+
+
+def on_starting(arbiter):
+    """Warms up the preloaded app before the listening socket is opened."""
+    from src.enums import WarmUp
+    from src.utils.metrics import registry
+
+    registry.directory = app_config.METRICS_DIR
+    registry.clear_directory()
+
+    if WarmUp.get_enum_by_value(app_config.WARM_UP) != WarmUp.PRELOAD:
+        return
+    from src.app import server
+    from src.warmup import warm_up
+
+    warm_up(server)
+    # Move everything allocated so far out of the collector's reach, so collections in the workers do
+    # not touch, and thereby copy, the pages shared with the master.
+    gc.freeze()
+    arbiter.log.info("Warm-up complete")
+
+
+def post_worker_init(worker):
+    """
+    Starts the worker's metrics flusher, and loading the lazily imported modules once the worker is ready
+    to accept requests.
+    """
+    from src.enums import WarmUp
+    from src.utils.metrics import registry
+
+    registry.start_flushing()
+
+    if WarmUp.get_enum_by_value(app_config.WARM_UP) == WarmUp.BACKGROUND:
+        from src.warmup import warm_up_in_background
+
+        warm_up_in_background()
+
+
+def worker_exit(server, worker):
+    """Publishes the exiting worker's final metrics."""
+    from src.utils.metrics import registry
+
+    registry.flush(force=True)
@@ -5,6 +5,9 @@ from src import config
 def create_app():
     server = Flask(__name__)
     server.debug = config.DEBUG
+    # flask_restful only hands errors to the handlers registered below when exceptions propagate,
+    # which Flask otherwise does only in debug mode.
+    server.config["PROPAGATE_EXCEPTIONS"] = True
     return server
 
 
@@ -12,10 +15,31 @@ server = create_app()
 
 from src.route.health_check import health_check_blueprint
 from src.route.earning import earning_blueprint
-
+from src.route.ledger import ledger_blueprint
+from src.route.metrics import metrics_blueprint
 
 server.register_blueprint(health_check_blueprint)
 server.register_blueprint(earning_blueprint)
+server.register_blueprint(ledger_blueprint)
+server.register_blueprint(metrics_blueprint)
+
+from src.utils import metrics
+
+server.before_request(metrics.start_request)
+server.after_request(metrics.finish_request)
+server.teardown_request(metrics.end_request)
+
+from src.utils import compression
+
+server.before_request(compression.decompress_request)
+server.after_request(compression.compress_response)
+
+if config.PROFILING_ENABLED:
+    from src.utils import profiling
+
+    server.before_request(profiling.start_profile)
+    server.after_request(profiling.finish_profile)
+    server.teardown_request(profiling.end_profile)
 
 from werkzeug.exceptions import HTTPException
 from src.utils import exceptions, error_handlers
@@ -32,6 +56,15 @@ server.register_error_handler(
 server.register_error_handler(
     exceptions.NotFoundException, error_handlers.handle_exception
 )
+server.register_error_handler(
+    exceptions.PayloadTooLargeException, error_handlers.handle_exception
+)
+server.register_error_handler(
+    exceptions.UnsupportedMediaTypeException, error_handlers.handle_exception
+)
+server.register_error_handler(
+    exceptions.TooManyRequestsException, error_handlers.handle_exception
+)
 server.register_error_handler(
     exceptions.ServerErrorException, error_handlers.handle_exception
 )
@@ -39,4 +72,9 @@ server.register_error_handler(Exception, error_handlers.handle_general_exception
 server.register_error_handler(HTTPException, error_handlers.handle_werkzeug_exception)
 
 if __name__ == "__main__":
-    server.run(host=config.HOST, port=config.PORT, debug=True)
+    from src.enums import WarmUp
+    from src.warmup import warm_up
+
+    if WarmUp.get_enum_by_value(config.WARM_UP) != WarmUp.OFF:
+        warm_up(server)
+    server.run(host=config.HOST, port=config.PORT, debug=config.DEBUG)
@@ -0,0 +1,391 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
+from src.model import ActivityColumns
+
+# numpy and pandas are imported where they are used, so that importing the app (and serving small logs
+# with the pure Python engine) does not pay for loading them.
+if TYPE_CHECKING:
+    import numpy
+    from array import array
+    from pandas import Categorical, DataFrame
+
+# Per-route sequences that only some rules and breakdowns read. The builders used by `Earning` compute just
+# the ones asked for and leave the others empty; totals, the route count and the first and last attempt per
+# route, which hours worked needs, are always computed.
+OPTIONAL_FIELDS = frozenset({"route_ids", "route_attempts", "route_successes"})
+# Optional fields that need attempts counted per route.
+ROUTE_COUNT_FIELDS = frozenset({"route_attempts", "route_successes"})
+
+
+@dataclass(frozen=True)
+class ActivityAggregate:
+    """
+    Immutable summary of an activity log, built in a single grouped pass and shared by every tier rule.
+
+    Per-route sequences are ordered by route id, which keeps summations deterministic.
+    Timestamps are stored as UTC epoch microseconds. Of `OPTIONAL_FIELDS`, only the ones requested from
+    the builder are filled in.
+
+    Attributes:
+        successful_attempts (int): Number of successful attempts.
+        failed_attempts (int): Number of unsuccessful attempts.
+        unique_route_count (int): Number of distinct routes.
+        route_ids (tuple[str, ...]): Distinct route ids.
+        route_attempts (tuple[int, ...]): Number of attempts per route.
+        route_successes (tuple[int, ...]): Number of successful attempts per route.
+        route_first_attempts (tuple[int, ...]): Earliest attempt per route.
+        route_last_attempts (tuple[int, ...]): Latest attempt per route.
+    """
+
+    successful_attempts: int = 0
+    failed_attempts: int = 0
+    unique_route_count: int = 0
+    route_ids: tuple[str, ...] = ()
+    route_attempts: tuple[int, ...] = ()
+    route_successes: tuple[int, ...] = ()
+    route_first_attempts: tuple[int, ...] = ()
+    route_last_attempts: tuple[int, ...] = ()
+
+    @property
+    def total_attempts(self) -> int:
+        return self.successful_attempts + self.failed_attempts
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of attempts that were successful, 0.0 for an empty log."""
+        if not self.total_attempts:
+            return 0.0
+        return self.successful_attempts / self.total_attempts
+
+    @cached_property
+    def route_hours(self) -> tuple[float, ...]:
+        """Hours between the first and last attempt of every route."""
+        return tuple(
+            (last - first) / 1_000_000 / 3600
+            for first, last in zip(self.route_first_attempts, self.route_last_attempts)
+        )
+
+    @cached_property
+    def hours_worked(self) -> float:
+        """Total hours worked across all routes."""
+        return sum(self.route_hours) if self.route_hours else 0.0
+
+    @classmethod
+    def from_dataframe(
+        cls, activity_df: "DataFrame", fields: frozenset[str] = OPTIONAL_FIELDS
+    ) -> "ActivityAggregate":
+        """
+        Builds the aggregate with one groupby over `route_id`.
+
+        Parameters:
+            activity_df (DataFrame): Data frame built by `activity_frame`.
+            fields (frozenset[str]): Optional fields to compute.
+        """
+        if activity_df.empty:
+            return cls()
+        if fields & ROUTE_COUNT_FIELDS:
+            return cls.from_route_totals(
+                route_totals(activity_df, ["route_id"]), fields
+            )
+        routes = route_spans(activity_df, ["route_id"])
+        successful_attempts = int(activity_df["success"].sum())
+        return cls(
+            successful_attempts=successful_attempts,
+            failed_attempts=len(activity_df) - successful_attempts,
+            unique_route_count=len(routes),
+            route_ids=(tuple(routes.index.tolist()) if "route_ids" in fields else ()),
+            route_first_attempts=tuple(routes["first"].tolist()),
+            route_last_attempts=tuple(routes["last"].tolist()),
+        )
+
+    @classmethod
+    def from_route_totals(
+        cls, routes: "DataFrame", fields: frozenset[str] = OPTIONAL_FIELDS
+    ) -> "ActivityAggregate":
+        """
+        Builds the aggregate from per-route totals produced by `route_totals`.
+
+        Parameters:
+            routes (DataFrame): Frame indexed by route id with 'attempts', 'successes', 'first' and 'last' columns.
+            fields (frozenset[str]): Optional fields to fill in.
+        """
+        successful_attempts = int(routes["successes"].sum())
+        return cls(
+            successful_attempts=successful_attempts,
+            failed_attempts=int(routes["attempts"].sum()) - successful_attempts,
+            unique_route_count=len(routes),
+            route_ids=(
+                tuple(routes.index.get_level_values(-1).tolist())
+                if "route_ids" in fields
+                else ()
+            ),
+            route_attempts=(
+                tuple(routes["attempts"].tolist()) if "route_attempts" in fields else ()
+            ),
+            route_successes=(
+                tuple(routes["successes"].tolist())
+                if "route_successes" in fields
+                else ()
+            ),
+            route_first_attempts=tuple(routes["first"].tolist()),
+            route_last_attempts=tuple(routes["last"].tolist()),
+        )
+
+    @classmethod
+    def from_columns(
+        cls, columns: ActivityColumns, fields: frozenset[str] = OPTIONAL_FIELDS
+    ) -> "ActivityAggregate":
+        """
+        Builds the aggregate in plain Python, without constructing a DataFrame.
+
+        Attempts are folded by route code; route ids are looked up once per route at the end. When no
+        per-route counts are requested, only each route's first and last attempt is tracked, and the
+        totals are summed straight from the success column.
+
+        Parameters:
+            columns (ActivityColumns): Validated activity logs.
+            fields (frozenset[str]): Optional fields to compute.
+        """
+        if fields & ROUTE_COUNT_FIELDS:
+            aggregator = ActivityAggregator()
+            add = aggregator.add
+            for route_code, timestamp, success in zip(
+                columns.route_codes, columns.timestamps, columns.successes
+            ):
+                add(route_code, timestamp, success)
+            return aggregator.build(columns.route_dictionary, fields)
+
+        # route code -> [first attempt, last attempt]
+        spans = {}
+        for route_code, timestamp in zip(columns.route_codes, columns.timestamps):
+            span = spans.get(route_code)
+            if span is None:
+                spans[route_code] = [timestamp, timestamp]
+            elif timestamp < span[0]:
+                span[0] = timestamp
+            elif timestamp > span[1]:
+                span[1] = timestamp
+        route_dictionary = columns.route_dictionary
+        keys = sorted(spans, key=route_dictionary.__getitem__)
+        successful_attempts = sum(columns.successes)
+        return cls(
+            successful_attempts=successful_attempts,
+            failed_attempts=len(columns) - successful_attempts,
+            unique_route_count=len(keys),
+            route_ids=(
+                tuple(route_dictionary[key] for key in keys)
+                if "route_ids" in fields
+                else ()
+            ),
+            route_first_attempts=tuple(spans[key][0] for key in keys),
+            route_last_attempts=tuple(spans[key][1] for key in keys),
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        route_dictionary,
+        route_codes: "numpy.ndarray",
+        timestamps: "numpy.ndarray",
+        successes: "numpy.ndarray",
+    ) -> "ActivityAggregate":
+        """
+        Builds the aggregate from dictionary-encoded numpy arrays with vectorised reductions.
+
+        Parameters:
+            route_dictionary: Sequence mapping route codes to route ids.
+            route_codes (numpy.ndarray): Integer route code per attempt.
+            timestamps (numpy.ndarray): int64 UTC epoch microseconds per attempt.
+            successes (numpy.ndarray): Boolean success flag per attempt.
+        """
+        import numpy
+
+        if not len(route_codes):
+            return cls()
+        codes, routes = numpy.unique(route_codes, return_inverse=True)
+        attempts = numpy.bincount(routes, minlength=len(codes))
+        route_successes = numpy.bincount(
+            routes, weights=successes, minlength=len(codes)
+        )
+        first = numpy.full(len(codes), numpy.iinfo(numpy.int64).max, dtype=numpy.int64)
+        last = numpy.full(len(codes), numpy.iinfo(numpy.int64).min, dtype=numpy.int64)
+        numpy.minimum.at(first, routes, timestamps)
+        numpy.maximum.at(last, routes, timestamps)
+        # Order routes by id, not by code, so sums match the other engines exactly.
+        route_ids = [route_dictionary[code] for code in codes.tolist()]
+        order = sorted(range(len(codes)), key=route_ids.__getitem__)
+        successful_attempts = int(route_successes.sum())
+        return cls(
+            successful_attempts=successful_attempts,
+            failed_attempts=len(route_codes) - successful_attempts,
+            unique_route_count=len(codes),
+            route_ids=tuple(route_ids[i] for i in order),
+            route_attempts=tuple(attempts[order].tolist()),
+            route_successes=tuple(route_successes[order].astype(numpy.int64).tolist()),
+            route_first_attempts=tuple(first[order].tolist()),
+            route_last_attempts=tuple(last[order].tolist()),
+        )
+
+
+def activity_frame(columns: ActivityColumns, **extra_columns) -> "DataFrame":
+    """
+    Builds the DataFrame consumed by `route_totals` from validated activity logs.
+
+    Every column has a compact dtype taken from the typed arrays without copying element by element:
+    `route_id` is categorical over the columns' route codes, `timestamp` int64 UTC epoch microseconds and
+    `success` bool. Grouping by route therefore works on integer codes instead of hashing strings.
+
+    Parameters:
+        columns (ActivityColumns): Validated activity logs.
+        extra_columns: Additional grouping columns, such as a courier id per attempt.
+    """
+    import numpy
+    from pandas import DataFrame
+
+    return DataFrame(
+        {
+            **extra_columns,
+            "route_id": categories(columns.route_codes, columns.route_dictionary),
+            "timestamp": numpy.frombuffer(columns.timestamps, dtype=numpy.int64),
+            "success": numpy.frombuffer(columns.successes, dtype=numpy.int8).astype(
+                bool
+            ),
+        }
+    )
+
+
+def categories(codes: "array", dictionary: list[str]) -> "Categorical":
+    """
+    Builds a Categorical from dictionary-encoded values, with its categories in sorted order.
+
+    Grouping by the result orders groups by value, exactly like grouping the decoded strings would.
+
+    Parameters:
+        codes (array): 32-bit index into `dictionary` per row.
+        dictionary (list[str]): Distinct values.
+    """
+    import numpy
+    from pandas import Categorical
+
+    order = sorted(range(len(dictionary)), key=dictionary.__getitem__)
+    rank = numpy.empty(len(order), dtype=numpy.int32)
+    rank[order] = numpy.arange(len(order), dtype=numpy.int32)
+    return Categorical.from_codes(
+        rank[numpy.frombuffer(codes, dtype=numpy.int32)],
+        categories=[dictionary[code] for code in order],
+    )
+
+
+def route_totals(activity_df: "DataFrame", keys: list[str]) -> "DataFrame":
+    """
+    Computes per-route totals in a single groupby.
+
+    Parameters:
+        activity_df (DataFrame): Data frame built by `activity_frame`.
+        keys (list[str]): Grouping columns, ending with 'route_id'.
+
+    Returns:
+        DataFrame: Frame indexed by `keys` with 'attempts', 'successes', 'first' and 'last' columns,
+                   timestamps expressed in UTC epoch microseconds.
+    """
+    return activity_df.groupby(keys, sort=True, observed=True).agg(
+        attempts=("success", "size"),
+        successes=("success", "sum"),
+        first=("timestamp", "min"),
+        last=("timestamp", "max"),
+    )
+
+
+def route_spans(activity_df: "DataFrame", keys: list[str]) -> "DataFrame":
+    """
+    Computes the first and last attempt per route in a single groupby, without counting attempts.
+
+    Parameters:
+        activity_df (DataFrame): Data frame built by `activity_frame`.
+        keys (list[str]): Grouping columns, ending with 'route_id'.
+
+    Returns:
+        DataFrame: Frame indexed by `keys` with 'first' and 'last' columns.
+    """
+    return activity_df.groupby(keys, sort=True, observed=True).agg(
+        first=("timestamp", "min"),
+        last=("timestamp", "max"),
+    )
+
+
+class ActivityAggregator:
+    """
+    Folds activity log entries one at a time into running per-route totals.
+
+    Memory grows with the number of distinct routes, not with the number of attempts.
+    """
+
+    __slots__ = ["_routes"]
+
+    def __init__(self) -> None:
+        # route_id -> [attempts, successes, first attempt, last attempt]
+        self._routes = {}
+
+    def __len__(self) -> int:
+        """Number of attempts added so far."""
+        return sum(route[0] for route in self._routes.values())
+
+    def add(self, route_id: str | int, timestamp: int, success: bool) -> None:
+        """
+        Adds a single attempt.
+
+        Parameters:
+            route_id (str | int): Route the attempt belongs to, or its route code.
+            timestamp (int): Attempt time in UTC epoch microseconds.
+            success (bool): Whether the attempt was successful.
+        """
+        route = self._routes.get(route_id)
+        if route is None:
+            self._routes[route_id] = [1, 1 if success else 0, timestamp, timestamp]
+            return
+        route[0] += 1
+        if success:
+            route[1] += 1
+        if timestamp < route[2]:
+            route[2] = timestamp
+        elif timestamp > route[3]:
+            route[3] = timestamp
+
+    def build(
+        self,
+        route_dictionary: list[str] | None = None,
+        fields: frozenset[str] = OPTIONAL_FIELDS,
+    ) -> ActivityAggregate:
+        """
+        Returns an immutable aggregate of everything added so far.
+
+        Parameters:
+            route_dictionary (list[str] | None): Route id per route code, if routes were added by code.
+            fields (frozenset[str]): Optional fields to fill in.
+        """
+        if route_dictionary is None:
+            route_ids = keys = sorted(self._routes)
+        else:
+            keys = sorted(self._routes, key=route_dictionary.__getitem__)
+            route_ids = [route_dictionary[code] for code in keys]
+        routes = [self._routes[key] for key in keys]
+        successful_attempts = sum(route[1] for route in routes)
+        return ActivityAggregate(
+            successful_attempts=successful_attempts,
+            failed_attempts=sum(route[0] for route in routes) - successful_attempts,
+            unique_route_count=len(routes),
+            route_ids=tuple(route_ids) if "route_ids" in fields else (),
+            route_attempts=(
+                tuple(route[0] for route in routes)
+                if "route_attempts" in fields
+                else ()
+            ),
+            route_successes=(
+                tuple(route[1] for route in routes)
+                if "route_successes" in fields
+                else ()
+            ),
+            route_first_attempts=tuple(route[2] for route in routes),
+            route_last_attempts=tuple(route[3] for route in routes),
+        )
@@ -0,0 +1,214 @@
+"""
+Memory-mapped columnar archive of fleet-wide activity logs.
+
+File layout (little-endian)::
+
+    MAGIC
+    route_codes      int32[attempts]    dictionary-encoded route id per attempt
+    timestamps       int64[attempts]    UTC epoch microseconds per attempt
+    successes        uint8[...]         success bitmap, least significant bit first
+    courier_offsets  int64[couriers+1]  first attempt of every courier
+    footer           JSON: version, section offsets and the courier, rate card and route dictionaries
+    footer length    uint64
+    MAGIC
+
+Every section starts on a 64-byte boundary so it can be viewed in place with `numpy.frombuffer`.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+import numpy
+from src.model import ActivityColumns
+from src.business_logic.aggregate import ActivityAggregate
+
+MAGIC = b"RLYARCH1"
+VERSION = 1
+ALIGNMENT = 64
+SECTIONS = (
+    ("route_codes", "<i4"),
+    ("timestamps", "<i8"),
+    ("successes", "u1"),
+    ("courier_offsets", "<i8"),
+)
+FOOTER_LENGTH = struct.Struct("<Q")
+
+
+class ArchiveWriter:
+    """
+    Writes couriers' activity logs into an archive.
+
+    Columns are spooled to temporary files as couriers are added, so memory use does not grow with
+    the number of attempts; only the courier and route dictionaries are kept in memory.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.courier_ids = []
+        self.rate_card_ids = []
+        self.route_codes = {}
+        self._attempts = 0
+        self._pending_successes = array("b")
+        self._spool = {
+            name: tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path)))
+            for name, _ in SECTIONS
+        }
+        self._spool["courier_offsets"].write(array("q", [0]).tobytes())
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def add(self, courier_id: str, rate_card_id: str, columns: ActivityColumns) -> None:
+        """Appends one courier's validated activity logs."""
+        route_codes = self.route_codes
+        # Re-encode the columns' own route codes into the archive's dictionary.
+        archive_codes = [
+            route_codes.setdefault(route_id, len(route_codes))
+            for route_id in columns.route_dictionary
+        ]
+        codes = array("i", map(archive_codes.__getitem__, columns.route_codes))
+        self._spool["route_codes"].write(codes.tobytes())
+        self._spool["timestamps"].write(columns.timestamps.tobytes())
+        self._pending_successes.extend(columns.successes)
+        whole_bytes = len(self._pending_successes) // 8 * 8
+        if whole_bytes:
+            self._write_successes(self._pending_successes[:whole_bytes])
+            del self._pending_successes[:whole_bytes]
+        self._attempts += len(columns)
+        self._spool["courier_offsets"].write(array("q", [self._attempts]).tobytes())
+        self.courier_ids.append(courier_id)
+        self.rate_card_ids.append(rate_card_id)
+
+    def _write_successes(self, successes: array) -> None:
+        bits = numpy.frombuffer(successes, dtype=numpy.int8).astype(bool)
+        self._spool["successes"].write(
+            numpy.packbits(bits, bitorder="little").tobytes()
+        )
+
+    def close(self) -> None:
+        """Assembles the spooled columns and footer into the archive file."""
+        if self._pending_successes:
+            self._write_successes(self._pending_successes)
+            del self._pending_successes[:]
+        sections = {}
+        with open(self.path, "wb") as archive:
+            archive.write(MAGIC)
+            for name, dtype in SECTIONS:
+                archive.write(b"\0" * (-archive.tell() % ALIGNMENT))
+                spool = self._spool[name]
+                length = spool.tell()
+                spool.seek(0)
+                sections[name] = [archive.tell(), length, dtype]
+                shutil.copyfileobj(spool, archive)
+            footer = json.dumps(
+                {
+                    "version": VERSION,
+                    "attempts": self._attempts,
+                    "sections": sections,
+                    "courier_ids": self.courier_ids,
+                    "rate_card_ids": self.rate_card_ids,
+                    "route_ids": list(self.route_codes),
+                }
+            ).encode()
+            archive.write(footer)
+            archive.write(FOOTER_LENGTH.pack(len(footer)))
+            archive.write(MAGIC)
+        self._discard()
+
+    def _discard(self) -> None:
+        for spool in self._spool.values():
+            spool.close()
+
+
+class ActivityArchive:
+    """
+    Read-only, memory-mapped view of an archive.
+
+    Route codes and timestamps are returned as zero-copy slices of the mapped file; only the success
+    bitmap of the requested courier is unpacked.
+
+    Attributes:
+        courier_ids (list[str]): Courier id per courier index.
+        rate_card_ids (list[str]): Rate card id per courier index.
+        route_ids (list[str]): Route id per route code.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as archive:
+            self._mmap = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+        trailer = len(MAGIC) + FOOTER_LENGTH.size
+        if self._mmap[: len(MAGIC)] != MAGIC or self._mmap[-len(MAGIC) :] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not an activity archive")
+        (footer_length,) = FOOTER_LENGTH.unpack_from(
+            self._mmap, len(self._mmap) - trailer
+        )
+        footer_start = len(self._mmap) - trailer - footer_length
+        footer = json.loads(self._mmap[footer_start : footer_start + footer_length])
+        if footer["version"] != VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported archive version {footer['version']}")
+        self.attempts = footer["attempts"]
+        self.courier_ids = footer["courier_ids"]
+        self.rate_card_ids = footer["rate_card_ids"]
+        self.route_ids = footer["route_ids"]
+        self._sections = {
+            name: numpy.frombuffer(
+                self._mmap,
+                dtype=dtype,
+                count=length // numpy.dtype(dtype).itemsize,
+                offset=offset,
+            )
+            for name, (offset, length, dtype) in footer["sections"].items()
+        }
+
+    def __enter__(self) -> "ActivityArchive":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.courier_ids)
+
+    def close(self) -> None:
+        self._sections = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Slices handed out by `arrays` are still alive; the mapping is released with them.
+            pass
+
+    def arrays(self, index: int) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        Returns the route codes, timestamps and success flags of one courier.
+
+        Parameters:
+            index (int): Courier index in `courier_ids`.
+        """
+        offsets = self._sections["courier_offsets"]
+        start, stop = int(offsets[index]), int(offsets[index + 1])
+        bitmap = self._sections["successes"][start // 8 : (stop + 7) // 8]
+        successes = numpy.unpackbits(bitmap, bitorder="little")[
+            start % 8 : start % 8 + stop - start
+        ].astype(bool)
+        return (
+            self._sections["route_codes"][start:stop],
+            self._sections["timestamps"][start:stop],
+            successes,
+        )
+
+    def aggregate(self, index: int) -> ActivityAggregate:
+        """Summarises one courier's activity logs straight from the mapped columns."""
+        return ActivityAggregate.from_arrays(self.route_ids, *self.arrays(index))
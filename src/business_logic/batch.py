@@ -0,0 +1,69 @@
+from array import array
+from src.model import ActivityColumns, EarningStatementResponse
+from src.enums import TierRateCardId
+from src.business_logic.aggregate import (
+    ActivityAggregate,
+    activity_frame,
+    categories,
+    route_totals,
+)
+from src.business_logic.rate_cards import current_rate_cards
+from src.utils.timing import stage
+
+
+class BatchEarning:
+    """
+    Generates earnings statements for many couriers at once.
+
+    All couriers' activity logs are stacked into a single DataFrame and summarised with one groupby over
+    courier and route, after which each courier's rate card is applied to its own slice of the totals.
+
+    Attributes:
+        couriers (dict[str, tuple[TierRateCardId, ActivityColumns]]): Rate card and activity logs per courier.
+    """
+
+    def __init__(
+        self, couriers: dict[str, tuple[TierRateCardId, ActivityColumns]]
+    ) -> None:
+        self.couriers = couriers
+
+    def aggregate(self) -> dict[str, ActivityAggregate]:
+        """
+        Summarises every courier's activity logs in a single grouped pass.
+
+        Returns:
+            dict[str, ActivityAggregate]: Aggregate per courier id.
+        """
+        columns, courier_codes = ActivityColumns(), array("i")
+        for courier_code, (_, activity_logs) in enumerate(self.couriers.values()):
+            columns.extend(activity_logs)
+            courier_codes.extend(array("i", [courier_code]) * len(activity_logs))
+        if not courier_codes:
+            return {}
+        with stage("dataframe"):
+            activity_df = activity_frame(
+                columns, courier_id=categories(courier_codes, list(self.couriers))
+            )
+        with stage("aggregate"):
+            routes = route_totals(activity_df, ["courier_id", "route_id"])
+        return {
+            courier_id: ActivityAggregate.from_route_totals(courier_routes)
+            for courier_id, courier_routes in routes.groupby(
+                level="courier_id", sort=False, observed=True
+            )
+        }
+
+    def generate_statements(self) -> dict[str, EarningStatementResponse]:
+        """
+        Generates an earnings statement for every courier.
+
+        Returns:
+            dict[str, EarningStatementResponse]: Earnings statement per courier id.
+        """
+        aggregates = self.aggregate()
+        plans = current_rate_cards().plans
+        with stage("rules"):
+            return {
+                courier_id: plans[rate_card_id].evaluate(aggregates[courier_id])
+                for courier_id, (rate_card_id, _) in self.couriers.items()
+            }
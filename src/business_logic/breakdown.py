@@ -0,0 +1,193 @@
+"""
+Optional detail sections of an earnings statement.
+
+The route breakdown is read off the ActivityAggregate the statement was calculated from, so it costs no
+extra pass over the activity logs. The period breakdown buckets the attempts by time in one vectorised
+pass and prices each period with the rate card's per-attempt rates only: weekly bonuses and the hourly
+minimum apply once, to the whole statement.
+"""
+
+from dataclasses import fields
+from src.enums import StatementBreakdown
+from src.model import (
+    ActivityColumns,
+    DetailedEarningStatementResponse,
+    DetailedPeriodEarningStatementResponse,
+    EarningStatementResponse,
+    PeriodBreakdownResponse,
+    PeriodEarningStatementResponse,
+    RouteBreakdownResponse,
+)
+from src.business_logic.aggregate import ActivityAggregate
+from src.business_logic.rules import RulePlan, is_long_route
+from src.utils.timestamps import from_epoch_microseconds
+
+# Period lengths that divide a day, so every period starts on a whole hour counted from midnight UTC.
+PERIOD_HOURS = (1, 2, 3, 4, 6, 8, 12, 24)
+DEFAULT_PERIOD_HOURS = 24
+# Most periods the activity logs of one statement may span.
+MAX_PERIODS = 1_000
+HOUR_MICROSECONDS = 3600 * 1_000_000
+
+# Field names of the added sections -> statement class holding them.
+STATEMENT_RESPONSES = {
+    ("routes",): DetailedEarningStatementResponse,
+    ("periods",): PeriodEarningStatementResponse,
+    ("routes", "periods"): DetailedPeriodEarningStatementResponse,
+}
+
+
+def route_breakdown(aggregate: ActivityAggregate) -> list[RouteBreakdownResponse]:
+    """
+    Describes every route of an aggregate, ordered by route id.
+
+    Parameters:
+        aggregate (ActivityAggregate): Summary of the activity logs.
+
+    Returns:
+        list[RouteBreakdownResponse]: Attempts, successes, success rate, hours and long route status per route.
+    """
+    return [
+        RouteBreakdownResponse(
+            route_id=route_id,
+            attempts=attempts,
+            successful_attempts=successes,
+            success_rate=successes / attempts,
+            hours_worked=hours,
+            long_route=is_long_route(attempts),
+        )
+        for route_id, attempts, successes, hours in zip(
+            aggregate.route_ids,
+            aggregate.route_attempts,
+            aggregate.route_successes,
+            aggregate.route_hours,
+        )
+    ]
+
+
+def period_count(activity_logs: ActivityColumns, period_hours: int) -> int:
+    """Number of periods of `period_hours` from the first attempt to the last one, both included."""
+    import numpy
+
+    if not len(activity_logs):
+        return 0
+    width = period_hours * HOUR_MICROSECONDS
+    timestamps = numpy.frombuffer(activity_logs.timestamps, dtype=numpy.int64)
+    return int(timestamps.max() // width - timestamps.min() // width) + 1
+
+
+def period_breakdown(
+    aggregate: ActivityAggregate,
+    activity_logs: ActivityColumns,
+    attempt_rates: tuple[float, float],
+    period_hours: int = DEFAULT_PERIOD_HOURS,
+) -> list[PeriodBreakdownResponse]:
+    """
+    Describes every period of `period_hours` with attempts or hours worked, in time order.
+
+    Attempts are bucketed by integer division of their timestamps and counted with one bincount, without
+    sorting or grouping the logs. The time between the first and last attempt of each route is split across
+    the periods it spans, so the hours of all periods add up to the statement's hours worked.
+
+    Parameters:
+        aggregate (ActivityAggregate): Summary of `activity_logs`.
+        activity_logs (ActivityColumns): Validated activity logs.
+        attempt_rates (tuple[float, float]): Rates per successful and per unsuccessful attempt.
+        period_hours (int): Length of a period, one of PERIOD_HOURS.
+
+    Returns:
+        list[PeriodBreakdownResponse]: Attempts, successes, hours and per-attempt earnings per period.
+    """
+    import numpy
+
+    if not len(activity_logs):
+        return []
+    width = period_hours * HOUR_MICROSECONDS
+    periods = numpy.frombuffer(activity_logs.timestamps, dtype=numpy.int64) // width
+    offset = int(periods.min())
+    periods -= offset
+    count = int(periods.max()) + 1
+    attempts = numpy.bincount(periods, minlength=count)
+    successes = numpy.bincount(
+        periods,
+        weights=numpy.frombuffer(activity_logs.successes, dtype=numpy.int8),
+        minlength=count,
+    ).astype(numpy.int64)
+
+    first = numpy.array(aggregate.route_first_attempts, dtype=numpy.int64)
+    last = numpy.array(aggregate.route_last_attempts, dtype=numpy.int64)
+    first_period = first // width - offset
+    last_period = last // width - offset
+    single = first_period == last_period
+    spanning = ~single
+    # Routes working through a whole period, counted with a difference array.
+    covering = numpy.zeros(count + 1, dtype=numpy.int64)
+    numpy.add.at(covering, first_period[spanning] + 1, 1)
+    numpy.add.at(covering, last_period[spanning], -1)
+    worked = numpy.cumsum(covering)[:count] * width
+    # Partial periods at both ends of a route, or its whole time if it stays within one period.
+    numpy.add.at(worked, first_period[single], (last - first)[single])
+    numpy.add.at(
+        worked,
+        first_period[spanning],
+        (first_period[spanning] + offset + 1) * width - first[spanning],
+    )
+    numpy.add.at(
+        worked,
+        last_period[spanning],
+        last[spanning] - (last_period[spanning] + offset) * width,
+    )
+
+    success_rate, failure_rate = attempt_rates
+    attempts, successes, worked = attempts.tolist(), successes.tolist(), worked.tolist()
+    return [
+        PeriodBreakdownResponse(
+            start=from_epoch_microseconds((offset + index) * width).isoformat(),
+            end=from_epoch_microseconds((offset + index + 1) * width).isoformat(),
+            attempts=attempts[index],
+            successful_attempts=successes[index],
+            hours_worked=worked[index] / 1_000_000 / 3600,
+            earnings=successes[index] * success_rate
+            + (attempts[index] - successes[index]) * failure_rate,
+        )
+        for index in range(count)
+        if attempts[index] or worked[index]
+    ]
+
+
+def with_breakdowns(
+    statement: EarningStatementResponse,
+    aggregate: ActivityAggregate,
+    breakdowns: frozenset[StatementBreakdown],
+    activity_logs: ActivityColumns | None = None,
+    rule_plan: RulePlan | None = None,
+    period_hours: int = DEFAULT_PERIOD_HOURS,
+) -> EarningStatementResponse:
+    """
+    Adds the requested breakdowns to a statement.
+
+    Parameters:
+        statement (EarningStatementResponse): Statement calculated from `aggregate`.
+        aggregate (ActivityAggregate): Summary of the activity logs.
+        breakdowns (frozenset[StatementBreakdown]): Sections to add.
+        activity_logs (ActivityColumns | None): Logs summarised by `aggregate`, needed for periods.
+        rule_plan (RulePlan | None): Plan `statement` was evaluated with, needed for periods.
+        period_hours (int): Length of a period, one of PERIOD_HOURS.
+
+    Returns:
+        EarningStatementResponse: `statement` itself without breakdowns, otherwise a subclass holding
+                                  the requested sections.
+    """
+    sections = {}
+    if StatementBreakdown.ROUTES in breakdowns:
+        sections["routes"] = route_breakdown(aggregate)
+    if StatementBreakdown.PERIODS in breakdowns:
+        sections["periods"] = period_breakdown(
+            aggregate, activity_logs, rule_plan.attempt_rates(), period_hours
+        )
+    if not sections:
+        return statement
+    return STATEMENT_RESPONSES[tuple(sections)](
+        **{field.name: getattr(statement, field.name) for field in fields(statement)},
+        **sections,
+    )
@@ -0,0 +1,63 @@
+from src.model import ActivityColumns, EarningStatementResponse
+from src.enums import TierRateCardId
+from src.business_logic.aggregate import ActivityAggregate
+from src.business_logic.earning import Earning
+from src.business_logic.rate_cards import current_rate_cards
+
+
+class EarningComparison:
+    """
+    Evaluates one activity log against every rate card.
+
+    Holds one Earning per rate card, all compiled from the same rate card version. The activity logs are
+    aggregated once, with the engine chosen by `Earning.get_engine`, and that aggregate is evaluated by each
+    of them.
+
+    Attributes:
+        activity_logs (ActivityColumns): Validated activity logs to be considered for earnings calculation.
+        earnings (dict[TierRateCardId, Earning]): Earning per rate card, in tier order.
+    """
+
+    def __init__(self, activity_logs: ActivityColumns) -> None:
+        self.activity_logs = activity_logs
+        plans = current_rate_cards().plans
+        self.earnings = {
+            rate_card_id: Earning(
+                rate_card_id, activity_logs, rule_plan=plans[rate_card_id]
+            )
+            for rate_card_id in TierRateCardId
+        }
+        self._aggregate = None
+
+    def aggregate(self) -> ActivityAggregate:
+        """Summarises the activity logs once, with the fields every rate card needs."""
+        if self._aggregate is None:
+            fields = frozenset().union(
+                *(earning.aggregate_fields() for earning in self.earnings.values())
+            )
+            self._aggregate = self.earnings[TierRateCardId.BRONZE].aggregate(fields)
+        return self._aggregate
+
+    def generate_statements(self) -> dict[TierRateCardId, EarningStatementResponse]:
+        """
+        Generates an earnings statement for every rate card.
+
+        Returns:
+            dict[TierRateCardId, EarningStatementResponse]: Earnings statement per rate card, in tier order.
+        """
+        aggregate = self.aggregate()
+        return {
+            rate_card_id: earning.evaluate(aggregate)
+            for rate_card_id, earning in self.earnings.items()
+        }
+
+    @staticmethod
+    def best_rate_card_id(
+        statements: dict[TierRateCardId, EarningStatementResponse],
+    ) -> TierRateCardId:
+        """
+        Returns the rate card with the highest final earnings, preferring the lower tier on ties.
+        """
+        return max(
+            statements, key=lambda rate_card_id: statements[rate_card_id].final_earnings
+        )
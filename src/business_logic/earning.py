@@ -1,7 +1,17 @@
-from pandas import DataFrame
-from src.model import ActivityLog, EarningStatementResponse
-from src.enums import TierRateCardId
-from src.business_logic.tier import BronzeTier, SilverTier, GoldTier, PlatinumTier
+import hashlib
+import json
+from src import config
+from src.model import ActivityColumns, EarningStatementResponse
+from src.enums import TierRateCardId, EarningEngine, StatementBreakdown
+from src.business_logic.aggregate import (
+    OPTIONAL_FIELDS,
+    ActivityAggregate,
+    activity_frame,
+)
+from src.business_logic.breakdown import DEFAULT_PERIOD_HOURS, with_breakdowns
+from src.business_logic.rules import RulePlan
+from src.business_logic.rate_cards import current_rate_cards
+from src.utils.timing import stage
 
 
 class Earning:
@@ -11,55 +21,152 @@ class Earning:
 
     Attributes:
         rate_card_id (TierRateCardId): The tier rate card ID indicating the earnings tier.
-        activity_logs (list[ActivityLog]): A list of activity logs to be considered for earnings calculation.
+        activity_logs (ActivityColumns): Validated activity logs to be considered for earnings calculation.
+        breakdowns (frozenset[StatementBreakdown]): Optional detail sections to add to the statement.
+        period_hours (int): Length of a period in the periods breakdown.
+        rule_plan (RulePlan | None): Already resolved rule plan, e.g. to evaluate several rate cards under
+            one rate card version; resolved from the current rate cards when omitted.
 
     Methods:
-        get_tier: Determines the tier object based on the rate card ID.
+        get_rule_plan: Returns the compiled rule plan for the rate card ID.
+        get_engine: Chooses the aggregation engine for the activity logs.
+        aggregate_fields: Optional aggregate fields the statement reads.
+        aggregate: Summarises the activity logs with the chosen engine.
+        evaluate: Generates an earnings statement from an already computed aggregate.
+        cache_key: Content address of the rate card and activity logs.
         generate_statement: Generates an earnings statement based on activity logs and the specified tier.
     """
 
     def __init__(
-        self, rate_card_id: TierRateCardId, activity_logs: list[ActivityLog]
+        self,
+        rate_card_id: TierRateCardId,
+        activity_logs: ActivityColumns,
+        breakdowns: frozenset[StatementBreakdown] = frozenset(),
+        period_hours: int = DEFAULT_PERIOD_HOURS,
+        rule_plan: RulePlan | None = None,
     ) -> None:
         self.rate_card_id = rate_card_id
         self.activity_logs = activity_logs
+        self.breakdowns = breakdowns
+        self.period_hours = period_hours
+        self._rule_plan = rule_plan
 
-    def get_tier(self):
+    def get_rule_plan(self) -> RulePlan:
         """
-        Determines and returns the tier object based on the rate card ID.
+        Returns the compiled rule plan of this request's rate card.
+
+        The plan is resolved once, so a rate card reload mid-request cannot mix two versions.
 
         Returns:
-            An instance of the tier class (BronzeTier, SilverTier, GoldTier, PlatinumTier) corresponding
-            to the rate card ID.
+            RulePlan: Immutable evaluator shared by every request for the same rate card version.
+        """
+        if self._rule_plan is None:
+            self._rule_plan = current_rate_cards().plans[self.rate_card_id]
+        return self._rule_plan
+
+    def cache_key(self) -> str:
+        """
+        Returns a content address for this request.
+
+        The key hashes the rate card id, the version and rates compiled into its rule plan, the requested
+        breakdowns (with their period length) and the validated activity logs, whose timestamps are already normalised to UTC. Loading new rate cards therefore
+        changes the key, and statements computed under the old rates are never served again.
+        """
+        rule_plan = self.get_rule_plan()
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(self.rate_card_id.value.encode())
+        digest.update(rule_plan.version.encode())
+        digest.update(rule_plan.fingerprint.encode())
+        digest.update(",".join(sorted(map(str, self.breakdowns))).encode())
+        if StatementBreakdown.PERIODS in self.breakdowns:
+            digest.update(str(self.period_hours).encode())
+        digest.update(json.dumps(self.activity_logs.route_dictionary).encode())
+        digest.update(self.activity_logs.route_codes.tobytes())
+        digest.update(self.activity_logs.timestamps.tobytes())
+        digest.update(self.activity_logs.successes.tobytes())
+        return digest.hexdigest()
+
+    def get_engine(self) -> EarningEngine:
         """
-        match self.rate_card_id.value:
-            case TierRateCardId.BRONZE.value:
-                return BronzeTier()
-            case TierRateCardId.SILVER.value:
-                return SilverTier()
-            case TierRateCardId.GOLD.value:
-                return GoldTier()
-            case TierRateCardId.PLATINUM.value:
-                return PlatinumTier()
+        Chooses the aggregation engine for this request.
+
+        The pure Python engine avoids the fixed cost of building a DataFrame and wins on small and medium
+        logs; pandas takes over above `PYTHON_ENGINE_MAX_ATTEMPTS`. Setting `EARNING_ENGINE` forces either one.
+
+        Returns:
+            EarningEngine: Either EarningEngine.PANDAS or EarningEngine.PYTHON.
+        """
+        engine = EarningEngine.get_enum_by_value(config.EARNING_ENGINE)
+        if engine in (EarningEngine.PANDAS, EarningEngine.PYTHON):
+            return engine
+        if len(self.activity_logs) <= config.PYTHON_ENGINE_MAX_ATTEMPTS:
+            return EarningEngine.PYTHON
+        return EarningEngine.PANDAS
+
+    def aggregate_fields(self) -> frozenset[str]:
+        """
+        Returns the optional aggregate fields this statement reads: those its rule plan needs, or all of
+        them for the routes breakdown.
+        """
+        if StatementBreakdown.ROUTES in self.breakdowns:
+            return OPTIONAL_FIELDS
+        return self.get_rule_plan().fields
+
+    def aggregate(self, fields: frozenset[str] | None = None) -> ActivityAggregate:
+        """
+        Summarises the activity logs with the engine picked by `get_engine`.
+
+        Both engines produce identical ActivityAggregate instances for the same logs.
+
+        Parameters:
+            fields (frozenset[str] | None): Optional aggregate fields to compute, by default
+                `aggregate_fields()`.
+        """
+        if fields is None:
+            fields = self.aggregate_fields()
+        match self.get_engine():
+            case EarningEngine.PANDAS:
+                with stage("dataframe"):
+                    activity_df = activity_frame(self.activity_logs)
+                with stage("aggregate"):
+                    return ActivityAggregate.from_dataframe(activity_df, fields)
+            case EarningEngine.PYTHON:
+                with stage("aggregate"):
+                    return ActivityAggregate.from_columns(self.activity_logs, fields)
 
     def generate_statement(self) -> EarningStatementResponse:
         """
         Calculates earnings based on the tier and activity logs, and generates an earnings statement.
 
-        Converts the activity logs into a DataFrame, calculates the earnings using the appropriate tier object,
-        and compiles the results into an EarningStatementResponse.
+        Summarises the activity logs once into an ActivityAggregate, calculates the earnings using the
+        rate card's compiled rule plan, and compiles the results into an EarningStatementResponse.
 
         Returns:
             EarningStatementResponse: An object containing detailed earnings information, including line items,
                                       subtotal, minimum earnings, hours worked, and final earnings.
         """
-        tier = self.get_tier()
-        activity_logs_df = DataFrame.from_records([log for log in self.activity_logs])
-        tier.calculate_earnings(activity_logs_df)
-        return EarningStatementResponse(
-            line_items=tier.line_items,
-            line_item_subtotal=tier.line_items_subtotal,
-            minimum_earnings=tier.minimum_earnings,
-            hours_worked=tier.hours_worked,
-            final_earnings=tier.final_earnings,
-        )
+        return self.evaluate(self.aggregate())
+
+    def evaluate(self, aggregate: ActivityAggregate) -> EarningStatementResponse:
+        """
+        Applies the rate card's rule plan to an already computed aggregate and adds the requested breakdowns.
+
+        Parameters:
+            aggregate (ActivityAggregate): Summary of the activity logs.
+
+        Returns:
+            EarningStatementResponse: The earnings statement for this rate card.
+        """
+        with stage("rules"):
+            statement = self.get_rule_plan().evaluate(aggregate)
+        if not self.breakdowns:
+            return statement
+        with stage("breakdown"):
+            return with_breakdowns(
+                statement,
+                aggregate,
+                self.breakdowns,
+                self.activity_logs,
+                self.get_rule_plan(),
+                self.period_hours,
+            )
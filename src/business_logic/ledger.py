@@ -0,0 +1,179 @@
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime, time, timedelta, timezone
+from src.business_logic.aggregate import ActivityAggregate
+from src.utils.timestamps import to_epoch_microseconds
+
+WEEK_MICROSECONDS = timedelta(weeks=1) // timedelta(microseconds=1)
+
+
+def week_bounds(week: str) -> tuple[int, int]:
+    """
+    The UTC span of an ISO week.
+
+    Parameters:
+        week (str): An ISO week such as 2023-W51.
+
+    Returns:
+        tuple[int, int]: Epoch microseconds of the week's first instant and of the next week's first instant.
+
+    Raises:
+        ValueError: If the week does not exist, such as week 53 of a 52-week year.
+    """
+    year, week_number = week.split("-W")
+    monday = date.fromisocalendar(int(year), int(week_number), 1)
+    start = to_epoch_microseconds(datetime.combine(monday, time(), timezone.utc))
+    return start, start + WEEK_MICROSECONDS
+
+
+class Ledger:
+    """
+    SQLite-backed store of running per-route and per-week aggregates.
+
+    Attempts are folded into the stored totals as they are appended and are never kept themselves, so
+    generating a statement reads one row per route regardless of how many attempts have been recorded.
+
+    Attributes:
+        path (str): Location of the SQLite database file.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS route_totals (
+            courier_id TEXT NOT NULL,
+            week TEXT NOT NULL,
+            route_id TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            successes INTEGER NOT NULL,
+            first_attempt INTEGER NOT NULL,
+            last_attempt INTEGER NOT NULL,
+            PRIMARY KEY (courier_id, week, route_id)
+        );
+        CREATE TABLE IF NOT EXISTS week_totals (
+            courier_id TEXT NOT NULL,
+            week TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            successes INTEGER NOT NULL,
+            routes INTEGER NOT NULL,
+            PRIMARY KEY (courier_id, week)
+        );
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call keeps the ledger safe to share between threads and forked workers.
+        return sqlite3.connect(self.path, timeout=30)
+
+    def append(self, courier_id: str, week: str, batch: ActivityAggregate) -> dict:
+        """
+        Folds new attempts into a courier's weekly totals.
+
+        Parameters:
+            courier_id (str): The courier the attempts belong to.
+            week (str): The week the attempts belong to.
+            batch (ActivityAggregate): Aggregate of the new attempts only.
+
+        Returns:
+            dict: The courier's updated weekly totals.
+        """
+        rows = [
+            (courier_id, week, route_id, attempts, successes, first, last)
+            for route_id, attempts, successes, first, last in zip(
+                batch.route_ids,
+                batch.route_attempts,
+                batch.route_successes,
+                batch.route_first_attempts,
+                batch.route_last_attempts,
+            )
+        ]
+        with closing(self._connect()) as connection, connection:
+            # Routes are first inserted empty so the number of rows actually inserted is the number of
+            # routes this batch adds to the week; the attempts are then folded into new and old rows alike.
+            new_routes = connection.executemany(
+                """
+                INSERT INTO route_totals VALUES (?, ?, ?, 0, 0, ?, ?)
+                ON CONFLICT (courier_id, week, route_id) DO NOTHING
+                """,
+                [(*row[:3], *row[5:]) for row in rows],
+            ).rowcount
+            connection.executemany(
+                """
+                UPDATE route_totals SET
+                    attempts = attempts + ?,
+                    successes = successes + ?,
+                    first_attempt = min(first_attempt, ?),
+                    last_attempt = max(last_attempt, ?)
+                WHERE courier_id = ? AND week = ? AND route_id = ?
+                """,
+                [(*row[3:], *row[:3]) for row in rows],
+            )
+            connection.execute(
+                """
+                INSERT INTO week_totals VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (courier_id, week) DO UPDATE SET
+                    attempts = attempts + excluded.attempts,
+                    successes = successes + excluded.successes,
+                    routes = routes + excluded.routes
+                """,
+                (
+                    courier_id,
+                    week,
+                    batch.total_attempts,
+                    batch.successful_attempts,
+                    new_routes,
+                ),
+            )
+        return self.totals(courier_id, week)
+
+    def totals(self, courier_id: str, week: str) -> dict | None:
+        """Returns the running totals for a courier and week, or None if nothing was recorded."""
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT attempts, successes, routes FROM week_totals WHERE courier_id = ? AND week = ?",
+                (courier_id, week),
+            ).fetchone()
+        if row is None:
+            return None
+        attempts, successes, routes = row
+        return {
+            "courier_id": courier_id,
+            "week": week,
+            "attempts": attempts,
+            "successes": successes,
+            "routes": routes,
+        }
+
+    def aggregate(self, courier_id: str, week: str) -> ActivityAggregate | None:
+        """
+        Rebuilds the ActivityAggregate for a courier and week from the stored per-route totals.
+
+        Returns:
+            ActivityAggregate | None: The aggregate, or None if nothing was recorded.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                """
+                SELECT route_id, attempts, successes, first_attempt, last_attempt
+                FROM route_totals WHERE courier_id = ? AND week = ?
+                ORDER BY route_id
+                """,
+                (courier_id, week),
+            ).fetchall()
+        if not rows:
+            return None
+        route_ids, attempts, successes, first, last = zip(*rows)
+        successful_attempts = sum(successes)
+        return ActivityAggregate(
+            successful_attempts=successful_attempts,
+            failed_attempts=sum(attempts) - successful_attempts,
+            unique_route_count=len(rows),
+            route_ids=route_ids,
+            route_attempts=attempts,
+            route_successes=successes,
+            route_first_attempts=first,
+            route_last_attempts=last,
+        )
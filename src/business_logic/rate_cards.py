@@ -0,0 +1,326 @@
+"""
+Versioned rate cards, loaded from a file and hot-reloaded while the service runs.
+
+A rate card file is JSON (or YAML when PyYAML is installed)::
+
+    {
+        "version": "2024-01-15",
+        "rate_cards": {
+            "bronze_tier": {
+                "hourly_minimum_earnings": 14.5,
+                "line_items": {"perSuccessfulAttempt": 0.459, "perUnsuccessfulAttempt": 0.229, ...}
+            },
+            ...
+        }
+    }
+
+In YAML an unquoted date such as `version: 2024-01-15` is accepted and read as the version "2024-01-15".
+Without `RATE_CARD_PATH` the built-in `RATE_CARD` is served as version "builtin".
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from src import config
+from src.constants import RATE_CARD
+from src.enums import LineItemType, Tier, TierRateCardId
+from src.model import LineItem, RateCard
+from src.business_logic.rules import LINE_ITEM_RULES, RulePlan, compile_rule_plan
+
+BUILTIN_VERSION = "builtin"
+# Line items every rate card must define.
+REQUIRED_LINE_ITEMS = (
+    LineItemType.PerSuccessfulAttempt,
+    LineItemType.PerUnsuccessfulAttempt,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RateCardError(ValueError):
+    """Raised when a rate card file cannot be read or fails validation."""
+
+
+@dataclass(frozen=True)
+class RateCardSet:
+    """
+    One version of every rate card, compiled into rule plans.
+
+    Attributes:
+        version (str): Version declared by the rate card file.
+        fingerprint (str): Hash of the file's content, distinguishing edits that reuse a version.
+        plans (dict[TierRateCardId, RulePlan]): Compiled rule plan per rate card.
+    """
+
+    version: str
+    fingerprint: str
+    plans: dict[TierRateCardId, RulePlan]
+
+
+def compile_rate_cards(
+    version: str, rate_cards: dict[TierRateCardId, RateCard], fingerprint: str = ""
+) -> RateCardSet:
+    """
+    Compiles every rate card of one version.
+
+    Returns:
+        RateCardSet: The compiled rate cards.
+    """
+    return RateCardSet(
+        version=version,
+        fingerprint=fingerprint,
+        plans={
+            rate_card_id: compile_rule_plan(rate_card_id, rate_card, version)
+            for rate_card_id, rate_card in rate_cards.items()
+        },
+    )
+
+
+def builtin_rate_cards() -> RateCardSet:
+    """Compiles the rate cards defined in `src.constants.RATE_CARD`."""
+    return compile_rate_cards(
+        BUILTIN_VERSION,
+        {
+            rate_card_id: RATE_CARD[Tier[rate_card_id.name]]
+            for rate_card_id in TierRateCardId
+        },
+    )
+
+
+def read_rate_card_file(path: str) -> dict:
+    """
+    Reads a rate card file.
+
+    Raises:
+        RateCardError: If the file cannot be read or parsed.
+    """
+    try:
+        with open(path, "rb") as rate_card_file:
+            content = rate_card_file.read()
+    except OSError as e:
+        raise RateCardError(f"Could not read rate card file {path}: {e}") from e
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise RateCardError("PyYAML is required to read YAML rate card files")
+        parse, errors = yaml.safe_load, yaml.YAMLError
+    else:
+        parse, errors = json.loads, ValueError
+    try:
+        return parse(content)
+    except errors as e:
+        raise RateCardError(f"Could not parse rate card file {path}: {e}") from e
+
+
+def parse_rate_cards(document) -> tuple[str, dict[TierRateCardId, RateCard]]:
+    """
+    Validates a parsed rate card file.
+
+    Returns:
+        tuple[str, dict[TierRateCardId, RateCard]]: The version and the rate card per rate card id.
+
+    Raises:
+        RateCardError: If the document is not a valid rate card file.
+    """
+    if not isinstance(document, dict):
+        raise RateCardError("Rate card file must contain an object")
+    check_keys(document, "the rate card file")
+    version = document.get("version")
+    if isinstance(version, date):
+        # YAML loads an unquoted `version: 2024-01-15` as a date.
+        version = version.isoformat()
+    if not isinstance(version, str) or not version:
+        raise RateCardError("'version' must be a non-empty string")
+    cards = document.get("rate_cards")
+    if not isinstance(cards, dict):
+        raise RateCardError("'rate_cards' must be an object")
+    check_keys(cards, "'rate_cards'")
+
+    unknown = set(cards) - {str(rate_card_id) for rate_card_id in TierRateCardId}
+    if unknown:
+        raise RateCardError(
+            f"Unknown rate card ids: {', '.join(sorted(map(str, unknown)))}"
+        )
+    rate_cards = {}
+    for rate_card_id in TierRateCardId:
+        card = cards.get(str(rate_card_id))
+        if not isinstance(card, dict):
+            raise RateCardError(f"Missing rate card '{rate_card_id}'")
+        check_keys(card, f"'{rate_card_id}'")
+        hourly_minimum_earnings = card.get("hourly_minimum_earnings")
+        if not is_rate(hourly_minimum_earnings):
+            raise RateCardError(
+                f"'{rate_card_id}.hourly_minimum_earnings' must be a number"
+            )
+        line_items = card.get("line_items")
+        if not isinstance(line_items, dict):
+            raise RateCardError(f"'{rate_card_id}.line_items' must be an object")
+        check_keys(line_items, f"'{rate_card_id}.line_items'")
+        parsed_line_items = {}
+        for name, rate in line_items.items():
+            line_item_type = LineItemType.get_enum_by_value(name)
+            if line_item_type not in LINE_ITEM_RULES:
+                raise RateCardError(f"Unknown line item '{rate_card_id}.{name}'")
+            if not is_rate(rate):
+                raise RateCardError(f"'{rate_card_id}.{name}' must be a number")
+            parsed_line_items[line_item_type] = LineItem(rate=float(rate))
+        for line_item_type in REQUIRED_LINE_ITEMS:
+            if line_item_type not in parsed_line_items:
+                raise RateCardError(
+                    f"Missing line item '{rate_card_id}.{line_item_type}'"
+                )
+        rate_cards[rate_card_id] = RateCard(
+            hourly_minimum_earnings=float(hourly_minimum_earnings),
+            line_items=parsed_line_items,
+        )
+    return version, rate_cards
+
+
+def check_keys(mapping: dict, name: str) -> None:
+    """
+    Checks that every key of an object is a string; YAML also allows numbers and dates as keys.
+
+    Raises:
+        RateCardError: If a key is not a string.
+    """
+    keys = [str(key) for key in mapping if not isinstance(key, str)]
+    if keys:
+        raise RateCardError(f"Keys of {name} must be strings, got: {', '.join(keys)}")
+
+
+def is_rate(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class RateCardStore:
+    """
+    Serves the current rate cards and swaps in a new version when the rate card file changes.
+
+    The file is checked with `os.stat` at most once every `reload_interval_seconds`, by whichever
+    request comes first, so the check also works in forked workers that have no background threads.
+    Reading and compiling a changed file happens outside any lock readers take: requests keep using the
+    version they already hold, and the new version becomes visible with a single reference swap. A file
+    that fails validation is logged and ignored, and the previous version stays active.
+
+    Compiled versions are kept, most recently used last, so switching the file back to a recent version
+    reuses its compiled rule plans.
+
+    Attributes:
+        path (str): Rate card file, or an empty string for the built-in rate cards.
+        reload_interval_seconds (float): Minimum time between checks of the file.
+        max_versions (int): Number of compiled versions kept.
+    """
+
+    def __init__(
+        self,
+        path: str = "",
+        reload_interval_seconds: float = 5.0,
+        max_versions: int = 8,
+        clock=time.monotonic,
+    ) -> None:
+        self.path = path
+        self.reload_interval_seconds = reload_interval_seconds
+        self.max_versions = max_versions
+        self._clock = clock
+        self._versions = OrderedDict()
+        self._reload_lock = threading.Lock()
+        self._file_state = None
+        self._next_check = clock() + reload_interval_seconds
+        if path:
+            self._file_state = self._stat()
+            self._current = self.load()
+        else:
+            self._current = builtin_rate_cards()
+
+    @property
+    def versions(self) -> list[str]:
+        """Compiled versions, most recently used last."""
+        return list(self._versions)
+
+    def current(self) -> RateCardSet:
+        """
+        Returns the active rate cards, first checking the file if the reload interval has passed.
+
+        Returns:
+            RateCardSet: Rate cards to use for the whole of one request.
+        """
+        if self.path and self._clock() >= self._next_check:
+            self.check()
+        return self._current
+
+    def check(self) -> bool:
+        """
+        Reloads the rate card file if it changed since it was last read.
+
+        Returns immediately if another thread is already reloading.
+
+        Returns:
+            bool: Whether a new version was activated.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = self._clock() + self.reload_interval_seconds
+            file_state = self._stat()
+            if file_state == self._file_state:
+                return False
+            self._file_state = file_state
+            try:
+                rate_cards = self.load()
+            except RateCardError as e:
+                logger.error(
+                    "Keeping rate card version %s: %s", self._current.version, e
+                )
+                return False
+            changed = rate_cards is not self._current
+            self._current = rate_cards
+            return changed
+        finally:
+            self._reload_lock.release()
+
+    def load(self) -> RateCardSet:
+        """
+        Reads, validates and compiles the rate card file, reusing a cached compilation of the same content.
+
+        Raises:
+            RateCardError: If the file is missing or invalid.
+        """
+        document = read_rate_card_file(self.path)
+        version, rate_cards = parse_rate_cards(document)
+        fingerprint = hashlib.blake2b(
+            json.dumps(document, sort_keys=True, default=str).encode(), digest_size=16
+        ).hexdigest()
+        cached = self._versions.get(version)
+        if cached is None or cached.fingerprint != fingerprint:
+            cached = compile_rate_cards(version, rate_cards, fingerprint)
+            self._versions[version] = cached
+        self._versions.move_to_end(version)
+        while len(self._versions) > self.max_versions:
+            self._versions.popitem(last=False)
+        return cached
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+rate_card_store = RateCardStore(
+    path=config.RATE_CARD_PATH,
+    reload_interval_seconds=config.RATE_CARD_RELOAD_INTERVAL_SECONDS,
+    max_versions=config.RATE_CARD_VERSIONS_CACHED,
+)
+
+
+def current_rate_cards() -> RateCardSet:
+    """Returns the active rate cards."""
+    return rate_card_store.current()
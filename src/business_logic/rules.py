@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from typing import Callable
+from src.enums import TierRateCardId, LineItemType
+from src.constants import LINE_ITEM_TYPE_NAME
+from src.model import LineItemResponse, EarningStatementResponse, RateCard
+from src.business_logic.aggregate import ActivityAggregate
+
+# A route with more attempts than this is a long route.
+LONG_ROUTE_ATTEMPTS = 30
+
+
+def is_long_route(attempts: int) -> bool:
+    return attempts > LONG_ROUTE_ATTEMPTS
+
+
+def successful_attempts(aggregate: ActivityAggregate) -> float:
+    """Earnings from successful attempts are paid per attempt."""
+    return float(aggregate.successful_attempts)
+
+
+def unsuccessful_attempts(aggregate: ActivityAggregate) -> float:
+    """Deductions or zero-earnings from unsuccessful attempts are applied per attempt."""
+    return float(aggregate.failed_attempts)
+
+
+def long_route_bonus(aggregate: ActivityAggregate) -> int:
+    """A long route bonus is applied if a route has more than 30 attempts."""
+    return 1 if any(map(is_long_route, aggregate.route_attempts)) else 0
+
+
+def loyalty_bonus_routes(aggregate: ActivityAggregate) -> int:
+    """A loyalty bonus for routes is applied if more than 10 unique routes have been completed."""
+    return 1 if aggregate.unique_route_count > 10 else 0
+
+
+def loyalty_bonus_attempts(aggregate: ActivityAggregate) -> int:
+    """A loyalty bonus for attempts is applied if there are 150 or more successful attempts."""
+    return 1 if aggregate.successful_attempts >= 150 else 0
+
+
+def quality_bonus(aggregate: ActivityAggregate) -> int:
+    """A quality bonus is applied if there are at least 20 attempts with a success rate of 97% or higher."""
+    success_rate = aggregate.success_rate * 100
+    return 1 if aggregate.total_attempts >= 20 and success_rate >= 97.0 else 0
+
+
+def consistency_bonus(aggregate: ActivityAggregate) -> int:
+    """
+    A consistency bonus is applied if deliveries were completed on at least two unique routes with an
+    overall success rate of 96.5% or higher.
+    """
+    success_rate = aggregate.success_rate * 100
+    return 1 if aggregate.unique_route_count >= 2 and success_rate >= 96.5 else 0
+
+
+# Mapping of line item types to the function computing their quantity from an aggregate.
+LINE_ITEM_RULES = {
+    LineItemType.PerSuccessfulAttempt: successful_attempts,
+    LineItemType.PerUnsuccessfulAttempt: unsuccessful_attempts,
+    LineItemType.LongRouteBonus: long_route_bonus,
+    LineItemType.LoyaltyBonusRoutes: loyalty_bonus_routes,
+    LineItemType.LoyaltyBonusAttempts: loyalty_bonus_attempts,
+    LineItemType.QualityBonus: quality_bonus,
+    LineItemType.ConsistencyBonus: consistency_bonus,
+}
+# Mapping of rules to the optional aggregate fields (see `aggregate.OPTIONAL_FIELDS`) they read. Every
+# other rule only reads the totals and route count, which every aggregate has.
+RULE_FIELDS = {
+    long_route_bonus: frozenset({"route_attempts"}),
+}
+
+
+@dataclass(frozen=True)
+class RuleStep:
+    """
+    One compiled line item of a rule plan.
+
+    Attributes:
+        name (str): Line item name shown on the statement.
+        rate (float): Rate applied to the quantity.
+        quantity (Callable[[ActivityAggregate], float]): Rule computing the quantity.
+    """
+
+    name: str
+    rate: float
+    quantity: Callable[[ActivityAggregate], float]
+
+
+@dataclass(frozen=True)
+class RulePlan:
+    """
+    Immutable, reusable evaluator for one rate card.
+
+    A plan lists exactly the line items present on its rate card, in rate card order, with names and
+    rates resolved at compile time. Evaluating a plan only runs those rules against the aggregate, which
+    only needs the optional fields in `fields`; Gold, for example, never reads attempts per route.
+
+    Attributes:
+        rate_card_id (TierRateCardId): Rate card this plan was compiled from.
+        version (str): Version of the rate cards this plan belongs to.
+        fingerprint (str): Fingerprint of the rates at compile time.
+        hourly_minimum_earnings (float): Guaranteed earnings per hour worked.
+        steps (tuple[RuleStep, ...]): Line items to evaluate.
+        fields (frozenset[str]): Optional aggregate fields the steps read.
+    """
+
+    rate_card_id: TierRateCardId
+    version: str
+    fingerprint: str
+    hourly_minimum_earnings: float
+    steps: tuple[RuleStep, ...]
+    fields: frozenset[str] = frozenset()
+
+    def attempt_rates(self) -> tuple[float, float]:
+        """
+        Returns the rates paid per successful and per unsuccessful attempt.
+
+        Every other line item is a weekly bonus that only the whole activity log can qualify for.
+        """
+        return (
+            sum(
+                step.rate for step in self.steps if step.quantity is successful_attempts
+            ),
+            sum(
+                step.rate
+                for step in self.steps
+                if step.quantity is unsuccessful_attempts
+            ),
+        )
+
+    def evaluate(self, aggregate: ActivityAggregate) -> EarningStatementResponse:
+        """
+        Applies the plan to an aggregate.
+
+        Parameters:
+            aggregate (ActivityAggregate): Summary of the activity logs.
+
+        Returns:
+            EarningStatementResponse: The earnings statement for this rate card.
+        """
+        line_items = []
+        for step in self.steps:
+            quantity = step.quantity(aggregate)
+            line_items.append(
+                LineItemResponse(
+                    name=step.name,
+                    quantity=quantity,
+                    rate=step.rate,
+                    total=quantity * step.rate,
+                )
+            )
+        line_item_subtotal = sum([line_item.total for line_item in line_items])
+        hours_worked = aggregate.hours_worked
+        minimum_earnings = hours_worked * self.hourly_minimum_earnings
+        return EarningStatementResponse(
+            line_items=line_items,
+            line_item_subtotal=line_item_subtotal,
+            minimum_earnings=minimum_earnings,
+            hours_worked=hours_worked,
+            final_earnings=(
+                line_item_subtotal
+                if line_item_subtotal > minimum_earnings
+                else minimum_earnings
+            ),
+            rate_card_version=self.version,
+        )
+
+
+def compile_rule_plan(
+    rate_card_id: TierRateCardId, rate_card: RateCard, version: str
+) -> RulePlan:
+    """
+    Compiles a rate card into a rule plan.
+
+    Parameters:
+        rate_card_id (TierRateCardId): Rate card identifier.
+        rate_card (RateCard): Rates and line items of the card.
+        version (str): Version of the rate cards the card belongs to.
+
+    Returns:
+        RulePlan: Evaluator for the rate card.
+
+    Raises:
+        KeyError: If the rate card contains a line item type without a rule.
+    """
+    steps = tuple(
+        RuleStep(
+            name=LINE_ITEM_TYPE_NAME[line_item_type],
+            rate=line_item.rate,
+            quantity=LINE_ITEM_RULES[line_item_type],
+        )
+        for line_item_type, line_item in rate_card.line_items.items()
+    )
+    return RulePlan(
+        rate_card_id=rate_card_id,
+        version=version,
+        fingerprint=rate_card.fingerprint(),
+        hourly_minimum_earnings=rate_card.hourly_minimum_earnings,
+        steps=steps,
+        fields=frozenset().union(
+            *(RULE_FIELDS.get(step.quantity, ()) for step in steps)
+        ),
+    )
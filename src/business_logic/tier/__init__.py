@@ -1,4 +0,0 @@
-from .bronze import BronzeTier
-from .silver import SilverTier
-from .gold import GoldTier
-from .platinum import PlatinumTier
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Builds and recomputes memory-mapped activity archives.
+
+`write` converts a JSONL file of {"courier": ..., "rate_card_id": ..., "logs": [...]} records into a
+columnar archive. `recompute` maps an archive and computes every courier's statement from zero-copy
+column slices on a process pool, writing results like `src.cli.batch`.
+
+Usage:
+    python -m src.cli.archive write couriers.jsonl fleet-2023-W51.rla
+    python -m src.cli.archive recompute fleet-2023-W51.rla --output statements.jsonl --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+from src.enums import TierRateCardId
+from src.model import ActivityColumns
+from src.business_logic.archive import ActivityArchive, ArchiveWriter
+from src.business_logic.earning import Earning
+from src.cli.batch import run_chunks, write_results
+from src.resource.payload import load_activity_logs
+from src.utils.exceptions import APIException, ValidationError, ValidationException
+
+_archives = {}
+
+
+def write_archive(input_stream, path: str, error_stream=sys.stderr) -> tuple[int, int]:
+    """
+    Converts JSONL records into an archive, skipping and reporting invalid records.
+
+    Returns:
+        tuple[int, int]: Number of couriers written and number of records skipped.
+    """
+    skipped = 0
+    with ArchiveWriter(path) as writer:
+        for line_number, line in enumerate(input_stream):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                writer.add(
+                    record["courier"],
+                    record["rate_card_id"],
+                    load_activity_logs(record["logs"]),
+                )
+            except (ValueError, KeyError, TypeError, APIException) as e:
+                skipped += 1
+                error_stream.write(f"skipped line {line_number}: {e!r}\n")
+        return len(writer.courier_ids), skipped
+
+
+def open_archive(path: str) -> ActivityArchive:
+    """Returns this process's mapping of `path`, opening it on first use."""
+    archive = _archives.get(path)
+    if archive is None:
+        archive = _archives[path] = ActivityArchive(path)
+    return archive
+
+
+def recompute_range(task: tuple[str, int, int]) -> list[tuple]:
+    """
+    Computes statements for couriers `start` to `stop` of an archive.
+
+    Returns:
+        list[tuple]: (courier, rate_card_id, attempts, statement or None, error dict or None) per courier.
+    """
+    path, start, stop = task
+    archive = open_archive(path)
+    results = []
+    for index in range(start, stop):
+        courier, rate_card_id = archive.courier_ids[index], archive.rate_card_ids[index]
+        aggregate = archive.aggregate(index)
+        rate_card_id_enum = TierRateCardId.get_enum_by_value(rate_card_id)
+        if not rate_card_id_enum:
+            error = ValidationException(
+                ValidationError({"rate_card_id": ["Invalid rate card id provided"]})
+            )
+            results.append(
+                (courier, rate_card_id, aggregate.total_attempts, None, error.to_dict())
+            )
+            continue
+        statement = Earning(rate_card_id_enum, ActivityColumns()).evaluate(aggregate)
+        results.append(
+            (courier, rate_card_id, aggregate.total_attempts, statement, None)
+        )
+    return results
+
+
+def recompute(
+    path,
+    output_stream,
+    output_format="jsonl",
+    workers=1,
+    chunk_size=256,
+    progress_interval=5.0,
+):
+    """
+    Recomputes every courier's statement in an archive.
+
+    Returns:
+        Progress: Final counters.
+    """
+    couriers = len(open_archive(path))
+    tasks = (
+        (path, start, min(start + chunk_size, couriers))
+        for start in range(0, couriers, chunk_size)
+    )
+    results = run_chunks(tasks, workers, recompute_range)
+    return write_results(results, output_stream, output_format, progress_interval)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    write = commands.add_parser("write", help="Convert a JSONL file into an archive")
+    write.add_argument(
+        "input",
+        help="JSONL file of {courier, rate_card_id, logs} records, or - for stdin",
+    )
+    write.add_argument("archive", help="Archive file to create")
+    compute = commands.add_parser(
+        "recompute", help="Compute statements for every courier in an archive"
+    )
+    compute.add_argument("archive")
+    compute.add_argument(
+        "--output", "-o", default="-", help="Output file, or - for stdout (default)"
+    )
+    compute.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    compute.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1)
+    compute.add_argument(
+        "--chunk-size",
+        type=int,
+        default=256,
+        help="Couriers sent to a worker at a time",
+    )
+    compute.add_argument("--progress-interval", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    if args.command == "write":
+        input_stream = (
+            sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        )
+        try:
+            couriers, skipped = write_archive(input_stream, args.archive)
+        finally:
+            if input_stream is not sys.stdin:
+                input_stream.close()
+        sys.stderr.write(
+            f"wrote {couriers} couriers to {args.archive}, skipped {skipped} records\n"
+        )
+        return 0
+
+    output_stream = (
+        sys.stdout
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8", newline="")
+    )
+    try:
+        recompute(
+            args.archive,
+            output_stream,
+            args.format,
+            args.workers,
+            args.chunk_size,
+            args.progress_interval,
+        )
+    finally:
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Computes earnings statements offline for a JSONL file of courier activity logs.
+
+Each input line is a JSON object {"courier": ..., "rate_card_id": ..., "logs": [...]}. Records are
+processed in chunks on a process pool and written out in input order as JSONL or CSV. Only a bounded
+number of chunks is in flight at once, so memory stays flat however large the input is.
+
+Usage:
+    python -m src.cli.batch couriers.jsonl --output statements.jsonl --workers 8
+    python -m src.cli.batch couriers.jsonl --format csv > statements.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from src.enums import TierRateCardId
+from src.business_logic.earning import Earning
+from src.resource.payload import load_activity_logs
+from src.utils.exceptions import APIException, ValidationError, ValidationException
+from src.utils.serialization import dumps
+
+CSV_FIELDS = [
+    "courier",
+    "rate_card_id",
+    "line_item_subtotal",
+    "hours_worked",
+    "minimum_earnings",
+    "final_earnings",
+    "rate_card_version",
+    "error",
+]
+
+
+def process_record(line: str) -> tuple:
+    """
+    Computes the statement for one input line.
+
+    Returns:
+        tuple: (courier, rate_card_id, attempts, statement or None, error dict or None).
+    """
+    courier, rate_card_id, attempts = None, None, 0
+    try:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ValidationException(ValidationError({"_schema": ["Invalid JSON."]}))
+        if not isinstance(record, dict):
+            raise ValidationException(
+                ValidationError({"_schema": ["Invalid input type."]})
+            )
+        courier, rate_card_id = record.get("courier"), record.get("rate_card_id")
+        rate_card_id_enum = TierRateCardId.get_enum_by_value(rate_card_id)
+        if not rate_card_id_enum:
+            raise ValidationException(
+                ValidationError({"rate_card_id": ["Invalid rate card id provided"]})
+            )
+        logs = load_activity_logs(record.get("logs"))
+        attempts = len(logs)
+        statement = Earning(rate_card_id_enum, logs).generate_statement()
+        return courier, rate_card_id, attempts, statement, None
+    except APIException as e:
+        return courier, rate_card_id, attempts, None, e.to_dict()
+
+
+def process_chunk(lines: list[str]) -> list[tuple]:
+    return [process_record(line) for line in lines]
+
+
+def read_chunks(stream, chunk_size: int):
+    lines = (line for line in stream if line.strip())
+    while chunk := list(islice(lines, chunk_size)):
+        yield chunk
+
+
+def run_chunks(chunks, workers: int, function=process_chunk):
+    """Yields `function(chunk)` in input order, keeping at most 2 * workers chunks in flight."""
+    if workers <= 1:
+        yield from map(function, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class JsonLinesWriter:
+    def __init__(self, stream) -> None:
+        self.stream = stream
+
+    def write(self, courier, rate_card_id, statement, error) -> None:
+        result = {"courier": courier, "rate_card_id": rate_card_id}
+        if error is None:
+            result["statement"] = statement
+        else:
+            result["error"] = error
+        self.stream.write(dumps(result).decode())
+        self.stream.write("\n")
+
+
+class CsvWriter:
+    def __init__(self, stream) -> None:
+        self.writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, courier, rate_card_id, statement, error) -> None:
+        row = {"courier": courier, "rate_card_id": rate_card_id}
+        if error is None:
+            row.update(
+                line_item_subtotal=statement.line_item_subtotal,
+                hours_worked=statement.hours_worked,
+                minimum_earnings=statement.minimum_earnings,
+                final_earnings=statement.final_earnings,
+                rate_card_version=statement.rate_card_version,
+            )
+        else:
+            details = error.get("errors")
+            row["error"] = (
+                "; ".join(
+                    f"{detail['field']}: {detail['message']}" for detail in details
+                )
+                if details
+                else error["message"]
+            )
+        self.writer.writerow(row)
+
+
+class Progress:
+    """Reports records and attempts processed per second on stderr."""
+
+    def __init__(self, interval: float, stream=sys.stderr) -> None:
+        self.interval = interval
+        self.stream = stream
+        self.started = self.reported = time.monotonic()
+        self.records = self.attempts = self.errors = 0
+
+    def update(self, results: list[tuple]) -> None:
+        self.records += len(results)
+        for _, _, attempts, _, error in results:
+            self.attempts += attempts
+            self.errors += error is not None
+        now = time.monotonic()
+        if self.interval and now - self.reported >= self.interval:
+            self.reported = now
+            self.report("progress")
+
+    def report(self, label: str) -> None:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        self.stream.write(
+            f"{label}: {self.records} records ({self.errors} errors), {self.attempts} attempts "
+            f"in {elapsed:.1f}s - {self.records / elapsed:.0f} records/s, "
+            f"{self.attempts / elapsed:.0f} attempts/s\n"
+        )
+        self.stream.flush()
+
+
+def run(
+    input_stream,
+    output_stream,
+    output_format="jsonl",
+    workers=1,
+    chunk_size=64,
+    progress_interval=5.0,
+):
+    """
+    Streams records from `input_stream` through the earnings engine into `output_stream`.
+
+    Returns:
+        Progress: Final counters.
+    """
+    results = run_chunks(read_chunks(input_stream, chunk_size), workers)
+    return write_results(results, output_stream, output_format, progress_interval)
+
+
+def write_results(results_chunks, output_stream, output_format, progress_interval):
+    """
+    Writes chunks of (courier, rate_card_id, attempts, statement, error) results as JSONL or CSV.
+
+    Returns:
+        Progress: Final counters.
+    """
+    writer = (
+        CsvWriter(output_stream)
+        if output_format == "csv"
+        else JsonLinesWriter(output_stream)
+    )
+    progress = Progress(progress_interval)
+    for results in results_chunks:
+        for courier, rate_card_id, _, statement, error in results:
+            writer.write(courier, rate_card_id, statement, error)
+        progress.update(results)
+    progress.report("done")
+    return progress
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "input",
+        help="JSONL file of {courier, rate_card_id, logs} records, or - for stdin",
+    )
+    parser.add_argument(
+        "--output", "-o", default="-", help="Output file, or - for stdout (default)"
+    )
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--chunk-size", type=int, default=64, help="Records sent to a worker at a time"
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between progress reports, 0 to disable",
+    )
+    args = parser.parse_args(argv)
+
+    input_stream = (
+        sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    )
+    output_stream = (
+        sys.stdout
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8", newline="")
+    )
+    try:
+        run(
+            input_stream,
+            output_stream,
+            args.format,
+            args.workers,
+            args.chunk_size,
+            args.progress_interval,
+        )
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
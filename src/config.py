@@ -1,8 +1,72 @@
 import os, logging
 
-DEBUG = True
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
+# Production server (gunicorn.conf.py): worker processes, threads per worker and request timeout.
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1)))
+WEB_THREADS = int(os.getenv("WEB_THREADS", "1"))
+WEB_TIMEOUT_SECONDS = int(os.getenv("WEB_TIMEOUT_SECONDS", "30"))
+# Warm-up: "preload" (in the gunicorn master before the port opens), "background" (in every worker,
+# after it starts accepting requests) or "off".
+WARM_UP = os.getenv("WARM_UP", "preload")
+
+# Aggregation engine: "auto" picks by payload size, "pandas" or "python" forces one.
+EARNING_ENGINE = os.getenv("EARNING_ENGINE", "auto")
+# Largest activity log (in attempts) that "auto" hands to the pure Python engine.
+PYTHON_ENGINE_MAX_ATTEMPTS = int(os.getenv("PYTHON_ENGINE_MAX_ATTEMPTS", "10000"))
+# Activity log validator: "fast" (specialised, the default) or "marshmallow" (ActivityLogSchema).
+ACTIVITY_LOG_VALIDATOR = os.getenv("ACTIVITY_LOG_VALIDATOR", "fast")
+# Response encoder: "stdlib" (the default) or "auto"/"orjson", which use orjson when installed. orjson
+# writes some floats differently, e.g. 1e-05 as 0.00001 and 1e16 as 1e+16.
+JSON_BACKEND = os.getenv("JSON_BACKEND", "stdlib")
+# In-process statement cache; a size of 0 disables it.
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", "1024"))
+STATEMENT_CACHE_TTL_SECONDS = float(os.getenv("STATEMENT_CACHE_TTL_SECONDS", "300"))
+# Optional stateful weekly ledger backed by SQLite.
+LEDGER_ENABLED = os.getenv("LEDGER_ENABLED", "false").lower() == "true"
+LEDGER_PATH = os.getenv("LEDGER_PATH", "ledger.sqlite3")
+# Versioned rate card file (JSON, or YAML with PyYAML); empty serves the built-in rate cards.
+RATE_CARD_PATH = os.getenv("RATE_CARD_PATH", "")
+# How often the rate card file is checked for changes, and how many compiled versions are kept.
+RATE_CARD_RELOAD_INTERVAL_SECONDS = float(
+    os.getenv("RATE_CARD_RELOAD_INTERVAL_SECONDS", "5")
+)
+RATE_CARD_VERSIONS_CACHED = int(os.getenv("RATE_CARD_VERSIONS_CACHED", "8"))
+# Request instrumentation: Server-Timing header and the Prometheus /metrics endpoint.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+# Directory where every worker process publishes its metrics; empty keeps them in the process.
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL_SECONDS = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "1"))
+# Compressed bodies: the largest size a gzip/zstd request body may decompress to, and the smallest
+# response worth compressing for clients that accept it.
+MAX_DECOMPRESSED_BODY_BYTES = int(
+    os.getenv("MAX_DECOMPRESSED_BODY_BYTES", str(128 * 1024 * 1024))
+)
+RESPONSE_COMPRESSION_ENABLED = (
+    os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true"
+)
+RESPONSE_COMPRESSION_MIN_BYTES = int(
+    os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024")
+)
+# Admission control of the endpoints that take activity logs, per worker process: largest body and log
+# accepted (0 for no limit), body size above which a request takes the heavy lane, requests running at
+# once per lane (0 for no limit), and requests allowed to wait per lane and for how long.
+MAX_REQUEST_BODY_BYTES = int(os.getenv("MAX_REQUEST_BODY_BYTES", str(64 * 1024 * 1024)))
+MAX_ACTIVITY_LOG_ATTEMPTS = int(os.getenv("MAX_ACTIVITY_LOG_ATTEMPTS", "2000000"))
+HEAVY_REQUEST_BODY_BYTES = int(os.getenv("HEAVY_REQUEST_BODY_BYTES", str(256 * 1024)))
+LIGHT_LANE_CONCURRENCY = int(os.getenv("LIGHT_LANE_CONCURRENCY", "4"))
+HEAVY_LANE_CONCURRENCY = int(os.getenv("HEAVY_LANE_CONCURRENCY", "1"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "16"))
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(
+    os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5")
+)
+# Seconds a client turned away with a 429 is told to wait before retrying.
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+# Lets requests sent with `X-Profile: 1` run under cProfile; meant for staging replicas only.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
 
 logging.basicConfig(
     level=logging.ERROR,
@@ -51,3 +51,51 @@ class LineItemType(BasicStringEnum):
     LoyaltyBonusAttempts = "loyaltyBonusAttempts"
     QualityBonus = "qualityBonus"
     ConsistencyBonus = "consistencyBonus"
+
+
+class EarningEngine(BasicStringEnum):
+    """
+    Enum representing the engines that can aggregate activity logs.
+    """
+
+    AUTO = "auto"
+    PANDAS = "pandas"
+    PYTHON = "python"
+
+
+class ActivityLogValidator(BasicStringEnum):
+    """
+    Enum representing the validators that can deserialize activity logs.
+    """
+
+    FAST = "fast"
+    MARSHMALLOW = "marshmallow"
+
+
+class JsonBackend(BasicStringEnum):
+    """
+    Enum representing the JSON encoders available for responses.
+    """
+
+    AUTO = "auto"
+    ORJSON = "orjson"
+    STDLIB = "stdlib"
+
+
+class WarmUp(BasicStringEnum):
+    """
+    Enum representing when the server warms up before serving requests.
+    """
+
+    PRELOAD = "preload"
+    BACKGROUND = "background"
+    OFF = "off"
+
+
+class StatementBreakdown(BasicStringEnum):
+    """
+    Enum representing the optional detail sections of an earnings statement.
+    """
+
+    ROUTES = "routes"
+    PERIODS = "periods"
@@ -1,6 +1,7 @@
+from array import array
 from dataclasses import dataclass, asdict, field
-from marshmallow import Schema, fields
 import datetime
+from src.utils.timestamps import to_epoch_microseconds
 
 
 @dataclass
@@ -31,13 +32,124 @@ class EarningStatementResponse(GenericDataClass):
     hours_worked: float = 0.0
     minimum_earnings: float = 0.0
     final_earnings: float = 0.0
+    rate_card_version: str = ""
 
 
-# schema for deserialization
-class ActivityLogSchema(Schema):
-    route_id = fields.Str(required=True)
-    attempt_date_time = fields.DateTime(required=True)
-    success = fields.Boolean(required=True)
+@dataclass
+class RouteBreakdownResponse(GenericDataClass):
+    route_id: str
+    attempts: int = 0
+    successful_attempts: int = 0
+    success_rate: float = 0.0
+    hours_worked: float = 0.0
+    long_route: bool = False
+
+
+@dataclass
+class PeriodBreakdownResponse(GenericDataClass):
+    start: str
+    end: str
+    attempts: int = 0
+    successful_attempts: int = 0
+    hours_worked: float = 0.0
+    earnings: float = 0.0
+
+
+@dataclass
+class DetailedEarningStatementResponse(EarningStatementResponse):
+    routes: list[RouteBreakdownResponse] = field(default_factory=list)
+
+
+@dataclass
+class PeriodEarningStatementResponse(EarningStatementResponse):
+    periods: list[PeriodBreakdownResponse] = field(default_factory=list)
+
+
+@dataclass
+class DetailedPeriodEarningStatementResponse(DetailedEarningStatementResponse):
+    periods: list[PeriodBreakdownResponse] = field(default_factory=list)
+
+
+class ActivityColumns:
+    """
+    Column-oriented activity logs.
+
+    Route ids are dictionary-encoded at ingest: every distinct route id is stored once in
+    `route_dictionary`, in order of first appearance, and each attempt holds its index in the 32-bit
+    `route_codes`. Timestamps are UTC epoch microseconds in a signed 64-bit array and success flags are
+    stored one byte per attempt, so validated logs never materialise a dict, string or datetime per record.
+    """
+
+    __slots__ = [
+        "route_dictionary",
+        "route_codes",
+        "timestamps",
+        "successes",
+        "_route_index",
+    ]
+
+    def __init__(self, route_ids=None, timestamps=None, successes=None):
+        self.route_dictionary = []
+        self.route_codes = array("i")
+        self._route_index = {}
+        self.timestamps = timestamps if timestamps is not None else array("q")
+        self.successes = successes if successes is not None else array("b")
+        if route_ids is not None:
+            self.route_codes.extend(map(self.intern, route_ids))
+
+    @classmethod
+    def from_codes(cls, route_dictionary, route_codes, timestamps, successes):
+        """Builds columns from already dictionary-encoded route ids; `route_dictionary` must be unique."""
+        columns = cls(timestamps=timestamps, successes=successes)
+        columns.route_dictionary = route_dictionary
+        columns.route_codes = route_codes
+        columns._route_index = {
+            route_id: code for code, route_id in enumerate(route_dictionary)
+        }
+        return columns
+
+    @property
+    def route_ids(self):
+        """Route id of every attempt."""
+        return list(map(self.route_dictionary.__getitem__, self.route_codes))
+
+    def __len__(self):
+        return len(self.route_codes)
+
+    def __iter__(self):
+        return zip(self.route_ids, self.timestamps, self.successes)
+
+    def intern(self, route_id):
+        """Returns the code of a route id, adding it to the dictionary if it is new."""
+        code = self._route_index.get(route_id)
+        if code is None:
+            code = self._route_index[route_id] = len(self.route_dictionary)
+            self.route_dictionary.append(route_id)
+        return code
+
+    def append(self, route_id, timestamp, success):
+        self.route_codes.append(self.intern(route_id))
+        self.timestamps.append(timestamp)
+        self.successes.append(success)
+
+    def extend(self, other):
+        """Appends another set of activity logs, re-encoding its route codes into this dictionary."""
+        codes = [self.intern(route_id) for route_id in other.route_dictionary]
+        self.route_codes.extend(map(codes.__getitem__, other.route_codes))
+        self.timestamps.extend(other.timestamps)
+        self.successes.extend(other.successes)
+
+    @classmethod
+    def from_records(cls, activity_logs):
+        """Builds columns from deserialized ActivityLogSchema records."""
+        columns = cls()
+        for log in activity_logs:
+            columns.append(
+                log["route_id"],
+                to_epoch_microseconds(log["attempt_date_time"]),
+                log["success"],
+            )
+        return columns
 
 
 class LineItem:
@@ -53,3 +165,15 @@ class RateCard:
     def __init__(self, hourly_minimum_earnings, line_items):
         self.hourly_minimum_earnings = hourly_minimum_earnings
         self.line_items = line_items
+
+    def fingerprint(self):
+        """A string that changes whenever any rate on this card changes."""
+        return repr(
+            (
+                self.hourly_minimum_earnings,
+                [
+                    (str(line_item_type), line_item.rate)
+                    for line_item_type, line_item in self.line_items.items()
+                ],
+            )
+        )
@@ -1,26 +1,279 @@
 from flask import request
 from flask_restful import Resource
-from marshmallow import ValidationError
-from src.enums import TierRateCardId
-from src.utils.exceptions import ValidationException, InvalidPayloadException
-from src.model import ActivityLogSchema
+from src import config
+from src.enums import TierRateCardId, StatementBreakdown
+from src.model import ActivityColumns
+from src.utils.exceptions import (
+    APIException,
+    ValidationError,
+    ValidationException,
+    InvalidPayloadException,
+)
+from src.business_logic.breakdown import (
+    DEFAULT_PERIOD_HOURS,
+    MAX_PERIODS,
+    PERIOD_HOURS,
+    period_count,
+)
 from src.business_logic.earning import Earning
+from src.business_logic.batch import BatchEarning
+from src.business_logic.comparison import EarningComparison
+from src.utils.serialization import json_response
+from src.utils.admission import admission_controlled, check_attempts
+from src.utils.metrics import observe_attempts
+from src.utils.timing import stage
+from src.utils.cache import StatementCache
+from src.resource.payload import (
+    MSGPACK_MIMETYPES,
+    NDJSON_MIMETYPE,
+    aggregate_ndjson,
+    load_activity_logs,
+    load_msgpack,
+)
+
+statement_cache = StatementCache(
+    max_size=config.STATEMENT_CACHE_SIZE,
+    ttl_seconds=config.STATEMENT_CACHE_TTL_SECONDS,
+)
+
+
+def read_body():
+    """
+    Decodes the request body according to its Content-Type: MessagePack, otherwise JSON.
+
+    Raises:
+        UnsupportedMediaTypeException: If MessagePack support is not installed.
+        InvalidPayloadException: If the body cannot be decoded.
+    """
+    if request.mimetype in MSGPACK_MIMETYPES:
+        return load_msgpack(request.get_data(cache=False))
+    return request.get_json()
+
+
+def load_rate_card_id(rate_card_id):
+    """
+    Validates a rate card id.
+
+    Returns:
+        TierRateCardId: The rate card enum.
+
+    Raises:
+        ValidationException: If the rate card id is unknown.
+    """
+    rate_card_id_enum = TierRateCardId.get_enum_by_value(rate_card_id)
+    if not rate_card_id_enum:
+        raise ValidationException(
+            ValidationError({"rate_card_id": ["Invalid rate card id provided"]})
+        )
+    return rate_card_id_enum
+
+
+def load_breakdowns(value):
+    """
+    Validates the `breakdown` query parameter, a comma-separated list of statement sections.
+
+    Returns:
+        frozenset[StatementBreakdown]: The requested sections, empty when the parameter is missing.
+
+    Raises:
+        ValidationException: If a section is unknown.
+    """
+    breakdowns = set()
+    for name in filter(None, (value or "").split(",")):
+        breakdown = StatementBreakdown.get_enum_by_value(name.strip())
+        if breakdown is None:
+            raise ValidationException(
+                ValidationError({"breakdown": [f"Unknown breakdown '{name}'"]})
+            )
+        breakdowns.add(breakdown)
+    return frozenset(breakdowns)
+
+
+def load_period_hours(value):
+    """
+    Validates the `period_hours` query parameter.
+
+    Returns:
+        int: Length of a period in the periods breakdown, DEFAULT_PERIOD_HOURS when the parameter is missing.
+
+    Raises:
+        ValidationException: If the value is not one of PERIOD_HOURS.
+    """
+    if value is None:
+        return DEFAULT_PERIOD_HOURS
+    if not value.isdigit() or int(value) not in PERIOD_HOURS:
+        raise ValidationException(
+            ValidationError(
+                {
+                    "period_hours": [
+                        "Must be one of " + ", ".join(map(str, PERIOD_HOURS)) + "."
+                    ]
+                }
+            )
+        )
+    return int(value)
+
+
+def check_period_count(
+    logs: ActivityColumns, period_hours: int, field: str = "period_hours"
+) -> None:
+    """
+    Bounds the size of the periods breakdown.
+
+    Parameters:
+        logs (ActivityColumns): Validated activity logs.
+        period_hours (int): Length of a period.
+        field (str): Request field the error is reported under: `period_hours` if the client set it,
+            otherwise `breakdown`, which asked for the periods.
+
+    Raises:
+        ValidationException: If the activity logs span more than MAX_PERIODS periods.
+    """
+    if period_count(logs, period_hours) > MAX_PERIODS:
+        raise ValidationException(
+            ValidationError(
+                {
+                    field: [
+                        f"Activity logs span more than {MAX_PERIODS} periods of {period_hours} hours."
+                    ]
+                }
+            )
+        )
+
+
+def load_earning_request(rate_card_id, body):
+    """
+    Validates a rate card id and its activity logs.
+
+    Returns:
+        tuple[TierRateCardId, ActivityColumns]: The rate card enum and the validated activity logs.
+
+    Raises:
+        ValidationException: If the rate card id or any activity log is invalid.
+        InvalidPayloadException: If there are no activity logs.
+    """
+    return load_rate_card_id(rate_card_id), load_activity_logs(body)
 
 
 class EarningAPI(Resource):
+    method_decorators = [admission_controlled]
+
     def post(self, rate_card_id):
-        try:
-            rate_card_id_enum = TierRateCardId.get_enum_by_value(rate_card_id)
-            if not rate_card_id_enum:
-                raise ValidationException("Invalid rate card id provided")
-            body = request.get_json()
-            activity_logs = ActivityLogSchema(many=True)
-            logs = activity_logs.load(body)
-            if not len(logs):
-                raise InvalidPayloadException("No activity logs found")
-            
-            earning_logic = Earning(rate_card_id=rate_card_id_enum, activity_logs=logs)
-            earnings = earning_logic.generate_statement().to_dict()
-            return earnings, 200
-        except ValidationError as e:
-            raise ValidationException(e)
+        breakdowns = load_breakdowns(request.args.get("breakdown"))
+        period_hours = load_period_hours(request.args.get("period_hours"))
+        if request.mimetype == NDJSON_MIMETYPE:
+            rate_card_id_enum = load_rate_card_id(rate_card_id)
+            if StatementBreakdown.PERIODS in breakdowns:
+                raise ValidationException(
+                    ValidationError(
+                        {
+                            "breakdown": [
+                                "The periods breakdown is not available for NDJSON streams."
+                            ]
+                        }
+                    )
+                )
+            with stage("stream"):
+                aggregate = aggregate_ndjson(
+                    request.stream, max_attempts=config.MAX_ACTIVITY_LOG_ATTEMPTS
+                )
+            observe_attempts(aggregate.total_attempts)
+            earning_logic = Earning(
+                rate_card_id=rate_card_id_enum,
+                activity_logs=ActivityColumns(),
+                breakdowns=breakdowns,
+            )
+            statement = earning_logic.evaluate(aggregate)
+            with stage("serialize"):
+                return json_response(statement)
+
+        with stage("parse"):
+            body = read_body()
+        with stage("validate"):
+            rate_card_id_enum, logs = load_earning_request(rate_card_id, body)
+            check_attempts(len(logs))
+            if StatementBreakdown.PERIODS in breakdowns:
+                field = (
+                    "period_hours" if "period_hours" in request.args else "breakdown"
+                )
+                check_period_count(logs, period_hours, field)
+        observe_attempts(len(logs))
+        earning_logic = Earning(
+            rate_card_id=rate_card_id_enum,
+            activity_logs=logs,
+            breakdowns=breakdowns,
+            period_hours=period_hours,
+        )
+        if not statement_cache.max_size:
+            statement = earning_logic.generate_statement()
+        else:
+            with stage("cache"):
+                cache_key = earning_logic.cache_key()
+                statement = statement_cache.get(cache_key)
+            if statement is None:
+                statement = earning_logic.generate_statement()
+                statement_cache.put(cache_key, statement)
+        with stage("serialize"):
+            return json_response(statement)
+
+
+class StatementCacheAPI(Resource):
+    def get(self):
+        return json_response(statement_cache.stats())
+
+
+class BatchEarningAPI(Resource):
+    method_decorators = [admission_controlled]
+
+    def post(self):
+        with stage("parse"):
+            body = read_body()
+        if not isinstance(body, dict):
+            raise InvalidPayloadException(
+                "Expected an object mapping courier ids to earning requests"
+            )
+        couriers, errors = {}, {}
+        for courier_id, courier_request in body.items():
+            try:
+                if not isinstance(courier_request, dict):
+                    raise InvalidPayloadException(
+                        "Expected an object with rate_card_id and activity_logs"
+                    )
+                with stage("validate"):
+                    couriers[courier_id] = load_earning_request(
+                        courier_request.get("rate_card_id"),
+                        courier_request.get("activity_logs"),
+                    )
+            except APIException as e:
+                errors[courier_id] = e.to_dict()
+        attempts = sum(len(logs) for _, logs in couriers.values())
+        check_attempts(attempts)
+        observe_attempts(attempts)
+
+        statements = BatchEarning(couriers).generate_statements()
+        with stage("serialize"):
+            return json_response({"statements": statements, "errors": errors})
+
+
+class EarningComparisonAPI(Resource):
+    method_decorators = [admission_controlled]
+
+    def post(self):
+        with stage("parse"):
+            body = read_body()
+        with stage("validate"):
+            logs = load_activity_logs(body)
+            check_attempts(len(logs))
+        observe_attempts(len(logs))
+        comparison = EarningComparison(activity_logs=logs)
+        statements = comparison.generate_statements()
+        with stage("serialize"):
+            return json_response(
+                {
+                    "statements": {
+                        str(rate_card_id): statement
+                        for rate_card_id, statement in statements.items()
+                    },
+                    "best_rate_card_id": str(comparison.best_rate_card_id(statements)),
+                }
+            )
@@ -0,0 +1,95 @@
+import re
+from flask import request
+from flask_restful import Resource
+from src import config
+from src.business_logic.aggregate import ActivityAggregate
+from src.business_logic.earning import Earning
+from src.business_logic.ledger import Ledger, week_bounds
+from src.model import ActivityColumns
+from src.resource.earning import load_rate_card_id
+from src.resource.payload import NDJSON_MIMETYPE, aggregate_ndjson, load_activity_logs
+from src.utils.exceptions import (
+    NotFoundException,
+    ValidationError,
+    ValidationException,
+)
+from src.utils.serialization import json_response
+
+WEEK_PATTERN = re.compile(r"^\d{4}-W(0[1-9]|[1-4]\d|5[0-3])$")
+
+_ledgers = {}
+
+
+def get_ledger() -> Ledger:
+    """
+    Returns the ledger at `LEDGER_PATH`, opening it on first use.
+
+    Raises:
+        NotFoundException: If the ledger mode is disabled.
+    """
+    if not config.LEDGER_ENABLED:
+        raise NotFoundException("Ledger mode is disabled")
+    ledger = _ledgers.get(config.LEDGER_PATH)
+    if ledger is None:
+        ledger = _ledgers[config.LEDGER_PATH] = Ledger(config.LEDGER_PATH)
+    return ledger
+
+
+def load_week(week):
+    """
+    Validates an ISO week such as 2023-W51.
+
+    Raises:
+        ValidationException: If the week is malformed or does not exist.
+    """
+    if not WEEK_PATTERN.match(week):
+        raise ValidationException(
+            ValidationError({"week": ["Expected an ISO week such as 2023-W51."]})
+        )
+    try:
+        week_bounds(week)
+    except ValueError:
+        raise ValidationException(
+            ValidationError({"week": [f"{week[:4]} has no week {week[6:]}."]})
+        )
+    return week
+
+
+def check_week(batch: ActivityAggregate, week: str) -> None:
+    """
+    Checks that every attempt in a batch falls within its week.
+
+    Raises:
+        ValidationException: If an attempt falls outside the week.
+    """
+    start, end = week_bounds(week)
+    if min(batch.route_first_attempts) < start or max(batch.route_last_attempts) >= end:
+        raise ValidationException(
+            ValidationError(
+                {"attempt_date_time": [f"Attempts must fall within the week {week}."]}
+            )
+        )
+
+
+class LedgerAttemptsAPI(Resource):
+    def post(self, courier_id, week):
+        ledger = get_ledger()
+        week = load_week(week)
+        if request.mimetype == NDJSON_MIMETYPE:
+            batch = aggregate_ndjson(request.stream)
+        else:
+            batch = ActivityAggregate.from_columns(load_activity_logs(request.get_json()))
+        check_week(batch, week)
+        return json_response(ledger.append(courier_id, week, batch))
+
+
+class LedgerEarningAPI(Resource):
+    def get(self, courier_id, week, rate_card_id):
+        ledger = get_ledger()
+        week = load_week(week)
+        rate_card_id_enum = load_rate_card_id(rate_card_id)
+        aggregate = ledger.aggregate(courier_id, week)
+        if aggregate is None:
+            raise NotFoundException("No attempts recorded for this courier and week")
+        earning_logic = Earning(rate_card_id=rate_card_id_enum, activity_logs=ActivityColumns())
+        return json_response(earning_logic.evaluate(aggregate))
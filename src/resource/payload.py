@@ -0,0 +1,136 @@
+import json
+from src import config
+from src.enums import ActivityLogValidator
+from src.model import ActivityColumns
+from src.business_logic.aggregate import ActivityAggregate, ActivityAggregator
+from src.utils.exceptions import (
+    ValidationError,
+    ValidationException,
+    InvalidPayloadException,
+    PayloadTooLargeException,
+    UnsupportedMediaTypeException,
+)
+from src.utils.timestamps import to_epoch_microseconds
+from src.utils.validation import (
+    load_activity_columns,
+    load_columnar_activity_logs,
+    validate_activity_log,
+)
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+MSGPACK_MIMETYPES = (
+    "application/msgpack",
+    "application/x-msgpack",
+    "application/vnd.msgpack",
+)
+
+
+def use_marshmallow() -> bool:
+    """Whether the `ACTIVITY_LOG_VALIDATOR` setting selects the marshmallow fallback."""
+    return (
+        ActivityLogValidator.get_enum_by_value(config.ACTIVITY_LOG_VALIDATOR)
+        == ActivityLogValidator.MARSHMALLOW
+    )
+
+
+def load_activity_logs(body) -> ActivityColumns:
+    """
+    Deserializes and validates activity logs, given as a list of records or in the columnar layout
+    described by `load_columnar_activity_logs`.
+
+    Returns:
+        ActivityColumns: The validated activity logs.
+
+    Raises:
+        ValidationException: If any activity log is invalid.
+        InvalidPayloadException: If there are no activity logs.
+    """
+    try:
+        if isinstance(body, dict):
+            logs = load_columnar_activity_logs(body)
+        elif use_marshmallow():
+            from src.schema import load_activity_log_records
+
+            logs = ActivityColumns.from_records(
+                load_activity_log_records(body, many=True)
+            )
+        else:
+            logs = load_activity_columns(body)
+    except ValidationError as e:
+        raise ValidationException(e)
+    if not len(logs):
+        raise InvalidPayloadException("No activity logs found")
+    return logs
+
+
+def load_msgpack(data: bytes):
+    """
+    Decodes a MessagePack request body. MessagePack timestamps are decoded to datetimes.
+
+    Raises:
+        UnsupportedMediaTypeException: If the msgpack package is not installed.
+        InvalidPayloadException: If the body is not valid MessagePack.
+    """
+    try:
+        import msgpack
+    except ImportError:
+        raise UnsupportedMediaTypeException(
+            "MessagePack bodies require the msgpack package"
+        )
+    try:
+        return msgpack.unpackb(data, raw=False, timestamp=3)
+    except (ValueError, msgpack.UnpackException):
+        raise InvalidPayloadException("Invalid MessagePack body")
+
+
+def aggregate_ndjson(stream, max_attempts: int = 0) -> ActivityAggregate:
+    """
+    Reads newline-delimited JSON activity logs from a stream and folds them into running aggregates.
+
+    Each line is validated and discarded as soon as it has been added, so memory stays proportional to
+    the number of routes rather than the length of the log. Blank lines are ignored.
+
+    Parameters:
+        stream: A binary file-like object yielding one JSON activity log per line.
+        max_attempts (int): Most activity logs accepted, 0 for no limit.
+
+    Raises:
+        ValidationException: If a line is not valid JSON or not a valid activity log. The error field is
+                             prefixed with the zero-based line number.
+        InvalidPayloadException: If the stream contains no activity logs.
+        PayloadTooLargeException: If the stream contains more than `max_attempts` activity logs.
+    """
+    if use_marshmallow():
+        from src.schema import load_activity_log_records
+
+        def validate(record):
+            log = load_activity_log_records(record)
+            return (
+                log["route_id"],
+                to_epoch_microseconds(log["attempt_date_time"]),
+                log["success"],
+            )
+
+    else:
+        validate = validate_activity_log
+    aggregator = ActivityAggregator()
+    attempts = 0
+    for line_number, line in enumerate(stream):
+        if not line.strip():
+            continue
+        attempts += 1
+        if max_attempts and attempts > max_attempts:
+            raise PayloadTooLargeException(
+                f"Activity logs exceed {max_attempts} attempts"
+            )
+        try:
+            aggregator.add(*validate(json.loads(line)))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise ValidationException(
+                ValidationError({line_number: {"_schema": ["Invalid JSON."]}})
+            )
+        except ValidationError as e:
+            raise ValidationException(ValidationError({line_number: e.messages}))
+    if not attempts:
+        raise InvalidPayloadException("No activity logs found")
+    return aggregator.build()
@@ -6,6 +6,14 @@ earning_blueprint = Blueprint("earning", __name__)
 earning_blueprint_api = Api(earning_blueprint)
 
 
-from src.resource.earning import EarningAPI
+from src.resource.earning import (
+    EarningAPI,
+    BatchEarningAPI,
+    EarningComparisonAPI,
+    StatementCacheAPI,
+)
 
 earning_blueprint_api.add_resource(EarningAPI, "/earning/<string:rate_card_id>")
+earning_blueprint_api.add_resource(BatchEarningAPI, "/earning/batch")
+earning_blueprint_api.add_resource(EarningComparisonAPI, "/earning/compare")
+earning_blueprint_api.add_resource(StatementCacheAPI, "/earning/cache")
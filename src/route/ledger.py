@@ -0,0 +1,17 @@
+from flask import Blueprint
+from flask_restful import Api
+
+
+ledger_blueprint = Blueprint("ledger", __name__)
+ledger_blueprint_api = Api(ledger_blueprint)
+
+
+from src.resource.ledger import LedgerAttemptsAPI, LedgerEarningAPI
+
+ledger_blueprint_api.add_resource(
+    LedgerAttemptsAPI, "/ledger/<string:courier_id>/<string:week>/attempts"
+)
+ledger_blueprint_api.add_resource(
+    LedgerEarningAPI,
+    "/ledger/<string:courier_id>/<string:week>/earning/<string:rate_card_id>",
+)
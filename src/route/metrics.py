@@ -0,0 +1,9 @@
+from flask import Blueprint, Response
+from src.utils.metrics import registry
+
+metrics_blueprint = Blueprint("metrics", __name__)
+
+
+@metrics_blueprint.route("/metrics")
+def metrics():
+    return Response(registry.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,39 @@
+"""
+marshmallow schema for activity logs, used when `ACTIVITY_LOG_VALIDATOR` is "marshmallow".
+
+Kept out of `src.model` so marshmallow is only imported by processes that select it.
+"""
+from marshmallow import Schema, fields, ValidationError as SchemaValidationError
+from src.utils.exceptions import ValidationError
+
+
+# schema for deserialization
+class ActivityLogSchema(Schema):
+    route_id = fields.Str(required=True)
+    attempt_date_time = fields.DateTime(required=True)
+    success = fields.Boolean(required=True)
+
+
+_activity_log_schema = ActivityLogSchema()
+_activity_logs_schema = ActivityLogSchema(many=True)
+
+
+def load_activity_log_records(data, many: bool = False):
+    """
+    Deserializes activity logs with ActivityLogSchema.
+
+    Parameters:
+        data: A single activity log, or a list of them when `many` is set.
+        many (bool): Whether `data` is a list of activity logs.
+
+    Returns:
+        dict | list[dict]: The deserialized activity log(s).
+
+    Raises:
+        ValidationError: With marshmallow's error messages, if any activity log is invalid.
+    """
+    schema = _activity_logs_schema if many else _activity_log_schema
+    try:
+        return schema.load(data)
+    except SchemaValidationError as e:
+        raise ValidationError(e.messages) from e
@@ -0,0 +1,225 @@
+"""
+Admission control for the endpoints that take activity logs.
+
+Each worker process admits a bounded number of these requests at a time, in two lanes: requests whose
+body is larger than `HEAVY_REQUEST_BODY_BYTES`, or of unknown length, take the heavy lane and all others
+the light lane, so a few enormous logs cannot hold up small ones. A request that finds its lane full waits
+in a bounded queue. When the queue is full it is turned away at once, before its body is read, with a 429
+and a `Retry-After` header; so is a request that waited longer than `ADMISSION_QUEUE_TIMEOUT_SECONDS`.
+
+Compressed bodies are decompressed as they are read, so their Content-Length says nothing about the work
+they carry; they always take the heavy lane.
+
+Bodies larger than `MAX_REQUEST_BODY_BYTES` and logs of more than `MAX_ACTIVITY_LOG_ATTEMPTS` attempts
+are rejected with a 413. Bodies sent without a Content-Length are counted as they are read.
+"""
+
+import io
+import time
+from functools import wraps
+from threading import Condition
+from flask import request
+from werkzeug.wsgi import get_input_stream
+from src import config
+from src.utils.exceptions import PayloadTooLargeException, TooManyRequestsException
+from src.utils.metrics import registry
+from src.utils.timing import stage
+
+LIGHT_LANE = "light"
+HEAVY_LANE = "heavy"
+
+
+class Lane:
+    """
+    A concurrency limit with a bounded wait queue.
+
+    Attributes:
+        name (str): Lane name, used as the `lane` metrics label.
+        concurrency (int): Requests running at once; 0 for no limit.
+        queue_size (int): Requests allowed to wait for a free slot.
+        timeout_seconds (float): Longest a request waits for a free slot.
+        active (int): Requests currently running.
+        waiting (int): Requests currently waiting.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        queue_size: int,
+        timeout_seconds: float,
+        clock=time.monotonic,
+    ) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.timeout_seconds = timeout_seconds
+        self.active = 0
+        self.waiting = 0
+        self._clock = clock
+        self._condition = Condition()
+
+    def has_slot(self) -> bool:
+        return not self.concurrency or self.active < self.concurrency
+
+    def acquire(self) -> None:
+        """
+        Takes a slot, waiting for one if the lane is full.
+
+        Raises:
+            TooManyRequestsException: If the queue is full, or no slot freed up in time.
+        """
+        with self._condition:
+            if self.has_slot() and not self.waiting:
+                self.active += 1
+                return
+            if self.waiting >= self.queue_size:
+                self.reject("queue_full")
+            self.waiting += 1
+            registry.inc("earning_admission_queued_total", lane=self.name)
+            deadline = self._clock() + self.timeout_seconds
+            try:
+                while not self.has_slot():
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        self.reject("queue_timeout")
+                    self._condition.wait(remaining)
+            finally:
+                self.waiting -= 1
+            self.active += 1
+
+    def release(self) -> None:
+        """Frees a slot and wakes one waiting request."""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
+
+    def reject(self, reason: str) -> None:
+        registry.inc("earning_admission_rejected_total", lane=self.name, reason=reason)
+        raise TooManyRequestsException(
+            f"The {self.name} request lane is busy, retry later",
+            retry_after=config.ADMISSION_RETRY_AFTER_SECONDS,
+        )
+
+
+lanes = {
+    LIGHT_LANE: Lane(
+        LIGHT_LANE,
+        config.LIGHT_LANE_CONCURRENCY,
+        config.ADMISSION_QUEUE_SIZE,
+        config.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+    HEAVY_LANE: Lane(
+        HEAVY_LANE,
+        config.HEAVY_LANE_CONCURRENCY,
+        config.ADMISSION_QUEUE_SIZE,
+        config.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ),
+}
+
+
+class BodyLimitStream(io.RawIOBase):
+    """
+    Read-only stream of a request body of unknown length that stops at `max_bytes`.
+
+    Attributes:
+        max_bytes (int): Largest body allowed.
+    """
+
+    def __init__(self, source, max_bytes: int) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        self._source = source
+        self._size = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Raises:
+            PayloadTooLargeException: If the body is larger than `max_bytes`.
+        """
+        chunk = self._source.read(len(buffer))
+        self._size += len(chunk)
+        if self._size > self.max_bytes:
+            raise PayloadTooLargeException(
+                f"Request body exceeds {self.max_bytes} bytes"
+            )
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def limit_body(environ, max_bytes: int) -> None:
+    """Replaces the request body with a stream that raises a 413 once more than `max_bytes` are read."""
+    environ["wsgi.input"] = io.BufferedReader(
+        BodyLimitStream(get_input_stream(environ), max_bytes)
+    )
+    environ["wsgi.input_terminated"] = True
+
+
+def lane_name(content_length: int | None, content_encoding: str = "") -> str:
+    """
+    The lane of a request: heavy for large, compressed and unknown length bodies, light otherwise.
+
+    Parameters:
+        content_length (int | None): Length of the body as sent.
+        content_encoding (str): Content-Encoding of the body, empty if it is not compressed.
+    """
+    if content_encoding.strip().lower() not in ("", "identity"):
+        return HEAVY_LANE
+    if content_length is None or content_length > config.HEAVY_REQUEST_BODY_BYTES:
+        return HEAVY_LANE
+    return LIGHT_LANE
+
+
+def admission_controlled(method):
+    """
+    Resource method decorator: runs the method only once its request is admitted.
+
+    Raises:
+        PayloadTooLargeException: If the body is larger than `MAX_REQUEST_BODY_BYTES`.
+        TooManyRequestsException: If the request's lane and its queue are full.
+    """
+
+    @wraps(method)
+    def admitted(*args, **kwargs):
+        content_length = request.content_length
+        name = lane_name(content_length, request.headers.get("Content-Encoding", ""))
+        if config.MAX_REQUEST_BODY_BYTES:
+            if content_length is None:
+                limit_body(request.environ, config.MAX_REQUEST_BODY_BYTES)
+            elif content_length > config.MAX_REQUEST_BODY_BYTES:
+                registry.inc(
+                    "earning_admission_rejected_total", lane=name, reason="too_large"
+                )
+                raise PayloadTooLargeException(
+                    f"Request body exceeds {config.MAX_REQUEST_BODY_BYTES} bytes"
+                )
+        lane = lanes[name]
+        with stage("queue"):
+            lane.acquire()
+        try:
+            return method(*args, **kwargs)
+        except PayloadTooLargeException:
+            registry.inc(
+                "earning_admission_rejected_total", lane=name, reason="too_large"
+            )
+            raise
+        finally:
+            lane.release()
+
+    return admitted
+
+
+def check_attempts(attempts: int) -> None:
+    """
+    Bounds the number of attempts in one request.
+
+    Raises:
+        PayloadTooLargeException: If there are more than `MAX_ACTIVITY_LOG_ATTEMPTS` attempts.
+    """
+    if config.MAX_ACTIVITY_LOG_ATTEMPTS and attempts > config.MAX_ACTIVITY_LOG_ATTEMPTS:
+        raise PayloadTooLargeException(
+            f"Activity logs exceed {config.MAX_ACTIVITY_LOG_ATTEMPTS} attempts"
+        )
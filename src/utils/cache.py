@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class StatementCache:
+    """
+    Thread-safe in-process cache with LRU eviction and a time-to-live.
+
+    Attributes:
+        max_size (int): Maximum number of entries; 0 disables the cache.
+        ttl_seconds (float): Seconds an entry stays valid after it was stored.
+        hits (int): Number of lookups that found a live entry.
+        misses (int): Number of lookups that found nothing or an expired entry.
+        evictions (int): Number of entries dropped to stay within `max_size`.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock=time.monotonic) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the cached value for `key`, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        """Stores `value` under `key`, evicting the least recently used entries if the cache is full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def reset(self) -> None:
+        """Drops every entry and zeroes the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+        }
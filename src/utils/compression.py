@@ -0,0 +1,142 @@
+"""
+Compressed request and response bodies.
+
+Requests sent with `Content-Encoding: gzip` (or `zstd` when the zstandard package is installed) are
+decompressed as a stream while the endpoint reads the body, so a compressed activity log is never held in
+memory twice. Decompression stops with a 413 once it produces more than `MAX_DECOMPRESSED_BODY_BYTES`, or
+`MAX_REQUEST_BODY_BYTES` if that is lower, so a small compressed body cannot expand into a huge one.
+
+Responses of at least `RESPONSE_COMPRESSION_MIN_BYTES` are compressed with the best encoding the client
+accepts in `Accept-Encoding`.
+"""
+
+import gzip
+import io
+import zlib
+from flask import request
+from werkzeug.wsgi import get_input_stream
+from src import config
+from src.utils.exceptions import (
+    BadRequestException,
+    PayloadTooLargeException,
+    UnsupportedMediaTypeException,
+)
+from src.utils.timing import stage
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+# Errors raised while reading a corrupt or truncated body.
+DECOMPRESSION_ERRORS = (OSError, EOFError, zlib.error) + (
+    (zstandard.ZstdError,) if zstandard is not None else ()
+)
+
+
+def supported_encodings() -> list[str]:
+    """Content encodings this server can read and write, preferred first."""
+    return ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+
+
+class DecompressingStream(io.RawIOBase):
+    """
+    Read-only stream of the decompressed request body.
+
+    Attributes:
+        encoding (str): Content encoding of the compressed body.
+        max_bytes (int): Largest decompressed size allowed.
+    """
+
+    def __init__(self, compressed, encoding: str, max_bytes: int) -> None:
+        super().__init__()
+        self.encoding = encoding
+        self.max_bytes = max_bytes
+        self._size = 0
+        if encoding == "zstd":
+            # A body may hold several frames, e.g. when a client compresses a stream chunk by chunk.
+            self._source = zstandard.ZstdDecompressor().stream_reader(
+                compressed, read_across_frames=True
+            )
+        else:
+            self._source = gzip.GzipFile(fileobj=compressed, mode="rb")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        """
+        Raises:
+            PayloadTooLargeException: If the body decompresses to more than `max_bytes`.
+            BadRequestException: If the body is not valid for its encoding.
+        """
+        try:
+            chunk = self._source.read(len(buffer))
+        except DECOMPRESSION_ERRORS as e:
+            raise BadRequestException(f"Invalid {self.encoding} request body: {e}")
+        self._size += len(chunk)
+        if self._size > self.max_bytes:
+            raise PayloadTooLargeException(
+                f"Request body exceeds {self.max_bytes} bytes once decompressed"
+            )
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def max_decompressed_bytes() -> int:
+    """Largest size a request body may decompress to: no more than an uncompressed body may be."""
+    if config.MAX_REQUEST_BODY_BYTES:
+        return min(config.MAX_DECOMPRESSED_BODY_BYTES, config.MAX_REQUEST_BODY_BYTES)
+    return config.MAX_DECOMPRESSED_BODY_BYTES
+
+
+def decompress_request() -> None:
+    """
+    Flask before_request hook: replaces a compressed request body with a decompressing stream.
+
+    Raises:
+        UnsupportedMediaTypeException: If the body uses an encoding this server cannot read.
+    """
+    encoding = request.headers.get("Content-Encoding", "").strip().lower()
+    if not encoding or encoding == "identity":
+        return
+    if encoding not in supported_encodings():
+        raise UnsupportedMediaTypeException(
+            f"Unsupported Content-Encoding '{encoding}', expected one of: "
+            + ", ".join(supported_encodings())
+        )
+    environ = request.environ
+    compressed = get_input_stream(environ)
+    environ["wsgi.input"] = io.BufferedReader(
+        DecompressingStream(compressed, encoding, max_decompressed_bytes())
+    )
+    # The decompressed length is unknown; let the body be read until the stream ends.
+    environ["wsgi.input_terminated"] = True
+
+
+def compress_response(response):
+    """Flask after_request hook: compresses the response body if the client accepts it."""
+    if (
+        not config.RESPONSE_COMPRESSION_ENABLED
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(supported_encodings())
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < config.RESPONSE_COMPRESSION_MIN_BYTES:
+        return response
+    with stage("compress"):
+        if encoding == "zstd":
+            data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        else:
+            data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    return response
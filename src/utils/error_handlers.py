@@ -23,6 +23,9 @@ def handle_exception(error: APIException):
     """
     response = jsonify(error.to_dict())
     response.status_code = error.status_code
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        response.headers["Retry-After"] = str(retry_after)
     return response
 
 
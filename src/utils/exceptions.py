@@ -1,6 +1,13 @@
 class ValidationError(Exception):
-    """Custom exception for validation errors."""
-    pass
+    """
+    Custom exception for validation errors.
+
+    `messages` follows marshmallow's layout, e.g. {0: {'route_id': ['Not a valid string.']}}.
+    """
+
+    def __init__(self, messages):
+        super().__init__(messages)
+        self.messages = messages
 
 class APIException(Exception):
     """
@@ -31,15 +38,31 @@ class InvalidPayloadException(APIException):
         super().__init__(message=message, status_code=400, payload=payload, name=name)
 
 
+def flatten_error_messages(messages, path=()):
+    """
+    Flattens nested marshmallow-style error messages ({0: {'route_id': ['...']}}) into field/message pairs.
+    """
+    if isinstance(messages, dict):
+        for key, value in messages.items():
+            yield from flatten_error_messages(value, path + (str(key),))
+    elif isinstance(messages, (list, tuple)):
+        for value in messages:
+            yield from flatten_error_messages(value, path)
+    else:
+        yield {'field': '.'.join(path) if path else '_schema', 'message': str(messages)}
+
+
 class ValidationException(InvalidPayloadException):
     """
     400 Invalid Payload Exception with Validation Errors
     """
 
-    def __init__(self, e: ValidationError, message: str = 'Validation Error'):
-        payload = dict({'message': 'validation errors',
-                   'errors': [{'field': error['loc'][0], 'message': error['msg']}
-                              for error in e.errors()]})
+    def __init__(self, e, message: str = 'Validation Error'):
+        if hasattr(e, 'errors'):
+            errors = [{'field': error['loc'][0], 'message': error['msg']} for error in e.errors()]
+        else:
+            errors = list(flatten_error_messages(getattr(e, 'messages', str(e))))
+        payload = dict({'message': 'validation errors', 'errors': errors})
         super().__init__(message=message, payload=payload)
 
 
@@ -71,6 +94,35 @@ class NotFoundException(APIException):
         super().__init__(message=message, status_code=404, payload=payload, name=name)
 
 
+class PayloadTooLargeException(APIException):
+    """
+    413 Payload Too Large Exception
+    """
+
+    def __init__(self, message: str = 'Payload Too Large', payload=None, name='Payload Too Large'):
+        super().__init__(message=message, status_code=413, payload=payload, name=name)
+
+
+class UnsupportedMediaTypeException(APIException):
+    """
+    415 Unsupported Media Type Exception
+    """
+
+    def __init__(self, message: str = 'Unsupported Media Type', payload=None, name='Unsupported Media Type'):
+        super().__init__(message=message, status_code=415, payload=payload, name=name)
+
+
+class TooManyRequestsException(APIException):
+    """
+    429 Too Many Requests Exception
+    """
+
+    def __init__(self, message: str = 'Too Many Requests', payload=None, name='Too Many Requests',
+                 retry_after: int = 1):
+        super().__init__(message=message, status_code=429, payload=payload, name=name)
+        self.retry_after = retry_after
+
+
 class ServerErrorException(APIException):
     """
     500 Internal Server Error Exception
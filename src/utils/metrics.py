@@ -0,0 +1,319 @@
+"""
+Process-local metrics with Prometheus text exposition, aggregated across worker processes.
+
+Every process records into its own MetricsRegistry. When `METRICS_DIR` is set, each process writes a
+snapshot of its registry to `<METRICS_DIR>/metrics-<pid>.json` at most every
+`METRICS_FLUSH_INTERVAL_SECONDS`, and `/metrics` sums the snapshots of all processes. Besides flushing after
+requests, every worker runs a flusher thread that publishes values still unpublished at the end of an
+interval, so an idle worker's snapshot lags by at most one interval. Files of workers that have exited are
+kept, so counters never go backwards.
+"""
+
+import json
+import os
+import tempfile
+import time
+from glob import glob
+from threading import Event, Lock, Thread
+from flask import request
+from src import config
+from src.enums import TierRateCardId
+from src.utils.timing import current_timer, start_timer, stop_timer
+
+STAGE_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+BYTE_BUCKETS = tuple(2**exponent for exponent in range(10, 27, 2))
+ATTEMPT_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+# name -> (help, buckets)
+HISTOGRAMS = {
+    "earning_stage_seconds": (
+        "Time spent in each stage of a request, by endpoint, stage and rate card.",
+        STAGE_BUCKETS,
+    ),
+    "earning_request_bytes": ("Request body size in bytes, by endpoint.", BYTE_BUCKETS),
+    "earning_request_attempts": (
+        "Activity log attempts per request, by endpoint.",
+        ATTEMPT_BUCKETS,
+    ),
+}
+# name -> help
+COUNTERS = {
+    "http_requests_total": "Requests by endpoint and status code.",
+    "earning_admission_queued_total": "Requests that waited for a free slot, by lane.",
+    "earning_admission_rejected_total": "Requests turned away by admission control, by lane and reason.",
+}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe histograms and counters of one process.
+
+    Attributes:
+        directory (str): Directory shared by all worker processes, or empty for a single process.
+        flush_interval_seconds (float): Minimum time between snapshot writes.
+    """
+
+    def __init__(
+        self,
+        directory: str = "",
+        flush_interval_seconds: float = 1.0,
+        clock=time.monotonic,
+    ) -> None:
+        self.directory = directory
+        self.flush_interval_seconds = flush_interval_seconds
+        self._clock = clock
+        self._lock = Lock()
+        # Held while deciding whether to flush and writing the snapshot; flushes come from request
+        # threads, the flusher thread and /metrics.
+        self._flush_lock = Lock()
+        self._next_flush = 0.0
+        self._flusher = None
+        self._stop_flushing = Event()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drops every recorded value."""
+        self._histograms = {}
+        self._counters = {}
+        # Whether values were recorded since the last snapshot was written.
+        self._dirty = True
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Adds `value` to histogram `name`."""
+        buckets = HISTOGRAMS[name][1]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                # One count per bucket, one for +Inf, then the sum.
+                histogram = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    break
+            else:
+                index = len(buckets)
+            histogram[index] += 1
+            histogram[-1] += value
+            self._dirty = True
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        """Increments counter `name`."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+            self._dirty = True
+
+    def snapshot(self) -> dict:
+        """Returns the recorded values in a JSON-serializable form."""
+        with self._lock:
+            self._dirty = False
+            return {
+                "histograms": [
+                    [name, labels, list(values)]
+                    for (name, labels), values in self._histograms.items()
+                ],
+                "counters": [
+                    [name, labels, value]
+                    for (name, labels), value in self._counters.items()
+                ],
+            }
+
+    def flush(self, force: bool = False) -> None:
+        """Writes this process's snapshot to the shared directory if the flush interval has passed."""
+        if not self.directory:
+            return
+        with self._flush_lock:
+            now = self._clock()
+            if not force and now < self._next_flush:
+                return
+            self._next_flush = now + self.flush_interval_seconds
+            path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+            descriptor, temporary = tempfile.mkstemp(
+                dir=self.directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+            )
+            try:
+                with open(descriptor, "w", encoding="utf-8") as snapshot:
+                    json.dump(self.snapshot(), snapshot)
+                os.replace(temporary, path)
+            except BaseException:
+                os.remove(temporary)
+                raise
+
+    def start_flushing(self) -> None:
+        """
+        Starts a daemon thread that writes this process's snapshot at the end of every flush interval in
+        which values were recorded. Threads do not survive fork, so every worker starts its own.
+        """
+        if not self.directory or (self._flusher and self._flusher.is_alive()):
+            return
+        self._stop_flushing.clear()
+        self._flusher = Thread(
+            target=self._flush_periodically, name="metrics-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def stop_flushing(self) -> None:
+        """Stops the flusher thread, if one is running."""
+        self._stop_flushing.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_flushing.wait(self.flush_interval_seconds):
+            if self._dirty:
+                self.flush(force=True)
+
+    def collect(self) -> list[dict]:
+        """Returns the snapshots of every process, this one up to date."""
+        if not self.directory:
+            return [self.snapshot()]
+        self.flush(force=True)
+        snapshots = []
+        for path in glob(os.path.join(self.directory, "metrics-*.json")):
+            try:
+                with open(path, encoding="utf-8") as snapshot:
+                    snapshots.append(json.load(snapshot))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def clear_directory(self) -> None:
+        """Removes snapshots left behind by a previous server run."""
+        if self.directory:
+            for path in glob(os.path.join(self.directory, "metrics-*.json*")):
+                os.remove(path)
+
+    def render(self) -> str:
+        """Renders the metrics of every process in the Prometheus text format."""
+        histograms, counters = {}, {}
+        for snapshot in self.collect():
+            for name, labels, values in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [0] * len(values))
+                for index, value in enumerate(values):
+                    merged[index] += value
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+
+        lines = []
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, labels), values in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip((*buckets, "+Inf"), values):
+                    cumulative += count
+                    lines.append(
+                        f"{name}_bucket{format_labels(labels, le=bound)} {cumulative}"
+                    )
+                lines.append(f"{name}_sum{format_labels(labels)} {values[-1]}")
+                lines.append(f"{name}_count{format_labels(labels)} {cumulative}")
+        for name, help_text in COUNTERS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels, **extra) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{key}="{escape_label_value(str(value))}"' for key, value in pairs)
+        + "}"
+    )
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry(
+    directory=config.METRICS_DIR,
+    flush_interval_seconds=config.METRICS_FLUSH_INTERVAL_SECONDS,
+)
+# A forked worker starts with an empty registry instead of the master's values.
+os.register_at_fork(after_in_child=registry.reset)
+
+
+def rate_card_label() -> str:
+    """The request's rate card id if it is a known one, so unknown ids cannot add label values."""
+    rate_card_id = (request.view_args or {}).get("rate_card_id")
+    if TierRateCardId.get_enum_by_value(rate_card_id) is None:
+        return ""
+    return rate_card_id
+
+
+def start_request() -> None:
+    """Flask before_request hook: starts timing the request."""
+    if config.METRICS_ENABLED:
+        start_timer()
+
+
+def finish_request(response):
+    """
+    Flask after_request hook: records the request's stage timings, size and status, and adds the
+    Server-Timing header.
+    """
+    timer = current_timer()
+    if timer is None:
+        return response
+    stop_timer()
+    total = timer.elapsed()
+    if config.SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = timer.server_timing(total)
+    endpoint = request.endpoint or "unknown"
+    rate_card_id = rate_card_label()
+    for name, nanoseconds in (*timer.stages.items(), ("total", total)):
+        registry.observe(
+            "earning_stage_seconds",
+            nanoseconds / 1e9,
+            endpoint=endpoint,
+            stage=name,
+            rate_card_id=rate_card_id,
+        )
+    if request.content_length is not None:
+        registry.observe(
+            "earning_request_bytes", request.content_length, endpoint=endpoint
+        )
+    registry.inc(
+        "http_requests_total", endpoint=endpoint, status=str(response.status_code)
+    )
+    registry.flush()
+    return response
+
+
+def end_request(exception=None) -> None:
+    """Flask teardown_request hook: makes sure no timer outlives its request."""
+    stop_timer()
+
+
+def observe_attempts(attempts: int) -> None:
+    """Records the number of activity log attempts in the current request."""
+    if config.METRICS_ENABLED:
+        registry.observe(
+            "earning_request_attempts", attempts, endpoint=request.endpoint or "unknown"
+        )
@@ -0,0 +1,93 @@
+"""
+Opt-in profiling of single requests.
+
+With `PROFILING_ENABLED` set, a request sent with the `X-Profile: 1` header runs under cProfile. The
+profile is saved as `<PROFILE_DIR>/<request id>.prof`, readable with `python -m pstats` or snakeviz, and
+the functions with the highest cumulative time are logged. The request id is taken from `X-Request-ID`
+when it is a safe file name, and generated otherwise; it is returned in `X-Request-ID` either way.
+
+The hooks are only registered when `PROFILING_ENABLED` is set, so without it requests pay nothing.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import uuid
+from flask import g, request
+from src import config
+
+PROFILE_HEADER = "X-Profile"
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9_.-]{1,64}")
+SUMMARY_FUNCTIONS = 15
+
+logger = logging.getLogger(__name__)
+# Summaries are requested explicitly, so they are logged below the service's default ERROR level.
+logger.setLevel(logging.INFO)
+
+
+def request_id() -> str:
+    """The client's request id if it is safe to use as a file name, otherwise a new one."""
+    requested = request.headers.get(REQUEST_ID_HEADER, "")
+    if REQUEST_ID_PATTERN.fullmatch(requested) and requested.strip("."):
+        return requested
+    return uuid.uuid4().hex
+
+
+def start_profile() -> None:
+    """Flask before_request hook: profiles the request if it asks to be profiled."""
+    if request.headers.get(PROFILE_HEADER, "").lower() not in ("1", "true"):
+        return
+    g.profile_request_id = request_id()
+    g.profiler = cProfile.Profile()
+    g.profiler.enable()
+
+
+def finish_profile(response):
+    """Flask after_request hook: saves and summarizes the profile of a profiled request."""
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+    profiler.disable()
+    profile_request_id = g.pop("profile_request_id")
+    path = save_profile(profiler, profile_request_id)
+    logger.info(
+        "Profiled %s %s (%s) into %s\n%s",
+        request.method,
+        request.path,
+        profile_request_id,
+        path,
+        summarize(profiler),
+    )
+    response.headers[REQUEST_ID_HEADER] = profile_request_id
+    return response
+
+
+def end_profile(exception=None) -> None:
+    """Flask teardown_request hook: stops a profiler left running by a failed request."""
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+
+
+def save_profile(profiler: cProfile.Profile, profile_request_id: str) -> str:
+    """
+    Writes the profile to `PROFILE_DIR`.
+
+    Returns:
+        str: Path of the profile file.
+    """
+    os.makedirs(config.PROFILE_DIR, exist_ok=True)
+    path = os.path.join(config.PROFILE_DIR, f"{profile_request_id}.prof")
+    profiler.dump_stats(path)
+    return path
+
+
+def summarize(profiler: cProfile.Profile, limit: int = SUMMARY_FUNCTIONS) -> str:
+    """Formats the `limit` functions with the highest cumulative time."""
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(limit)
+    return output.getvalue().strip()
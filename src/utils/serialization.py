@@ -0,0 +1,81 @@
+from json.encoder import encode_basestring_ascii
+from flask import Response
+from src import config
+from src.enums import JsonBackend
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """
+    Serializes response objects straight to JSON bytes.
+
+    Dataclasses such as EarningStatementResponse and LineItemResponse are written field by field in
+    declaration order without first being copied into a dict tree, producing the same document as
+    `to_dict` would, byte for byte what `json.dumps(..., separators=(",", ":"))` writes.
+
+    With `JSON_BACKEND` set to "auto" or "orjson", uses orjson when it is installed. orjson parses to the
+    same values but formats some floats differently, so it is opt-in.
+    """
+    if orjson is not None and use_orjson():
+        return orjson.dumps(obj)
+    parts = []
+    _encode(obj, parts.append)
+    return "".join(parts).encode("ascii")
+
+
+def json_response(obj, status: int = 200) -> Response:
+    """Builds an application/json response from `dumps(obj)`."""
+    return Response(dumps(obj), status=status, mimetype="application/json")
+
+
+def use_orjson() -> bool:
+    return JsonBackend.get_enum_by_value(config.JSON_BACKEND) in (
+        JsonBackend.AUTO,
+        JsonBackend.ORJSON,
+    )
+
+
+def _encode(obj, write) -> None:
+    if isinstance(obj, str):
+        write(encode_basestring_ascii(obj))
+    elif obj is None:
+        write("null")
+    elif obj is True:
+        write("true")
+    elif obj is False:
+        write("false")
+    elif isinstance(obj, int):
+        write(int.__repr__(obj))
+    elif isinstance(obj, float):
+        write(float.__repr__(obj))
+    elif hasattr(obj, "__dataclass_fields__"):
+        separator = "{"
+        for name in obj.__dataclass_fields__:
+            write(separator)
+            write(encode_basestring_ascii(name))
+            write(":")
+            _encode(getattr(obj, name), write)
+            separator = ","
+        write("}" if separator == "," else "{}")
+    elif isinstance(obj, dict):
+        separator = "{"
+        for key, value in obj.items():
+            write(separator)
+            write(encode_basestring_ascii(str(key)))
+            write(":")
+            _encode(value, write)
+            separator = ","
+        write("}" if separator == "," else "{}")
+    elif isinstance(obj, (list, tuple)):
+        separator = "["
+        for value in obj:
+            write(separator)
+            _encode(value, write)
+            separator = ","
+        write("]" if separator == "," else "[]")
+    else:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
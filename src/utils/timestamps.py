@@ -0,0 +1,29 @@
+from datetime import datetime, timedelta, timezone
+
+EPOCH_DATETIME = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_microseconds(value: datetime) -> int:
+    """Converts a datetime into UTC epoch microseconds, treating naive values as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH_DATETIME) // MICROSECOND
+
+
+def from_epoch_microseconds(value: int) -> datetime:
+    """Converts UTC epoch microseconds into an aware UTC datetime."""
+    return EPOCH_DATETIME + value * MICROSECOND
+
+
+def parse_timestamp(value: str) -> int:
+    """
+    Parses an ISO-8601 timestamp straight into UTC epoch microseconds.
+
+    Accepts the same strings as marshmallow's `fields.DateTime`, which also relies on `datetime.fromisoformat`.
+
+    Raises:
+        ValueError: If the string is not a valid ISO-8601 timestamp.
+        TypeError: If the value is not a string.
+    """
+    return to_epoch_microseconds(datetime.fromisoformat(value))
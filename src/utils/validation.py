@@ -0,0 +1,228 @@
+import base64
+import binascii
+from array import array
+from datetime import datetime
+from src.model import ActivityColumns
+from src.utils.exceptions import ValidationError
+from src.utils.timestamps import parse_timestamp, to_epoch_microseconds
+
+# Error messages and accepted boolean spellings mirror marshmallow's, so the
+# payload of ValidationException is the same whichever validator is used.
+MISSING_MESSAGE = "Missing data for required field."
+NULL_MESSAGE = "Field may not be null."
+UNKNOWN_FIELD_MESSAGE = "Unknown field."
+INVALID_INPUT_MESSAGE = "Invalid input type."
+INVALID_STRING_MESSAGE = "Not a valid string."
+INVALID_UTF8_MESSAGE = "Not a valid utf-8 string."
+INVALID_DATETIME_MESSAGE = "Not a valid datetime."
+INVALID_BOOLEAN_MESSAGE = "Not a valid boolean."
+
+TRUTHY = {"t", "T", "true", "True", "TRUE", "on", "On", "ON", "y", "Y", "yes", "Yes", "YES", "1", 1}
+FALSY = {"f", "F", "false", "False", "FALSE", "off", "Off", "OFF", "n", "N", "no", "No", "NO", "0", 0}
+
+ACTIVITY_LOG_FIELDS = ("route_id", "attempt_date_time", "success")
+COLUMNAR_FIELDS = ("route_ids", "route_codes", "timestamps", "success")
+# Byte value -> its eight bits as one byte each, least significant bit first.
+_BITS = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+
+def load_activity_columns(data) -> ActivityColumns:
+    """
+    Validates a list of activity logs straight into ActivityColumns.
+
+    This replaces `ActivityLogSchema(many=True).load` on the hot path: well-formed records are checked
+    with a handful of type tests, and only records that fail them go through the detailed checks that
+    build marshmallow-compatible error messages.
+
+    Raises:
+        ValidationError: With messages keyed by record index, after every record has been checked.
+    """
+    if not isinstance(data, (list, tuple)):
+        raise ValidationError({"_schema": [INVALID_INPUT_MESSAGE]})
+    columns = ActivityColumns()
+    route_codes, intern, timestamps, successes = (
+        columns.route_codes.append,
+        columns.intern,
+        columns.timestamps.append,
+        columns.successes.append,
+    )
+    errors = {}
+    for index, record in enumerate(data):
+        try:
+            route_id, timestamp, success = validate_activity_log(record)
+        except ValidationError as e:
+            errors[index] = e.messages
+            continue
+        route_codes(intern(route_id))
+        timestamps(timestamp)
+        successes(success)
+    if errors:
+        raise ValidationError(errors)
+    return columns
+
+
+def load_columnar_activity_logs(data) -> ActivityColumns:
+    """
+    Validates activity logs in the columnar layout straight into ActivityColumns.
+
+    The layout sends every column once instead of one object per attempt::
+
+        {
+            "route_ids": ["RT1", "RT2"],
+            "route_codes": [0, 0, 1],
+            "timestamps": [1702888398588934, 1702888631897203, 1702888750938613],
+            "success": "Bg=="
+        }
+
+    `route_ids` lists each distinct route once and `route_codes` holds an index into it per attempt; they
+    become the columns' route dictionary as they are.
+    `timestamps` are UTC epoch microseconds. `success` is a bitmap with one bit per attempt, least
+    significant bit first, given as base64 or, in MessagePack, as raw bytes.
+
+    Raises:
+        ValidationError: With messages keyed by field name.
+    """
+    if not isinstance(data, dict):
+        raise ValidationError({"_schema": [INVALID_INPUT_MESSAGE]})
+    errors = {name: [MISSING_MESSAGE] for name in COLUMNAR_FIELDS if name not in data}
+    errors.update(
+        {name: [UNKNOWN_FIELD_MESSAGE] for name in data if name not in COLUMNAR_FIELDS}
+    )
+    if errors:
+        raise ValidationError(errors)
+
+    route_dictionary = data["route_ids"]
+    if not isinstance(route_dictionary, list) or not all(
+        type(route_id) is str for route_id in route_dictionary
+    ):
+        errors["route_ids"] = ["Not a list of strings."]
+    elif len(set(route_dictionary)) != len(route_dictionary):
+        errors["route_ids"] = ["Route ids must be unique."]
+    route_codes, timestamps = (
+        _int64_column(data["route_codes"]),
+        _int64_column(data["timestamps"]),
+    )
+    for name, column in (("route_codes", route_codes), ("timestamps", timestamps)):
+        if column is None:
+            errors[name] = ["Not a list of 64-bit integers."]
+    bitmap = data["success"]
+    if isinstance(bitmap, str):
+        try:
+            bitmap = base64.b64decode(bitmap, validate=True)
+        except binascii.Error:
+            bitmap = None
+    if not isinstance(bitmap, bytes):
+        errors["success"] = ["Not a base64 bitmap."]
+    if errors:
+        raise ValidationError(errors)
+
+    count = len(route_codes)
+    if len(timestamps) != count:
+        errors["timestamps"] = [f"Expected {count} timestamps."]
+    if len(bitmap) != (count + 7) // 8:
+        errors["success"] = [f"Expected {(count + 7) // 8} bytes for {count} attempts."]
+    if count and not 0 <= min(route_codes) <= max(route_codes) < len(route_dictionary):
+        errors["route_codes"] = ["Route code out of range."]
+    if errors:
+        raise ValidationError(errors)
+
+    successes = array("b")
+    successes.frombytes(b"".join(map(_BITS.__getitem__, bitmap))[:count])
+    return ActivityColumns.from_codes(
+        route_dictionary, array("i", route_codes), timestamps, successes
+    )
+
+
+def validate_activity_log(record) -> tuple[str, int, bool]:
+    """
+    Validates a single activity log.
+
+    Returns:
+        tuple[str, int, bool]: The route id, attempt time in UTC epoch microseconds and success flag.
+
+    Raises:
+        ValidationError: With marshmallow-style messages keyed by field name.
+    """
+    if type(record) is dict and len(record) == 3:
+        route_id = record.get("route_id")
+        attempt_date_time = record.get("attempt_date_time")
+        success = record.get("success")
+        if (
+            type(route_id) is str
+            and type(attempt_date_time) is str
+            and type(success) is bool
+        ):
+            try:
+                return route_id, parse_timestamp(attempt_date_time), success
+            except ValueError:
+                pass
+    return _validate_activity_log_fields(record)
+
+
+def _validate_activity_log_fields(record) -> tuple[str, int, bool]:
+    """Checks every field of a record that failed the fast path and collects all error messages."""
+    if not isinstance(record, dict):
+        raise ValidationError({"_schema": [INVALID_INPUT_MESSAGE]})
+    errors = {}
+    values = []
+    for name, deserialize in (
+        ("route_id", _deserialize_string),
+        ("attempt_date_time", _deserialize_datetime),
+        ("success", _deserialize_boolean),
+    ):
+        if name not in record:
+            errors[name] = [MISSING_MESSAGE]
+        elif record[name] is None:
+            errors[name] = [NULL_MESSAGE]
+        else:
+            try:
+                values.append(deserialize(record[name]))
+            except ValueError as e:
+                errors[name] = [str(e)]
+    for name in record:
+        if name not in ACTIVITY_LOG_FIELDS:
+            errors[name] = [UNKNOWN_FIELD_MESSAGE]
+    if errors:
+        raise ValidationError(errors)
+    return tuple(values)
+
+
+def _int64_column(values) -> array | None:
+    """Copies a list of integers into a signed 64-bit array, or returns None if it is not one."""
+    if not isinstance(values, list):
+        return None
+    try:
+        return array("q", values)
+    except (TypeError, OverflowError):
+        return None
+
+
+def _deserialize_string(value) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            raise ValueError(INVALID_UTF8_MESSAGE)
+    raise ValueError(INVALID_STRING_MESSAGE)
+
+
+def _deserialize_datetime(value) -> int:
+    if isinstance(value, datetime):
+        return to_epoch_microseconds(value)
+    try:
+        return parse_timestamp(value)
+    except (TypeError, ValueError):
+        raise ValueError(INVALID_DATETIME_MESSAGE)
+
+
+def _deserialize_boolean(value) -> bool:
+    try:
+        if value in TRUTHY:
+            return True
+        if value in FALSY:
+            return False
+    except TypeError:
+        pass
+    raise ValueError(INVALID_BOOLEAN_MESSAGE)
@@ -0,0 +1,73 @@
+"""
+Loads lazily imported modules and exercises the request path before real traffic arrives.
+
+numpy, pandas and marshmallow are only imported where they are used, which keeps importing the app
+fast. `warm_up` pays for them up front instead: run in the gunicorn master after the app is preloaded,
+every forked worker inherits the loaded modules copy-on-write. `warm_up_in_background` loads them in a
+worker thread once the worker is already accepting requests.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+from flask import Flask
+from src.enums import TierRateCardId
+from src.business_logic.aggregate import ActivityAggregate, activity_frame
+from src.resource.earning import statement_cache
+from src.resource.payload import load_activity_logs
+from src.utils.metrics import registry
+
+WARM_UP_START = datetime(2023, 12, 18, 8, tzinfo=timezone.utc)
+WARM_UP_ACTIVITY_LOGS = [
+    {
+        "route_id": f"RT{attempt % 3}",
+        "attempt_date_time": (WARM_UP_START + timedelta(minutes=attempt)).isoformat(),
+        "success": attempt % 7 != 0,
+    }
+    for attempt in range(40)
+]
+
+
+def load_lazy_modules() -> None:
+    """Imports the modules the request path loads on demand by aggregating once with each engine."""
+    columns = load_activity_logs(WARM_UP_ACTIVITY_LOGS)
+    ActivityAggregate.from_dataframe(activity_frame(columns))
+    ActivityAggregate.from_columns(columns)
+
+
+def warm_up(app: Flask) -> None:
+    """
+    Sends one statement request per rate card through the app and loads the lazily imported modules.
+
+    Parameters:
+        app (Flask): The application to warm up.
+
+    Raises:
+        RuntimeError: If a warm-up request does not succeed.
+    """
+    client = app.test_client()
+    for rate_card_id in TierRateCardId:
+        response = client.post(f"/earning/{rate_card_id}", json=WARM_UP_ACTIVITY_LOGS)
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"Warm-up request for {rate_card_id} failed with {response.status_code}"
+            )
+    load_lazy_modules()
+    # Warm-up requests are not traffic: forget their cache entries and metrics.
+    statement_cache.reset()
+    registry.reset()
+    registry.flush(force=True)
+
+
+def warm_up_in_background() -> threading.Thread:
+    """
+    Loads the lazily imported modules in a daemon thread.
+
+    Unlike `warm_up` this does not send requests, so it leaves the statement cache untouched while real
+    requests are being served.
+
+    Returns:
+        threading.Thread: The started thread.
+    """
+    thread = threading.Thread(target=load_lazy_modules, name="warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,56 @@
+import threading
+import pytest
+from werkzeug.serving import make_server
+from benchmark.loadtest import build_scenarios, percentile, run_scenario, summarise
+
+
+@pytest.fixture
+def server_url(app):
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    thread.join()
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([7.0], 0.95) == 7.0
+    assert percentile([], 0.5) is None
+
+
+def test_summarise_counts_errors():
+    samples = [(0.1, "200"), (0.2, "200"), (0.3, "500"), (0.4, "error")]
+    summary = summarise(samples, duration=2.0)
+    assert summary["throughput"] == 2.0
+    assert summary["error_rate"] == 0.5
+    assert summary["statuses"] == {"200": 2, "500": 1, "error": 1}
+    assert summary["latency_seconds"]["p50"] == 0.2
+
+
+def test_scenarios_mix_rate_cards_and_sizes():
+    scenarios = build_scenarios([10, 50], 5, 0.97, ["gold_tier", "bronze_tier"], 2, 1)
+    assert [scenario["name"] for scenario in scenarios] == [
+        "attempts=10",
+        "attempts=50",
+        "mixed",
+    ]
+    assert [path for path, _ in scenarios[0]["requests"]] == [
+        "/earning/gold_tier",
+        "/earning/bronze_tier",
+    ] * 2
+    assert len(scenarios[2]["requests"]) == 8
+
+
+def test_run_scenario(server_url):
+    (scenario,) = build_scenarios([20], 4, 0.97, ["gold_tier"], 2, 1)
+    summary = run_scenario(server_url, scenario["requests"], 0.5, concurrency=2)
+    assert summary["requests"] > 0
+    assert summary["statuses"] == {"200": summary["requests"]}
+
+    summary = run_scenario(server_url, [("/earning/unknown", b"[]")], 0.3, 1, rate=20)
+    assert 0 < summary["requests"] <= 6
+    assert summary["error_rate"] == 1.0
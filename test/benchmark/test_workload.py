@@ -0,0 +1,48 @@
+from src.enums import TierRateCardId
+from src.resource.payload import load_activity_logs
+from benchmark.frame import benchmark_frames
+from benchmark.run import benchmark_workload
+from benchmark.workload import generate_week
+
+
+def test_generator_is_seeded():
+    assert generate_week(3, 200, 12, 0.97) == generate_week(3, 200, 12, 0.97)
+    assert generate_week(3, 200, 12, 0.97) != generate_week(4, 200, 12, 0.97)
+
+
+def test_generator_shape():
+    logs = generate_week(1, 500, 40, 1.0)
+    assert len(logs) == 500
+    assert len({log["route_id"] for log in logs}) == 40
+    assert all(log["success"] for log in logs)
+    assert len(load_activity_logs(logs)) == 500
+    assert len({log["route_id"] for log in generate_week(1, 5, 40, 0.5)}) == 5
+
+
+def test_benchmark_workload_reports_every_stage():
+    results = benchmark_workload(1, 50, 5, 0.9, repeats=1)
+    assert [result["rate_card_id"] for result in results] == [
+        str(rate_card_id) for rate_card_id in TierRateCardId
+    ]
+    stages = results[0]["stages"]
+    assert {"json_parse", "schema_load", "dataframe", "evaluate", "serialize"} <= set(
+        stages
+    )
+    assert set(stages["rules"]) == {
+        "Per successful attempt",
+        "Per unsuccessful attempt",
+        "Long route bonus",
+        "Loyalty Bonus (routes)",
+    }
+
+
+def test_benchmark_frames_reports_both_frames():
+    result = benchmark_frames(1, 500, 20, repeats=1)
+    assert (result["attempts"], result["routes"]) == (500, 20)
+    for name in ("strings", "encoded"):
+        assert set(result[name]) == {
+            "memory_bytes",
+            "build_seconds",
+            "route_totals_seconds",
+        }
+    assert result["encoded"]["memory_bytes"] < result["strings"]["memory_bytes"]
@@ -0,0 +1,105 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+import pytest
+from src.model import ActivityColumns
+from src.business_logic.aggregate import (
+    OPTIONAL_FIELDS,
+    ActivityAggregate,
+    activity_frame,
+)
+from test.business_logic.test_earning_engine import generate_activity_logs
+
+ACTIVITY_LOGS = [
+    {
+        "route_id": "RT2",
+        "attempt_date_time": datetime(2023, 12, 18, 9, 0, tzinfo=timezone.utc),
+        "success": True,
+    },
+    {
+        "route_id": "RT1",
+        "attempt_date_time": datetime(2023, 12, 18, 8, 0, tzinfo=timezone.utc),
+        "success": True,
+    },
+    {
+        "route_id": "RT1",
+        "attempt_date_time": datetime(2023, 12, 18, 8, 30, tzinfo=timezone.utc),
+        "success": False,
+    },
+    {
+        "route_id": "RT2",
+        "attempt_date_time": datetime(2023, 12, 18, 10, 0, tzinfo=timezone.utc),
+        "success": True,
+    },
+]
+
+
+class TestActivityAggregate:
+    def test_from_dataframe(self):
+        columns = ActivityColumns.from_records(ACTIVITY_LOGS)
+        aggregate = ActivityAggregate.from_dataframe(activity_frame(columns))
+        assert aggregate == ActivityAggregate.from_columns(columns)
+        assert aggregate.successful_attempts == 3
+        assert aggregate.failed_attempts == 1
+        assert aggregate.unique_route_count == 2
+        assert aggregate.route_ids == ("RT1", "RT2")
+        assert aggregate.route_attempts == (2, 2)
+        assert aggregate.route_hours == (0.5, 1.0)
+        assert aggregate.hours_worked == 1.5
+        assert aggregate.success_rate == 0.75
+
+    @pytest.mark.parametrize(
+        "fields",
+        [frozenset(), frozenset({"route_ids"}), frozenset({"route_attempts"})],
+    )
+    def test_builders_skip_fields_not_asked_for(self, fields):
+        columns = generate_activity_logs(seed=2, attempts=500)
+        full = ActivityAggregate.from_columns(columns)
+        expected = replace(full, **{field: () for field in OPTIONAL_FIELDS - fields})
+        assert ActivityAggregate.from_columns(columns, fields) == expected
+        assert (
+            ActivityAggregate.from_dataframe(activity_frame(columns), fields)
+            == expected
+        )
+        assert ActivityAggregate.from_columns(columns, fields).hours_worked == (
+            full.hours_worked
+        )
+
+    def test_empty(self):
+        aggregate = ActivityAggregate.from_dataframe(activity_frame(ActivityColumns()))
+        assert aggregate.total_attempts == 0
+        assert aggregate.hours_worked == 0.0
+        assert aggregate.success_rate == 0.0
+
+    def test_frame_uses_compact_dtypes(self):
+        columns = ActivityColumns.from_records(ACTIVITY_LOGS)
+        activity_df = activity_frame(columns)
+        assert str(activity_df["route_id"].dtype) == "category"
+        assert list(activity_df["route_id"].cat.categories) == ["RT1", "RT2"]
+        assert activity_df["route_id"].tolist() == ["RT2", "RT1", "RT1", "RT2"]
+        assert str(activity_df["timestamp"].dtype) == "int64"
+        assert str(activity_df["success"].dtype) == "bool"
+
+
+class TestActivityColumns:
+    def test_route_ids_are_dictionary_encoded(self):
+        columns = ActivityColumns.from_records(ACTIVITY_LOGS)
+        assert columns.route_dictionary == ["RT2", "RT1"]
+        assert list(columns.route_codes) == [0, 1, 1, 0]
+        assert columns.route_ids == ["RT2", "RT1", "RT1", "RT2"]
+
+    def test_extend_re_encodes_route_codes(self):
+        columns = ActivityColumns.from_records(ACTIVITY_LOGS)
+        other = ActivityColumns.from_records(ACTIVITY_LOGS[1:] + ACTIVITY_LOGS[:1])
+        columns.extend(other)
+        assert columns.route_dictionary == ["RT2", "RT1"]
+        assert columns.route_ids == [
+            "RT2",
+            "RT1",
+            "RT1",
+            "RT2",
+            "RT1",
+            "RT1",
+            "RT2",
+            "RT2",
+        ]
+        assert list(columns.timestamps[4:]) == list(other.timestamps)
@@ -0,0 +1,46 @@
+import pytest
+from src.enums import TierRateCardId
+from src.business_logic.aggregate import ActivityAggregate
+from src.business_logic.archive import ActivityArchive, ArchiveWriter
+from src.business_logic.earning import Earning
+from test.business_logic.test_earning_engine import generate_activity_logs
+
+# Attempt counts that are not multiples of 8 exercise success bitmap offsets.
+ATTEMPTS = [13, 0, 200, 7, 64, 91]
+
+
+@pytest.fixture
+def couriers():
+    return [
+        (
+            f"courier-{i}",
+            list(TierRateCardId)[i % 4],
+            generate_activity_logs(seed=i, attempts=attempts),
+        )
+        for i, attempts in enumerate(ATTEMPTS)
+    ]
+
+
+def test_archive_round_trip(tmp_path, couriers):
+    path = str(tmp_path / "fleet.rla")
+    with ArchiveWriter(path) as writer:
+        for courier_id, rate_card_id, columns in couriers:
+            writer.add(courier_id, str(rate_card_id), columns)
+
+    with ActivityArchive(path) as archive:
+        assert len(archive) == len(couriers)
+        assert archive.attempts == sum(ATTEMPTS)
+        for index, (courier_id, rate_card_id, columns) in enumerate(couriers):
+            assert archive.courier_ids[index] == courier_id
+            assert archive.rate_card_ids[index] == str(rate_card_id)
+            aggregate = archive.aggregate(index)
+            assert aggregate == ActivityAggregate.from_columns(columns)
+            earning = Earning(rate_card_id, columns)
+            assert earning.evaluate(aggregate) == earning.generate_statement()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not-an-archive"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        ActivityArchive(str(path))
@@ -0,0 +1,44 @@
+import random
+from datetime import datetime, timedelta, timezone
+import pytest
+from src import config
+from src.enums import TierRateCardId, EarningEngine
+from src.model import ActivityColumns
+from src.business_logic.earning import Earning
+
+
+def generate_activity_logs(seed, attempts=500, routes=15):
+    rng = random.Random(seed)
+    start = datetime(2023, 12, 18, tzinfo=timezone.utc)
+    return ActivityColumns.from_records(
+        {
+            "route_id": f"RT{rng.randrange(routes)}",
+            "attempt_date_time": (
+                start + timedelta(microseconds=rng.randrange(7 * 24 * 3600 * 10**6))
+            ).astimezone(timezone(timedelta(hours=rng.choice([-5, 0, 2])))),
+            "success": rng.random() < 0.97,
+        }
+        for _ in range(attempts)
+    )
+
+
+@pytest.mark.parametrize("rate_card_id", list(TierRateCardId))
+@pytest.mark.parametrize("seed", range(5))
+def test_engines_produce_identical_statements(monkeypatch, rate_card_id, seed):
+    activity_logs = generate_activity_logs(seed)
+    statements = []
+    for engine in (EarningEngine.PANDAS, EarningEngine.PYTHON):
+        monkeypatch.setattr(config, "EARNING_ENGINE", engine.value)
+        earning = Earning(rate_card_id=rate_card_id, activity_logs=activity_logs)
+        assert earning.get_engine() == engine
+        statements.append(earning.generate_statement())
+    assert statements[0] == statements[1]
+
+
+def test_auto_engine_picks_by_size(monkeypatch):
+    monkeypatch.setattr(config, "EARNING_ENGINE", EarningEngine.AUTO.value)
+    monkeypatch.setattr(config, "PYTHON_ENGINE_MAX_ATTEMPTS", 100)
+    small = Earning(TierRateCardId.GOLD, generate_activity_logs(0, attempts=100))
+    large = Earning(TierRateCardId.GOLD, generate_activity_logs(0, attempts=101))
+    assert small.get_engine() == EarningEngine.PYTHON
+    assert large.get_engine() == EarningEngine.PANDAS
@@ -0,0 +1,63 @@
+from array import array
+from datetime import datetime, timezone
+import pytest
+from src.enums import TierRateCardId
+from src.model import ActivityColumns
+from src.business_logic.aggregate import ActivityAggregate
+from src.business_logic.earning import Earning
+from src.business_logic.ledger import Ledger, week_bounds
+from test.business_logic.test_earning_engine import generate_activity_logs
+
+
+def split(columns, start, stop):
+    return ActivityColumns(
+        columns.route_ids[start:stop],
+        array("q", columns.timestamps[start:stop]),
+        array("b", columns.successes[start:stop]),
+    )
+
+
+class TestLedger:
+    def test_incremental_appends_match_full_log(self, tmp_path):
+        ledger = Ledger(str(tmp_path / "ledger.sqlite3"))
+        columns = generate_activity_logs(seed=3, attempts=300)
+        for start in range(0, 300, 70):
+            batch = ActivityAggregate.from_columns(split(columns, start, start + 70))
+            totals = ledger.append("courier", "2023-W51", batch)
+
+        expected = ActivityAggregate.from_columns(columns)
+        assert ledger.aggregate("courier", "2023-W51") == expected
+        assert totals["attempts"] == 300
+        assert totals["successes"] == expected.successful_attempts
+        assert totals["routes"] == expected.unique_route_count
+        for rate_card_id in TierRateCardId:
+            earning = Earning(rate_card_id, columns)
+            assert earning.evaluate(ledger.aggregate("courier", "2023-W51")) == earning.generate_statement()
+
+    def test_unknown_week(self, tmp_path):
+        ledger = Ledger(str(tmp_path / "ledger.sqlite3"))
+        assert ledger.aggregate("courier", "2023-W51") is None
+        assert ledger.totals("courier", "2023-W51") is None
+
+    def test_totals_count_each_route_once(self, tmp_path):
+        ledger = Ledger(str(tmp_path / "ledger.sqlite3"))
+        columns = generate_activity_logs(seed=5, attempts=100)
+        batch = ActivityAggregate.from_columns(columns)
+        ledger.append("courier", "2023-W51", batch)
+        totals = ledger.append("courier", "2023-W51", batch)
+        assert totals["attempts"] == 200
+        assert totals["successes"] == 2 * batch.successful_attempts
+        assert totals["routes"] == batch.unique_route_count
+        assert ledger.totals("courier", "2023-W52") is None
+
+
+def test_week_bounds():
+    start, end = week_bounds("2023-W51")
+    assert datetime.fromtimestamp(start / 1e6, timezone.utc) == datetime(
+        2023, 12, 18, tzinfo=timezone.utc
+    )
+    assert datetime.fromtimestamp(end / 1e6, timezone.utc) == datetime(
+        2023, 12, 25, tzinfo=timezone.utc
+    )
+    with pytest.raises(ValueError):
+        week_bounds("2023-W53")
@@ -0,0 +1,137 @@
+import json
+from datetime import date
+import pytest
+from src.constants import RATE_CARD
+from src.enums import Tier, TierRateCardId
+from src.business_logic.rate_cards import RateCardError, RateCardStore
+
+
+def rate_card_document(version, **rates):
+    """Builds a rate card file from the built-in rate cards, overriding per-successful-attempt rates."""
+    return {
+        "version": version,
+        "rate_cards": {
+            str(rate_card_id): {
+                "hourly_minimum_earnings": RATE_CARD[
+                    Tier[rate_card_id.name]
+                ].hourly_minimum_earnings,
+                "line_items": {
+                    str(line_item_type): line_item.rate
+                    for line_item_type, line_item in RATE_CARD[
+                        Tier[rate_card_id.name]
+                    ].line_items.items()
+                }
+                | (
+                    {"perSuccessfulAttempt": rates[str(rate_card_id)]}
+                    if str(rate_card_id) in rates
+                    else {}
+                ),
+            }
+            for rate_card_id in TierRateCardId
+        },
+    }
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def write(path, document):
+    path.write_text(json.dumps(document))
+
+
+class TestRateCardStore:
+    def test_builtin(self):
+        store = RateCardStore()
+        assert store.current().version == "builtin"
+        assert set(store.current().plans) == set(TierRateCardId)
+
+    def test_reload_swaps_version(self, tmp_path):
+        path, clock = tmp_path / "rate_cards.json", FakeClock()
+        write(path, rate_card_document("v1"))
+        store = RateCardStore(str(path), reload_interval_seconds=5, clock=clock)
+        v1 = store.current()
+        assert v1.version == "v1"
+
+        write(path, rate_card_document("v2", gold_tier=1.0))
+        assert store.current() is v1  # not checked before the interval passes
+        clock.now = 5
+        v2 = store.current()
+        assert v2.version == "v2"
+        assert v2.plans[TierRateCardId.GOLD].steps[0].rate == 1.0
+        assert v1.plans[TierRateCardId.GOLD].steps[0].rate == 0.511
+
+        write(path, rate_card_document("v1"))
+        clock.now = 10
+        assert store.current() is v1
+        assert store.versions == ["v2", "v1"]
+
+    def test_invalid_file_keeps_current_version(self, tmp_path):
+        path, clock = tmp_path / "rate_cards.json", FakeClock()
+        write(path, rate_card_document("v1"))
+        store = RateCardStore(str(path), reload_interval_seconds=0, clock=clock)
+        document = rate_card_document("v2")
+        document["rate_cards"]["gold_tier"]["line_items"]["tipBonus"] = 1.0
+        write(path, document)
+        assert store.check() is False
+        assert store.current().version == "v1"
+
+    @pytest.mark.parametrize(
+        "document, message",
+        [
+            ([], "must contain an object"),
+            ({"rate_cards": {}}, "'version'"),
+            (
+                {"version": "v1", "rate_cards": {"iron_tier": {}}},
+                "Unknown rate card ids: iron_tier",
+            ),
+            ({"version": "v1", "rate_cards": {}}, "Missing rate card 'bronze_tier'"),
+        ],
+    )
+    def test_invalid_file_is_rejected_at_startup(self, tmp_path, document, message):
+        path = tmp_path / "rate_cards.json"
+        write(path, document)
+        with pytest.raises(RateCardError, match=message):
+            RateCardStore(str(path))
+
+    def test_rate_must_be_a_number(self, tmp_path):
+        path = tmp_path / "rate_cards.json"
+        write(path, rate_card_document("v1", silver_tier="0.5"))
+        with pytest.raises(
+            RateCardError, match="'silver_tier.perSuccessfulAttempt' must be a number"
+        ):
+            RateCardStore(str(path))
+
+    def test_yaml_date_version(self, tmp_path):
+        yaml = pytest.importorskip("yaml")
+        path = tmp_path / "rate_cards.yaml"
+        path.write_text(yaml.safe_dump(rate_card_document(date(2024, 1, 15))))
+        assert "version: 2024-01-15\n" in path.read_text()
+        store = RateCardStore(str(path))
+        assert store.current().version == "2024-01-15"
+        assert store.versions == ["2024-01-15"]
+
+    @pytest.mark.parametrize(
+        "rate_cards, message",
+        [
+            ({1: {}}, "Keys of 'rate_cards' must be strings, got: 1"),
+            (
+                {date(2024, 1, 15): {}, "iron_tier": {}},
+                "Keys of 'rate_cards' must be strings, got: 2024-01-15",
+            ),
+        ],
+    )
+    def test_yaml_keys_must_be_strings(self, tmp_path, rate_cards, message):
+        yaml = pytest.importorskip("yaml")
+        path, clock = tmp_path / "rate_cards.yaml", FakeClock()
+        path.write_text(yaml.safe_dump(rate_card_document("v1")))
+        store = RateCardStore(str(path), reload_interval_seconds=0, clock=clock)
+        path.write_text(yaml.safe_dump({"version": "v2", "rate_cards": rate_cards}))
+        assert store.check() is False
+        assert store.current().version == "v1"
+        with pytest.raises(RateCardError, match=message):
+            RateCardStore(str(path))
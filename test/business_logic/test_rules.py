@@ -0,0 +1,132 @@
+from datetime import datetime
+import pytest
+from src.constants import LINE_ITEM_TYPE_NAME, RATE_CARD
+from src.enums import LineItemType, Tier, TierRateCardId
+from src.model import LineItem, RateCard
+from src.business_logic.aggregate import ActivityAggregate
+from src.business_logic.rules import compile_rule_plan, long_route_bonus
+from src.business_logic.breakdown import (
+    HOUR_MICROSECONDS,
+    period_breakdown,
+    route_breakdown,
+)
+from src.business_logic.rate_cards import current_rate_cards
+from test.business_logic.test_earning_engine import generate_activity_logs
+
+
+@pytest.mark.parametrize("rate_card_id", list(TierRateCardId))
+def test_plan_follows_rate_card(rate_card_id):
+    plan = current_rate_cards().plans[rate_card_id]
+    rate_card = RATE_CARD[Tier[rate_card_id.name]]
+    assert [step.name for step in plan.steps] == [
+        LINE_ITEM_TYPE_NAME[line_item_type] for line_item_type in rate_card.line_items
+    ]
+    assert plan is current_rate_cards().plans[rate_card_id]
+
+
+def test_plan_records_the_fields_its_rules_read():
+    plans = current_rate_cards().plans
+    for rate_card_id, plan in plans.items():
+        has_long_route_bonus = (
+            LineItemType.LongRouteBonus in RATE_CARD[Tier[rate_card_id.name]].line_items
+        )
+        assert plan.fields == (
+            frozenset({"route_attempts"}) if has_long_route_bonus else frozenset()
+        )
+    assert plans[TierRateCardId.GOLD].fields == frozenset()
+
+
+def test_evaluate():
+    aggregate = ActivityAggregate.from_columns(
+        generate_activity_logs(seed=1, attempts=400)
+    )
+    statement = current_rate_cards().plans[TierRateCardId.PLATINUM].evaluate(aggregate)
+    assert [line_item.quantity for line_item in statement.line_items] == [
+        float(aggregate.successful_attempts),
+        float(aggregate.failed_attempts),
+        1,
+        1,
+        aggregate.success_rate >= 0.965,
+    ]
+    assert statement.line_item_subtotal == sum(
+        line_item.total for line_item in statement.line_items
+    )
+    assert statement.final_earnings == max(
+        statement.line_item_subtotal, statement.minimum_earnings
+    )
+
+
+def test_unknown_line_item_type_is_rejected():
+    rate_card = RateCard(10.0, {"tipBonus": LineItem(rate=1.0)})
+    with pytest.raises(KeyError):
+        compile_rule_plan(TierRateCardId.GOLD, rate_card, "test")
+
+
+def test_route_breakdown_matches_long_route_bonus():
+    aggregate = ActivityAggregate.from_columns(
+        generate_activity_logs(seed=3, attempts=2_000)
+    )
+    routes = route_breakdown(aggregate)
+    assert len(routes) == aggregate.unique_route_count
+    assert any(route.long_route for route in routes) == bool(
+        long_route_bonus(aggregate)
+    )
+    assert sum(route.hours_worked for route in routes) == aggregate.hours_worked
+
+
+@pytest.mark.parametrize("period_hours", [1, 8, 24])
+def test_period_breakdown_matches_per_period_totals(period_hours):
+    activity_logs = generate_activity_logs(seed=4, attempts=2_000)
+    aggregate = ActivityAggregate.from_columns(activity_logs)
+    plan = current_rate_cards().plans[TierRateCardId.GOLD]
+    periods = period_breakdown(
+        aggregate, activity_logs, plan.attempt_rates(), period_hours
+    )
+    width = period_hours * HOUR_MICROSECONDS
+    starts = [
+        int(datetime.fromisoformat(period.start).timestamp()) * 1_000_000
+        for period in periods
+    ]
+    assert starts == sorted(starts) and all(start % width == 0 for start in starts)
+    for start, period in zip(starts, periods):
+        in_period = [
+            success
+            for timestamp, success in zip(
+                activity_logs.timestamps, activity_logs.successes
+            )
+            if start <= timestamp < start + width
+        ]
+        assert period.attempts == len(in_period)
+        assert period.successful_attempts == sum(in_period)
+        assert period.hours_worked == pytest.approx(
+            sum(
+                max(0, min(last, start + width) - max(first, start))
+                for first, last in zip(
+                    aggregate.route_first_attempts, aggregate.route_last_attempts
+                )
+            )
+            / 1_000_000
+            / 3600
+        )
+    assert sum(period.attempts for period in periods) == len(activity_logs)
+    assert sum(period.hours_worked for period in periods) == pytest.approx(
+        aggregate.hours_worked
+    )
+    statement = plan.evaluate(aggregate)
+    per_attempt_items = statement.line_items[:2]
+    assert [line_item.name for line_item in per_attempt_items] == [
+        "Per successful attempt",
+        "Per unsuccessful attempt",
+    ]
+    assert sum(period.earnings for period in periods) == pytest.approx(
+        sum(line_item.total for line_item in per_attempt_items)
+    )
+
+
+def test_attempt_rates_exclude_weekly_bonuses():
+    plan = current_rate_cards().plans[TierRateCardId.PLATINUM]
+    rate_card = RATE_CARD[Tier.PLATINUM]
+    assert plan.attempt_rates() == (
+        rate_card.line_items[LineItemType.PerSuccessfulAttempt].rate,
+        rate_card.line_items[LineItemType.PerUnsuccessfulAttempt].rate,
+    )
@@ -0,0 +1,38 @@
+import csv
+import io
+import json
+import pytest
+from src.cli.batch import run
+from test.route.test_earning import REQUEST_BODY, payloads
+
+RECORDS = [
+    {"courier": f"courier-{rate_card_id}", "rate_card_id": rate_card_id, "logs": logs}
+    for logs, rate_card_id, _ in payloads
+] + [{"courier": "courier-bad", "rate_card_id": "iron_tier", "logs": REQUEST_BODY}]
+INPUT = "\n".join(json.dumps(record) for record in RECORDS) + "\nnot json\n"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_jsonl_output(workers):
+    output = io.StringIO()
+    progress = run(
+        io.StringIO(INPUT), output, workers=workers, chunk_size=2, progress_interval=0
+    )
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [result["courier"] for result in results] == [
+        record["courier"] for record in RECORDS
+    ] + [None]
+    for result, (_, _, expected_response) in zip(results, payloads):
+        assert result["statement"] == expected_response
+    assert results[-2]["error"]["errors"] == [
+        {"field": "rate_card_id", "message": "Invalid rate card id provided"}
+    ]
+    assert (progress.records, progress.errors) == (len(RECORDS) + 1, 2)
+
+
+def test_csv_output():
+    output = io.StringIO()
+    run(io.StringIO(INPUT), output, output_format="csv", progress_interval=0)
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert float(rows[0]["final_earnings"]) == payloads[0][2]["final_earnings"]
+    assert rows[-2]["error"] == "rate_card_id: Invalid rate card id provided"
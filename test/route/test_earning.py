@@ -70,6 +70,7 @@ payloads = [
             "hours_worked": 0.2110577227777778,
             "minimum_earnings": 3.218630272361111,
             "final_earnings": 3.4899999999999998,
+            "rate_card_version": "builtin",
         },
     ),
     (
@@ -100,6 +101,7 @@ payloads = [
             "hours_worked": 0.2110577227777778,
             "minimum_earnings": 3.1658658416666667,
             "final_earnings": 3.1658658416666667,
+            "rate_card_version": "builtin",
         },
     ),
     (
@@ -131,6 +133,7 @@ payloads = [
             "hours_worked": 0.2110577227777778,
             "minimum_earnings": 2.8492792575,
             "final_earnings": 3.25,
+            "rate_card_version": "builtin",
         },
     ),
     (
@@ -162,6 +165,7 @@ payloads = [
             "hours_worked": 0.2110577227777778,
             "minimum_earnings": 3.060336980277778,
             "final_earnings": 3.060336980277778,
+            "rate_card_version": "builtin",
         },
     ),
 ]
@@ -0,0 +1,245 @@
+import gzip
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import pytest
+from werkzeug.serving import make_server
+from src import config
+from src.utils import admission
+from src.utils.admission import HEAVY_LANE, LIGHT_LANE, Lane
+from test.route.test_earning import REQUEST_BODY
+from test.route.test_earning_ndjson import NDJSON_BODY
+
+
+@pytest.fixture
+def busy_light_lane(monkeypatch):
+    """Replaces the light lane with one whose only slot is taken and which has no queue."""
+    lane = Lane(LIGHT_LANE, concurrency=1, queue_size=0, timeout_seconds=1)
+    lane.acquire()
+    monkeypatch.setitem(admission.lanes, LIGHT_LANE, lane)
+    return lane
+
+
+@pytest.fixture
+def server_address(app):
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "127.0.0.1", server.server_port
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture
+def gunicorn_address(tmp_path):
+    """Runs the app under gunicorn.conf.py with one single-threaded worker and lanes of one slot."""
+    pytest.importorskip("gunicorn")
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    env = {
+        **os.environ,
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "WEB_WORKERS": "1",
+        "WEB_THREADS": "1",
+        "WARM_UP": "off",
+        "METRICS_DIR": str(tmp_path),
+        "STATEMENT_CACHE_SIZE": "0",
+        "LIGHT_LANE_CONCURRENCY": "1",
+        "HEAVY_LANE_CONCURRENCY": "1",
+        "ADMISSION_QUEUE_SIZE": "1",
+        "ADMISSION_QUEUE_TIMEOUT_SECONDS": "30",
+        "HEAVY_REQUEST_BODY_BYTES": str(1 << 30),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "src.app:server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    pytest.fail("gunicorn did not start")
+                time.sleep(0.1)
+        yield "127.0.0.1", port
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def post_chunked(address, path, body: bytes, chunk_size=256):
+    """Posts `body` with chunked transfer encoding, i.e. without a Content-Length."""
+    connection = http.client.HTTPConnection(*address, timeout=10)
+    try:
+        connection.request(
+            "POST",
+            path,
+            body=(body[i : i + chunk_size] for i in range(0, len(body), chunk_size)),
+            headers={"Content-Type": "application/json"},
+            encode_chunked=True,
+        )
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+class TestEarningAdmission:
+    def test_busy_lane_is_rejected_with_retry_after(self, client, busy_light_lane):
+        for path, body in (
+            ("/earning/gold_tier", REQUEST_BODY),
+            ("/earning/compare", REQUEST_BODY),
+            (
+                "/earning/batch",
+                {"c1": {"rate_card_id": "gold_tier", "activity_logs": REQUEST_BODY}},
+            ),
+        ):
+            response = client.post(path, json=body)
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == str(
+                config.ADMISSION_RETRY_AFTER_SECONDS
+            )
+            assert json.loads(response.data)["name"] == "Too Many Requests"
+        assert busy_light_lane.active == 1
+
+    def test_heavy_requests_take_their_own_lane(
+        self, client, monkeypatch, busy_light_lane
+    ):
+        monkeypatch.setattr(config, "HEAVY_REQUEST_BODY_BYTES", 100)
+        response = client.post("/earning/gold_tier", json=REQUEST_BODY)
+        assert response.status_code == 200
+        assert admission.lanes[HEAVY_LANE].active == 0
+
+    def test_lane_is_released_after_errors(self, client):
+        response = client.post("/earning/unknown_tier", json=REQUEST_BODY)
+        assert response.status_code == 400
+        assert admission.lanes[LIGHT_LANE].active == 0
+
+    def test_cache_stats_are_not_admission_controlled(self, client, busy_light_lane):
+        assert client.get("/earning/cache").status_code == 200
+
+    def test_body_too_large(self, client, monkeypatch):
+        monkeypatch.setattr(config, "MAX_REQUEST_BODY_BYTES", 100)
+        response = client.post("/earning/gold_tier", json=REQUEST_BODY)
+        assert response.status_code == 413
+        assert "100 bytes" in json.loads(response.data)["message"]
+
+    @pytest.mark.parametrize(
+        "path, body",
+        [
+            ("/earning/gold_tier", REQUEST_BODY),
+            ("/earning/compare", REQUEST_BODY),
+            (
+                "/earning/batch",
+                {
+                    "c1": {"rate_card_id": "gold_tier", "activity_logs": REQUEST_BODY},
+                    "c2": {"rate_card_id": "gold_tier", "activity_logs": REQUEST_BODY},
+                },
+            ),
+        ],
+    )
+    def test_too_many_attempts(self, client, monkeypatch, path, body):
+        monkeypatch.setattr(config, "MAX_ACTIVITY_LOG_ATTEMPTS", len(REQUEST_BODY) - 1)
+        response = client.post(path, json=body)
+        assert response.status_code == 413
+        assert "attempts" in json.loads(response.data)["message"]
+
+    def test_too_many_attempts_in_stream(self, client, monkeypatch):
+        monkeypatch.setattr(config, "MAX_ACTIVITY_LOG_ATTEMPTS", len(REQUEST_BODY) - 1)
+        response = client.post(
+            "/earning/gold_tier",
+            data=NDJSON_BODY,
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == 413
+
+    def test_rejections_are_counted(self, client, monkeypatch, busy_light_lane):
+        client.post("/earning/gold_tier", json=REQUEST_BODY)
+        monkeypatch.setattr(config, "MAX_REQUEST_BODY_BYTES", 100)
+        client.post("/earning/gold_tier", json=REQUEST_BODY)
+        text = client.get("/metrics").data.decode("utf-8")
+        assert (
+            'earning_admission_rejected_total{lane="light",reason="queue_full"}' in text
+        )
+        assert 'earning_admission_rejected_total{lane="light",reason="too_large"}' in (
+            text
+        )
+
+    def test_chunked_body_too_large(self, monkeypatch, server_address):
+        body = json.dumps(REQUEST_BODY).encode()
+        monkeypatch.setattr(config, "MAX_REQUEST_BODY_BYTES", len(body))
+        status, _ = post_chunked(server_address, "/earning/gold_tier", body)
+        assert status == 200
+        monkeypatch.setattr(config, "MAX_REQUEST_BODY_BYTES", len(body) - 1)
+        status, data = post_chunked(server_address, "/earning/gold_tier", body)
+        assert status == 413
+        assert f"{len(body) - 1} bytes" in json.loads(data)["message"]
+
+    def test_compressed_requests_take_the_heavy_lane(self, client, busy_light_lane):
+        response = client.post(
+            "/earning/gold_tier",
+            data=gzip.compress(json.dumps(REQUEST_BODY).encode()),
+            headers={"Content-Encoding": "gzip"},
+            content_type="application/json",
+        )
+        assert response.status_code == 200
+
+    def test_compressed_body_is_bound_by_the_request_body_limit(
+        self, client, monkeypatch
+    ):
+        body = json.dumps(REQUEST_BODY).encode()
+        compressed = gzip.compress(body)
+        monkeypatch.setattr(config, "MAX_REQUEST_BODY_BYTES", len(body) - 1)
+        assert config.MAX_DECOMPRESSED_BODY_BYTES > len(body)
+        response = client.post(
+            "/earning/gold_tier",
+            data=compressed,
+            headers={"Content-Encoding": "gzip"},
+            content_type="application/json",
+        )
+        assert response.status_code == 413
+        assert "decompressed" in json.loads(response.data)["message"]
+
+    def test_full_queue_is_rejected_under_gunicorn(self, gunicorn_address):
+        # Slow enough that the requests overlap, all in the light lane.
+        body = json.dumps(REQUEST_BODY * 20_000).encode()
+        start = threading.Barrier(6)
+        statuses = []
+
+        def post():
+            connection = http.client.HTTPConnection(*gunicorn_address, timeout=60)
+            try:
+                start.wait()
+                try:
+                    connection.request(
+                        "POST",
+                        "/earning/gold_tier",
+                        body=body,
+                        headers={"Content-Type": "application/json"},
+                    )
+                except (BrokenPipeError, ConnectionResetError):
+                    # A rejected request is answered and closed before its body is read.
+                    pass
+                statuses.append(connection.getresponse().status)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # One request runs, one waits in the queue, and the worker's spare threads turn the rest away.
+        assert sorted(set(statuses)) == [200, 429]
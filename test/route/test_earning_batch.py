@@ -0,0 +1,39 @@
+import json
+from test.route.test_earning import REQUEST_BODY, payloads
+
+
+class TestBatchEarning:
+    def test_matches_single_requests(self, client):
+        body = {
+            f"courier-{rate_card_id}": {
+                "rate_card_id": rate_card_id,
+                "activity_logs": activity_logs,
+            }
+            for activity_logs, rate_card_id, _ in payloads
+        }
+        response = client.post("/earning/batch", json=body)
+        assert response.status_code == 200
+        result = json.loads(response.data.decode("utf-8"))
+        assert result["errors"] == {}
+        for _, rate_card_id, expected_response in payloads:
+            assert result["statements"][f"courier-{rate_card_id}"] == expected_response
+
+    def test_bad_courier_does_not_fail_batch(self, client):
+        body = {
+            "good": {"rate_card_id": "gold_tier", "activity_logs": REQUEST_BODY},
+            "unknown_tier": {"rate_card_id": "iron_tier", "activity_logs": REQUEST_BODY},
+            "empty": {"rate_card_id": "gold_tier", "activity_logs": []},
+            "invalid": {
+                "rate_card_id": "gold_tier",
+                "activity_logs": [{"route_id": "RT1", "success": True}],
+            },
+        }
+        response = client.post("/earning/batch", json=body)
+        assert response.status_code == 200
+        result = json.loads(response.data.decode("utf-8"))
+        assert list(result["statements"]) == ["good"]
+        assert set(result["errors"]) == {"unknown_tier", "empty", "invalid"}
+        assert result["errors"]["invalid"]["errors"] == [
+            {"field": "0.attempt_date_time", "message": "Missing data for required field."}
+        ]
+        assert all(error["code"] == 400 for error in result["errors"].values())
@@ -0,0 +1,51 @@
+import json
+from test.route.test_earning import REQUEST_BODY, payloads
+from test.route.test_earning_ndjson import NDJSON_BODY
+
+
+class TestEarningBreakdown:
+    def test_route_breakdown(self, client):
+        for _, rate_card_id, expected_response in payloads:
+            response = client.post(
+                f"/earning/{rate_card_id}?breakdown=routes", json=REQUEST_BODY
+            )
+            assert response.status_code == 200
+            result = json.loads(response.data.decode("utf-8"))
+            routes = result.pop("routes")
+            assert result == expected_response
+            assert [route["route_id"] for route in routes] == sorted(
+                {log["route_id"] for log in REQUEST_BODY}
+            )
+            assert sum(route["attempts"] for route in routes) == len(REQUEST_BODY)
+            assert sum(route["successful_attempts"] for route in routes) == sum(
+                log["success"] for log in REQUEST_BODY
+            )
+            assert sum(route["hours_worked"] for route in routes) == (
+                expected_response["hours_worked"]
+            )
+            for route in routes:
+                assert route["success_rate"] == (
+                    route["successful_attempts"] / route["attempts"]
+                )
+                assert route["long_route"] is (route["attempts"] > 30)
+
+    def test_ndjson_matches_json(self, client):
+        json_response = client.post(
+            "/earning/gold_tier?breakdown=routes", json=REQUEST_BODY
+        )
+        ndjson_response = client.post(
+            "/earning/gold_tier?breakdown=routes",
+            data=NDJSON_BODY,
+            content_type="application/x-ndjson",
+        )
+        assert json.loads(ndjson_response.data) == json.loads(json_response.data)
+
+    def test_cached_statement_without_breakdown_is_not_reused(self, client):
+        client.post("/earning/gold_tier", json=REQUEST_BODY)
+        response = client.post("/earning/gold_tier?breakdown=routes", json=REQUEST_BODY)
+        assert "routes" in json.loads(response.data)
+
+    def test_unknown_breakdown(self, client):
+        response = client.post("/earning/gold_tier?breakdown=shifts", json=REQUEST_BODY)
+        assert response.status_code == 400
+        assert "shifts" in response.data.decode("utf-8")
@@ -0,0 +1,32 @@
+import json
+from src.business_logic import rate_cards
+from src.business_logic.rate_cards import RateCardStore
+from src.resource.earning import statement_cache
+from test.route.test_earning import REQUEST_BODY
+from test.business_logic.test_rate_cards import rate_card_document
+
+
+class TestStatementCache:
+    def test_repeated_payload_is_served_from_cache(self, client):
+        statement_cache.clear()
+        hits = statement_cache.hits
+        first = client.post("/earning/gold_tier", json=REQUEST_BODY)
+        second = client.post("/earning/gold_tier", json=REQUEST_BODY)
+        assert first.data == second.data
+        assert statement_cache.hits == hits + 1
+
+        stats = json.loads(client.get("/earning/cache").data)
+        assert stats["hits"] == statement_cache.hits
+        assert stats["size"] == 1
+
+    def test_rate_card_change_invalidates(self, client, monkeypatch, tmp_path):
+        statement_cache.clear()
+        client.post("/earning/gold_tier", json=REQUEST_BODY)
+        path = tmp_path / "rate_cards.json"
+        path.write_text(json.dumps(rate_card_document("v2", gold_tier=1.0)))
+        monkeypatch.setattr(rate_cards, "rate_card_store", RateCardStore(str(path)))
+        response = client.post("/earning/gold_tier", json=REQUEST_BODY)
+        result = json.loads(response.data)
+        assert result["line_items"][0]["rate"] == 1.0
+        assert result["line_items"][0]["total"] == 5.0
+        assert result["rate_card_version"] == "v2"
@@ -0,0 +1,46 @@
+import json
+from src.enums import TierRateCardId
+from src.business_logic.comparison import EarningComparison
+from src.business_logic.earning import Earning
+from src.business_logic.rate_cards import current_rate_cards
+from src.resource.payload import load_activity_logs
+from test.route.test_earning import REQUEST_BODY, payloads
+
+
+class TestEarningComparison:
+    def test_compare_all_tiers(self, client):
+        response = client.post("/earning/compare", json=REQUEST_BODY)
+        assert response.status_code == 200
+        result = json.loads(response.data.decode("utf-8"))
+        assert list(result["statements"]) == [
+            "bronze_tier",
+            "silver_tier",
+            "gold_tier",
+            "platinum_tier",
+        ]
+        for _, rate_card_id, expected_response in payloads:
+            assert result["statements"][rate_card_id] == expected_response
+        assert result["best_rate_card_id"] == "platinum_tier"
+
+    def test_compare_rejects_empty_logs(self, client):
+        response = client.post("/earning/compare", json=[])
+        assert response.status_code == 400
+
+    def test_rate_cards_share_one_aggregate_and_version(self, monkeypatch):
+        comparison = EarningComparison(load_activity_logs(REQUEST_BODY))
+        aggregate = Earning.aggregate(comparison.earnings[TierRateCardId.GOLD])
+        aggregations = []
+        monkeypatch.setattr(
+            Earning,
+            "aggregate",
+            lambda earning, fields=None: aggregations.append(fields) or aggregate,
+        )
+        assert comparison.aggregate() is aggregate
+        assert comparison.aggregate() is aggregate
+        plans = current_rate_cards().plans
+        # One aggregate, with the fields of every rate card.
+        assert aggregations == [
+            frozenset().union(*(plan.fields for plan in plans.values()))
+        ]
+        for rate_card_id, earning in comparison.earnings.items():
+            assert earning.get_rule_plan() is plans[rate_card_id]
@@ -0,0 +1,129 @@
+import gzip
+import json
+import pytest
+from src import config
+from src.utils import compression
+from test.route.test_earning import REQUEST_BODY, payloads
+from test.route.test_earning_ndjson import NDJSON_BODY
+
+
+def post_compressed(client, path, data, encoding="gzip", **kwargs):
+    return client.post(
+        path,
+        data=data,
+        headers={"Content-Encoding": encoding, **kwargs.pop("headers", {})},
+        **kwargs,
+    )
+
+
+class TestCompressedRequests:
+    def test_gzip_json(self, client):
+        body = gzip.compress(json.dumps(REQUEST_BODY).encode())
+        for _, rate_card_id, expected_response in payloads:
+            response = post_compressed(
+                client,
+                f"/earning/{rate_card_id}",
+                body,
+                content_type="application/json",
+            )
+            assert response.status_code == 200
+            assert json.loads(response.data) == expected_response
+
+    def test_gzip_ndjson(self, client):
+        _, rate_card_id, expected_response = payloads[0]
+        response = post_compressed(
+            client,
+            f"/earning/{rate_card_id}",
+            gzip.compress(NDJSON_BODY.encode()),
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == 200
+        assert json.loads(response.data) == expected_response
+
+    def test_zstd_json(self, client):
+        zstandard = pytest.importorskip("zstandard")
+        _, rate_card_id, expected_response = payloads[0]
+        body = zstandard.ZstdCompressor().compress(json.dumps(REQUEST_BODY).encode())
+        response = post_compressed(
+            client,
+            f"/earning/{rate_card_id}",
+            body,
+            encoding="zstd",
+            content_type="application/json",
+        )
+        assert json.loads(response.data) == expected_response
+
+    def test_zstd_multi_frame_ndjson(self, client):
+        zstandard = pytest.importorskip("zstandard")
+        _, rate_card_id, expected_response = payloads[0]
+        compressor = zstandard.ZstdCompressor()
+        lines = NDJSON_BODY.encode().splitlines(keepends=True)
+        body = b"".join(compressor.compress(line) for line in lines)
+        response = post_compressed(
+            client,
+            f"/earning/{rate_card_id}",
+            body,
+            encoding="zstd",
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == 200
+        assert json.loads(response.data) == expected_response
+
+    def test_decompressed_size_limit(self, client, monkeypatch):
+        monkeypatch.setattr(config, "MAX_DECOMPRESSED_BODY_BYTES", 1024)
+        body = gzip.compress(json.dumps(REQUEST_BODY * 10).encode())
+        assert len(body) < 1024
+        response = post_compressed(
+            client, "/earning/gold_tier", body, content_type="application/json"
+        )
+        assert response.status_code == 413
+        assert json.loads(response.data)["name"] == "Payload Too Large"
+
+    def test_corrupt_body(self, client):
+        body = gzip.compress(json.dumps(REQUEST_BODY).encode())[:-20]
+        response = post_compressed(
+            client, "/earning/gold_tier", body, content_type="application/json"
+        )
+        assert response.status_code == 400
+        assert "Invalid gzip request body" in json.loads(response.data)["message"]
+
+    def test_unsupported_encoding(self, client):
+        response = post_compressed(
+            client,
+            "/earning/gold_tier",
+            b"...",
+            encoding="br",
+            content_type="application/json",
+        )
+        assert response.status_code == 415
+
+
+class TestCompressedResponses:
+    def test_gzip_response(self, client):
+        response = client.post(
+            "/earning/compare",
+            json=REQUEST_BODY,
+            headers={"Accept-Encoding": "gzip, deflate"},
+        )
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        uncompressed = client.post("/earning/compare", json=REQUEST_BODY)
+        assert "Content-Encoding" not in uncompressed.headers
+        assert gzip.decompress(response.data) == uncompressed.data
+
+    def test_small_responses_are_not_compressed(self, client, monkeypatch):
+        monkeypatch.setattr(config, "RESPONSE_COMPRESSION_MIN_BYTES", 1_000_000)
+        response = client.post(
+            "/earning/compare", json=REQUEST_BODY, headers={"Accept-Encoding": "gzip"}
+        )
+        assert "Content-Encoding" not in response.headers
+
+    def test_refused_encoding(self, client, monkeypatch):
+        monkeypatch.setattr(compression, "zstandard", None)
+        response = client.post(
+            "/earning/compare",
+            json=REQUEST_BODY,
+            headers={"Accept-Encoding": "gzip;q=0, zstd"},
+        )
+        assert "Content-Encoding" not in response.headers
@@ -0,0 +1,45 @@
+import json
+import pytest
+from benchmark.workload import to_columnar
+from test.route.test_earning import REQUEST_BODY, payloads
+
+
+class TestEarningFormats:
+    def test_columnar_json(self, client):
+        for _, rate_card_id, expected_response in payloads:
+            response = client.post(
+                f"/earning/{rate_card_id}", json=to_columnar(REQUEST_BODY)
+            )
+            assert response.status_code == 200
+            assert json.loads(response.data) == expected_response
+
+    def test_msgpack(self, client):
+        msgpack = pytest.importorskip("msgpack")
+        _, rate_card_id, expected_response = payloads[0]
+        for body in (REQUEST_BODY, to_columnar(REQUEST_BODY, binary=True)):
+            response = client.post(
+                f"/earning/{rate_card_id}",
+                data=msgpack.packb(body),
+                content_type="application/msgpack",
+            )
+            assert response.status_code == 200
+            assert json.loads(response.data) == expected_response
+
+    def test_invalid_msgpack(self, client):
+        pytest.importorskip("msgpack")
+        response = client.post(
+            "/earning/gold_tier", data=b"\xc1", content_type="application/msgpack"
+        )
+        assert response.status_code == 400
+
+    def test_columnar_batch_and_compare(self, client):
+        columnar = to_columnar(REQUEST_BODY)
+        compare = client.post("/earning/compare", json=columnar)
+        assert json.loads(compare.data) == json.loads(
+            client.post("/earning/compare", json=REQUEST_BODY).data
+        )
+        batch = client.post(
+            "/earning/batch",
+            json={"courier": {"rate_card_id": "gold_tier", "activity_logs": columnar}},
+        )
+        assert json.loads(batch.data)["errors"] == {}
@@ -0,0 +1,33 @@
+import json
+from test.route.test_earning import REQUEST_BODY, payloads
+
+NDJSON_BODY = "\n".join(json.dumps(log) for log in REQUEST_BODY) + "\n"
+
+
+class TestEarningNdjson:
+    def test_matches_json_request(self, client):
+        for _, rate_card_id, expected_response in payloads:
+            response = client.post(
+                f"/earning/{rate_card_id}",
+                data=NDJSON_BODY,
+                content_type="application/x-ndjson",
+            )
+            assert response.status_code == 200
+            assert json.loads(response.data.decode("utf-8")) == expected_response
+
+    def test_invalid_line_is_reported(self, client):
+        body = NDJSON_BODY + "\n" + json.dumps({"route_id": "RT1", "success": True})
+        response = client.post(
+            "/earning/gold_tier", data=body, content_type="application/x-ndjson"
+        )
+        assert response.status_code == 400
+        result = json.loads(response.data.decode("utf-8"))
+        assert result["errors"] == [
+            {"field": "7.attempt_date_time", "message": "Missing data for required field."}
+        ]
+
+    def test_empty_stream(self, client):
+        response = client.post(
+            "/earning/gold_tier", data="\n", content_type="application/x-ndjson"
+        )
+        assert response.status_code == 400
@@ -0,0 +1,113 @@
+import json
+import pytest
+from src.business_logic.breakdown import MAX_PERIODS
+from test.route.test_earning import REQUEST_BODY, payloads
+from test.route.test_earning_ndjson import NDJSON_BODY
+
+OVERNIGHT_BODY = [
+    {"route_id": "RT1", "attempt_date_time": "2023-12-18T22:00:00Z", "success": True},
+    {"route_id": "RT1", "attempt_date_time": "2023-12-19T01:00:00Z", "success": True},
+    {"route_id": "RT2", "attempt_date_time": "2023-12-19T07:30:00Z", "success": False},
+    {"route_id": "RT2", "attempt_date_time": "2023-12-19T08:30:00Z", "success": True},
+]
+
+
+class TestEarningPeriods:
+    def test_period_breakdown(self, client):
+        for _, rate_card_id, expected_response in payloads:
+            response = client.post(
+                f"/earning/{rate_card_id}?breakdown=periods", json=REQUEST_BODY
+            )
+            assert response.status_code == 200
+            result = json.loads(response.data.decode("utf-8"))
+            periods = result.pop("periods")
+            assert result == expected_response
+            assert [(period["start"], period["end"]) for period in periods] == [
+                ("2023-12-18T00:00:00+00:00", "2023-12-19T00:00:00+00:00")
+            ]
+            assert periods[0]["attempts"] == len(REQUEST_BODY)
+            assert periods[0]["hours_worked"] == expected_response["hours_worked"]
+
+    def test_hours_are_split_at_period_boundaries(self, client):
+        response = client.post(
+            "/earning/gold_tier?breakdown=routes,periods&period_hours=8",
+            json=OVERNIGHT_BODY,
+        )
+        assert response.status_code == 200
+        result = json.loads(response.data)
+        assert len(result["routes"]) == 2
+        assert [
+            (period["start"], period["attempts"], period["hours_worked"])
+            for period in result["periods"]
+        ] == [
+            ("2023-12-18T16:00:00+00:00", 1, 2.0),
+            ("2023-12-19T00:00:00+00:00", 2, 1.5),
+            ("2023-12-19T08:00:00+00:00", 1, 0.5),
+        ]
+        assert sum(period["hours_worked"] for period in result["periods"]) == (
+            result["hours_worked"]
+        )
+
+    def test_weekly_bonuses_are_not_split(self, client):
+        response = client.post(
+            "/earning/gold_tier?breakdown=periods", json=REQUEST_BODY
+        )
+        result = json.loads(response.data)
+        per_attempt_total = sum(
+            line_item["total"]
+            for line_item in result["line_items"]
+            if line_item["name"].startswith("Per ")
+        )
+        assert sum(period["earnings"] for period in result["periods"]) == (
+            pytest.approx(per_attempt_total)
+        )
+
+    def test_period_length_is_part_of_the_cache_key(self, client):
+        daily = client.post("/earning/gold_tier?breakdown=periods", json=OVERNIGHT_BODY)
+        hourly = client.post(
+            "/earning/gold_tier?breakdown=periods&period_hours=1", json=OVERNIGHT_BODY
+        )
+        assert len(json.loads(daily.data)["periods"]) == 2
+        assert len(json.loads(hourly.data)["periods"]) == 6
+
+    @pytest.mark.parametrize("period_hours", ["0", "5", "-1", "eight", "48"])
+    def test_invalid_period_hours(self, client, period_hours):
+        response = client.post(
+            f"/earning/gold_tier?breakdown=periods&period_hours={period_hours}",
+            json=REQUEST_BODY,
+        )
+        assert response.status_code == 400
+        assert "period_hours" in response.data.decode("utf-8")
+
+    def test_too_many_periods(self, client):
+        body = [
+            {**OVERNIGHT_BODY[0], "attempt_date_time": "2023-01-01T00:00:00Z"},
+            *OVERNIGHT_BODY,
+        ]
+        response = client.post(
+            "/earning/gold_tier?breakdown=periods&period_hours=1", json=body
+        )
+        assert response.status_code == 400
+        assert f"more than {MAX_PERIODS} periods" in response.data.decode("utf-8")
+        assert json.loads(response.data)["errors"][0]["field"] == "period_hours"
+        response = client.post("/earning/gold_tier?breakdown=periods", json=body)
+        assert response.status_code == 200
+
+    def test_too_many_default_periods(self, client):
+        body = [
+            {**OVERNIGHT_BODY[0], "attempt_date_time": "2020-01-01T00:00:00Z"},
+            *OVERNIGHT_BODY,
+        ]
+        response = client.post("/earning/gold_tier?breakdown=periods", json=body)
+        assert response.status_code == 400
+        # The client never sent period_hours, so the error is about the breakdown it asked for.
+        assert json.loads(response.data)["errors"][0]["field"] == "breakdown"
+
+    def test_ndjson_is_rejected(self, client):
+        response = client.post(
+            "/earning/gold_tier?breakdown=periods",
+            data=NDJSON_BODY,
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == 400
+        assert "NDJSON" in response.data.decode("utf-8")
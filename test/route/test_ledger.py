@@ -0,0 +1,58 @@
+import json
+import pytest
+from src import config
+from test.route.test_earning import REQUEST_BODY, payloads
+from test.route.test_earning_ndjson import NDJSON_BODY
+
+
+@pytest.fixture
+def ledger_enabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "LEDGER_ENABLED", True)
+    monkeypatch.setattr(config, "LEDGER_PATH", str(tmp_path / "ledger.sqlite3"))
+
+
+class TestLedger:
+    def test_statement_from_appended_attempts(self, client, ledger_enabled):
+        for log in REQUEST_BODY:
+            response = client.post("/ledger/courier-1/2023-W51/attempts", json=[log])
+            assert response.status_code == 200
+        assert json.loads(response.data)["attempts"] == len(REQUEST_BODY)
+
+        for _, rate_card_id, expected_response in payloads:
+            response = client.get(f"/ledger/courier-1/2023-W51/earning/{rate_card_id}")
+            assert response.status_code == 200
+            assert json.loads(response.data) == expected_response
+
+    def test_unknown_week(self, client, ledger_enabled):
+        response = client.get("/ledger/courier-1/2023-W52/earning/gold_tier")
+        assert response.status_code == 404
+
+    def test_invalid_week(self, client, ledger_enabled):
+        response = client.post("/ledger/courier-1/last-week/attempts", json=REQUEST_BODY)
+        assert response.status_code == 400
+
+    def test_nonexistent_week(self, client, ledger_enabled):
+        response = client.post("/ledger/courier-1/2023-W53/attempts", json=REQUEST_BODY)
+        assert response.status_code == 400
+        assert "2023 has no week 53" in response.data.decode("utf-8")
+
+    @pytest.mark.parametrize("week", ["2023-W50", "2023-W52"])
+    def test_attempts_outside_the_week(self, client, ledger_enabled, week):
+        response = client.post(f"/ledger/courier-1/{week}/attempts", json=REQUEST_BODY)
+        assert response.status_code == 400
+        assert f"within the week {week}" in response.data.decode("utf-8")
+        response = client.get(f"/ledger/courier-1/{week}/earning/gold_tier")
+        assert response.status_code == 404
+
+    def test_attempts_outside_the_week_in_stream(self, client, ledger_enabled):
+        response = client.post(
+            "/ledger/courier-1/2023-W52/attempts",
+            data=NDJSON_BODY,
+            content_type="application/x-ndjson",
+        )
+        assert response.status_code == 400
+
+    def test_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(config, "LEDGER_ENABLED", False)
+        response = client.post("/ledger/courier-1/2023-W51/attempts", json=REQUEST_BODY)
+        assert response.status_code == 404
@@ -0,0 +1,35 @@
+from src.utils.metrics import registry
+
+ACTIVITY_LOGS = [
+    {"route_id": "R1", "attempt_date_time": "2024-01-15T09:00:00Z", "success": True}
+]
+
+
+class TestMetrics:
+    def test_server_timing_header(self, client):
+        response = client.post("/earning/bronze_tier", json=ACTIVITY_LOGS)
+        assert response.status_code == 200
+        stages = [
+            entry.split(";")[0]
+            for entry in response.headers["Server-Timing"].split(", ")
+        ]
+        assert {"parse", "validate", "aggregate", "rules", "serialize"} <= set(stages)
+        assert stages[-1] == "total"
+
+    def test_metrics_endpoint(self, client):
+        registry.reset()
+        client.post("/earning/bronze_tier", json=ACTIVITY_LOGS)
+        client.post("/earning/unknown_tier", json=ACTIVITY_LOGS)
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        text = response.get_data(as_text=True)
+        assert "# TYPE earning_stage_seconds histogram" in text
+        assert (
+            'earning_stage_seconds_count{endpoint="earning.earningapi",rate_card_id="bronze_tier",'
+            'stage="total"} 1'
+        ) in text
+        assert (
+            'http_requests_total{endpoint="earning.earningapi",status="400"} 1' in text
+        )
+        assert "unknown_tier" not in text
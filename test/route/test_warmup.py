@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from src.resource.earning import statement_cache
+from src.warmup import warm_up, warm_up_in_background
+
+
+def test_app_import_does_not_load_heavy_modules():
+    code = (
+        "import sys, src.app; "
+        "print([m for m in ('pandas', 'numpy', 'marshmallow') if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_warm_up_leaves_no_trace(app):
+    warm_up(app)
+    assert statement_cache.stats()["size"] == 0
+    assert (statement_cache.hits, statement_cache.misses) == (0, 0)
+    assert "pandas" in sys.modules
+
+
+def test_warm_up_in_background():
+    thread = warm_up_in_background()
+    thread.join(timeout=30)
+    assert not thread.is_alive()
@@ -0,0 +1,91 @@
+import threading
+import pytest
+from src import config
+from src.utils.admission import HEAVY_LANE, LIGHT_LANE, Lane, lane_name
+from src.utils.exceptions import TooManyRequestsException
+from src.utils.metrics import registry
+
+
+def counter(name, **labels):
+    labels = tuple(sorted(labels.items()))
+    for metric, metric_labels, value in registry.snapshot()["counters"]:
+        if (metric, metric_labels) == (name, labels):
+            return value
+    return 0
+
+
+def waiting_for(lane, count):
+    """Blocks until `count` requests are waiting in `lane`."""
+    with lane._condition:
+        while lane.waiting < count:
+            lane._condition.wait(0.01)
+
+
+class TestLane:
+    def test_admits_up_to_concurrency(self):
+        lane = Lane("test", concurrency=2, queue_size=0, timeout_seconds=1)
+        lane.acquire()
+        lane.acquire()
+        assert lane.active == 2
+        with pytest.raises(TooManyRequestsException) as e:
+            lane.acquire()
+        assert e.value.status_code == 429
+        assert e.value.retry_after == config.ADMISSION_RETRY_AFTER_SECONDS
+        lane.release()
+        lane.acquire()
+        assert lane.active == 2
+
+    def test_unlimited_lane(self):
+        lane = Lane("test", concurrency=0, queue_size=0, timeout_seconds=1)
+        for _ in range(100):
+            lane.acquire()
+        assert lane.active == 100
+
+    def test_queued_request_runs_once_a_slot_frees_up(self):
+        lane = Lane("queue-test", concurrency=1, queue_size=1, timeout_seconds=10)
+        queued = counter("earning_admission_queued_total", lane="queue-test")
+        lane.acquire()
+        admitted = threading.Event()
+
+        def wait_for_slot():
+            lane.acquire()
+            admitted.set()
+
+        thread = threading.Thread(target=wait_for_slot)
+        thread.start()
+        waiting_for(lane, 1)
+        assert not admitted.is_set()
+        # The queue holds a single request, so the next one is turned away at once.
+        with pytest.raises(TooManyRequestsException):
+            lane.acquire()
+        assert counter(
+            "earning_admission_rejected_total", lane="queue-test", reason="queue_full"
+        )
+        lane.release()
+        thread.join(5)
+        assert admitted.is_set()
+        assert (lane.active, lane.waiting) == (1, 0)
+        assert counter("earning_admission_queued_total", lane="queue-test") == (
+            queued + 1
+        )
+
+    def test_queued_request_times_out(self):
+        lane = Lane("timeout-test", concurrency=1, queue_size=1, timeout_seconds=0.05)
+        lane.acquire()
+        with pytest.raises(TooManyRequestsException):
+            lane.acquire()
+        assert lane.waiting == 0
+        assert counter(
+            "earning_admission_rejected_total",
+            lane="timeout-test",
+            reason="queue_timeout",
+        )
+
+
+def test_lane_name(monkeypatch):
+    monkeypatch.setattr(config, "HEAVY_REQUEST_BODY_BYTES", 100)
+    assert lane_name(100) == LIGHT_LANE
+    assert lane_name(101) == HEAVY_LANE
+    assert lane_name(None) == HEAVY_LANE
+    assert lane_name(50, "identity") == LIGHT_LANE
+    assert lane_name(50, "gzip") == HEAVY_LANE
@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+from src.utils.metrics import MetricsRegistry
+from src.utils.timing import stage, start_timer, stop_timer
+
+
+class TestMetricsRegistry:
+    def test_render_histogram_and_counter(self):
+        registry = MetricsRegistry()
+        registry.observe("earning_request_attempts", 5, endpoint="earningapi")
+        registry.observe("earning_request_attempts", 500, endpoint="earningapi")
+        registry.inc("http_requests_total", endpoint="earningapi", status="200")
+        text = registry.render()
+        assert (
+            'earning_request_attempts_bucket{endpoint="earningapi",le="10"} 1' in text
+        )
+        assert (
+            'earning_request_attempts_bucket{endpoint="earningapi",le="1000"} 2' in text
+        )
+        assert (
+            'earning_request_attempts_bucket{endpoint="earningapi",le="+Inf"} 2' in text
+        )
+        assert 'earning_request_attempts_sum{endpoint="earningapi"} 505' in text
+        assert 'earning_request_attempts_count{endpoint="earningapi"} 2' in text
+        assert 'http_requests_total{endpoint="earningapi",status="200"} 1' in text
+
+    def test_render_merges_processes(self, tmp_path, monkeypatch):
+        worker = MetricsRegistry(directory=str(tmp_path))
+        worker.inc("http_requests_total", endpoint="earningapi", status="200")
+        worker.flush(force=True)
+
+        # A second process writes its snapshot under a different pid.
+        monkeypatch.setattr("os.getpid", lambda: 1)
+        registry = MetricsRegistry(directory=str(tmp_path))
+        registry.inc("http_requests_total", 2, endpoint="earningapi", status="200")
+        assert 'http_requests_total{endpoint="earningapi",status="200"} 3' in (
+            registry.render()
+        )
+
+        registry.clear_directory()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_idle_worker_publishes_its_last_values(self, tmp_path):
+        worker = MetricsRegistry(directory=str(tmp_path), flush_interval_seconds=60)
+        worker.inc("http_requests_total", endpoint="earningapi", status="200")
+        worker.flush()
+        # Recorded within the flush interval, and no request follows to flush it.
+        worker.inc("http_requests_total", endpoint="earningapi", status="200")
+        worker.flush()
+        snapshot = json.loads((tmp_path / f"metrics-{os.getpid()}.json").read_text())
+        assert snapshot["counters"][0][2] == 1
+
+        worker.flush_interval_seconds = 0.01
+        worker.start_flushing()
+        try:
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                snapshot = json.loads(
+                    (tmp_path / f"metrics-{os.getpid()}.json").read_text()
+                )
+                if snapshot["counters"][0][2] == 2:
+                    break
+                time.sleep(0.01)
+        finally:
+            worker.stop_flushing()
+        assert snapshot["counters"][0][2] == 2
+
+    def test_concurrent_flushes(self, tmp_path):
+        worker = MetricsRegistry(directory=str(tmp_path), flush_interval_seconds=0)
+        errors = []
+
+        def flush():
+            try:
+                for _ in range(300):
+                    worker.inc(
+                        "http_requests_total", endpoint="earningapi", status="200"
+                    )
+                    worker.flush()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=flush) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert [path.name for path in tmp_path.iterdir()] == [
+            f"metrics-{os.getpid()}.json"
+        ]
+        worker.flush(force=True)
+        snapshot = json.loads((tmp_path / f"metrics-{os.getpid()}.json").read_text())
+        assert snapshot["counters"][0][2] == 1200
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.inc("http_requests_total", endpoint='a"b\\c', status="500")
+        assert 'endpoint="a\\"b\\\\c"' in registry.render()
+
+
+class TestStageTiming:
+    def test_stages_accumulate(self):
+        timer = start_timer()
+        try:
+            with stage("validate"):
+                pass
+            with stage("validate"):
+                pass
+            with stage("rules"):
+                pass
+        finally:
+            stop_timer()
+        assert list(timer.stages) == ["validate", "rules"]
+        assert timer.server_timing(1_500_000).endswith("total;dur=1.500")
+
+    def test_stage_outside_request_is_a_no_op(self):
+        with stage("validate"):
+            pass
@@ -0,0 +1,55 @@
+import logging
+import pstats
+import pytest
+from flask import Flask
+from src import config
+from src.route.earning import earning_blueprint
+from src.utils import profiling
+
+ACTIVITY_LOGS = [
+    {"route_id": "R1", "attempt_date_time": "2024-01-15T09:00:00Z", "success": True}
+]
+
+
+@pytest.fixture
+def profiled_client(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_DIR", str(tmp_path))
+    app = Flask(__name__)
+    app.register_blueprint(earning_blueprint)
+    app.before_request(profiling.start_profile)
+    app.after_request(profiling.finish_profile)
+    app.teardown_request(profiling.end_profile)
+    with app.test_client() as client:
+        yield client
+
+
+class TestProfiling:
+    def test_profiles_requests_with_header(self, profiled_client, tmp_path, caplog):
+        with caplog.at_level(logging.INFO, logger=profiling.__name__):
+            response = profiled_client.post(
+                "/earning/bronze_tier",
+                json=ACTIVITY_LOGS,
+                headers={"X-Profile": "1", "X-Request-ID": "courier-42"},
+            )
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == "courier-42"
+        stats = pstats.Stats(str(tmp_path / "courier-42.prof"))
+        assert stats.total_calls > 0
+        assert "courier-42" in caplog.text
+        assert "cumulative" in caplog.text
+
+    def test_unsafe_request_id_is_replaced(self, profiled_client, tmp_path):
+        response = profiled_client.post(
+            "/earning/bronze_tier",
+            json=ACTIVITY_LOGS,
+            headers={"X-Profile": "1", "X-Request-ID": "../../etc/passwd"},
+        )
+        request_id = response.headers["X-Request-ID"]
+        assert request_id != "../../etc/passwd"
+        assert [path.name for path in tmp_path.iterdir()] == [f"{request_id}.prof"]
+
+    def test_requests_without_header_are_not_profiled(self, profiled_client, tmp_path):
+        response = profiled_client.post("/earning/bronze_tier", json=ACTIVITY_LOGS)
+        assert response.status_code == 200
+        assert "X-Request-ID" not in response.headers
+        assert list(tmp_path.iterdir()) == []
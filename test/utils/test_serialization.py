@@ -0,0 +1,42 @@
+import json
+import pytest
+from src import config
+from src.model import EarningStatementResponse, LineItemResponse
+from src.utils.serialization import dumps
+
+STATEMENT = EarningStatementResponse(
+    line_items=[
+        LineItemResponse(name="Per successful attempt", quantity=5.0, rate=0.667, total=3.335),
+        LineItemResponse(name="Long route bonus", quantity=0, rate=12.0, total=0.0),
+    ],
+    line_item_subtotal=3.4899999999999998,
+    hours_worked=0.2110577227777778,
+    minimum_earnings=3.218630272361111,
+    final_earnings=3.4899999999999998,
+)
+
+
+def test_stdlib_matches_json_dumps(monkeypatch):
+    monkeypatch.setattr(config, "JSON_BACKEND", "stdlib")
+    payload = {"statements": {"courier": STATEMENT}, "errors": {}}
+    expected = json.dumps(
+        {"statements": {"courier": STATEMENT.to_dict()}, "errors": {}},
+        separators=(",", ":"),
+    )
+    assert dumps(payload) == expected.encode()
+
+
+def test_default_float_formatting_matches_json_dumps():
+    floats = [1.388888888888889e-05, 1e-07, 5e-324, 1e16, 1.7976931348623157e308, 0.1]
+    assert dumps({"values": floats}) == json.dumps(
+        {"values": floats}, separators=(",", ":")
+    ).encode()
+
+
+@pytest.mark.parametrize("backend", ["auto", "stdlib"])
+def test_preserves_field_order_and_values(monkeypatch, backend):
+    monkeypatch.setattr(config, "JSON_BACKEND", backend)
+    result = json.loads(dumps(STATEMENT))
+    assert result == STATEMENT.to_dict()
+    assert list(result) == list(STATEMENT.to_dict())
+    assert list(result["line_items"][0]) == ["name", "quantity", "rate", "total"]
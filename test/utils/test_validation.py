@@ -0,0 +1,104 @@
+import pytest
+from marshmallow import ValidationError as SchemaValidationError
+from src.model import ActivityColumns
+from src.schema import ActivityLogSchema
+from src.utils.exceptions import ValidationError
+from src.utils.validation import load_activity_columns, load_columnar_activity_logs
+
+VALID_LOGS = [
+    {"route_id": "RT1", "attempt_date_time": "2023-12-18T08:33:18.588934+00:00", "success": True},
+    {"route_id": "RT1", "attempt_date_time": "2023-12-18T10:33:18+02:00", "success": "false"},
+    {"route_id": "RT2", "attempt_date_time": "2023-12-18T08:33:18Z", "success": 1},
+    {"route_id": "RT2", "attempt_date_time": "2023-12-18T08:33:18", "success": "no"},
+]
+
+INVALID_LOGS = [
+    [{"route_id": 1, "success": "maybe"}],
+    [{"route_id": None, "attempt_date_time": "yesterday", "success": [], "extra": 1}],
+    [{"route_id": "RT1", "attempt_date_time": 1702888398, "success": True}],
+    [VALID_LOGS[0], "not a record"],
+    {"route_id": "RT1"},
+    None,
+]
+
+
+def test_matches_marshmallow_columns():
+    columns = load_activity_columns(VALID_LOGS)
+    expected = ActivityColumns.from_records(ActivityLogSchema(many=True).load(VALID_LOGS))
+    assert list(columns) == list(expected)
+    assert list(columns.successes) == [1, 0, 1, 0]
+
+
+@pytest.mark.parametrize("body", INVALID_LOGS)
+def test_matches_marshmallow_errors(body):
+    with pytest.raises(SchemaValidationError) as expected:
+        ActivityLogSchema(many=True).load(body)
+    with pytest.raises(ValidationError) as actual:
+        load_activity_columns(body)
+    assert actual.value.messages == expected.value.messages
+
+
+def test_columnar_matches_records():
+    columns = load_columnar_activity_logs(
+        {
+            "route_ids": ["RT1", "RT2"],
+            "route_codes": [0, 0, 1, 1],
+            "timestamps": list(load_activity_columns(VALID_LOGS).timestamps),
+            "success": "BQ==",
+        }
+    )
+    assert list(columns) == list(load_activity_columns(VALID_LOGS))
+
+
+@pytest.mark.parametrize(
+    "body, errors",
+    [
+        (
+            {"route_ids": ["RT1"], "route_codes": [0], "success": "AQ==", "extra": 1},
+            {
+                "timestamps": ["Missing data for required field."],
+                "extra": ["Unknown field."],
+            },
+        ),
+        (
+            {
+                "route_ids": [1],
+                "route_codes": [0.5],
+                "timestamps": ["x"],
+                "success": "*",
+            },
+            {
+                "route_ids": ["Not a list of strings."],
+                "route_codes": ["Not a list of 64-bit integers."],
+                "timestamps": ["Not a list of 64-bit integers."],
+                "success": ["Not a base64 bitmap."],
+            },
+        ),
+        (
+            {
+                "route_ids": ["RT1"],
+                "route_codes": [0, 1],
+                "timestamps": [1],
+                "success": b"",
+            },
+            {
+                "timestamps": ["Expected 2 timestamps."],
+                "success": ["Expected 1 bytes for 2 attempts."],
+                "route_codes": ["Route code out of range."],
+            },
+        ),
+        (
+            {
+                "route_ids": ["RT1", "RT1"],
+                "route_codes": [0, 1],
+                "timestamps": [1, 2],
+                "success": "Aw==",
+            },
+            {"route_ids": ["Route ids must be unique."]},
+        ),
+    ],
+)
+def test_columnar_errors(body, errors):
+    with pytest.raises(ValidationError) as actual:
+        load_columnar_activity_logs(body)
+    assert actual.value.messages == errors